@@ -0,0 +1,145 @@
+"""
+Benchmarks of the numerical schemes, domains, substance properties and an end-to-end packed bed.
+
+The classes follow the conventions of airspeed velocity (asv): setup prepares the data (and compiles the kernels) outside the timing, time_* methods are timed and params are swept. They can be run with asv or with benchmarks/run.py, which compares against a stored baseline.
+"""
+
+import openterrace
+from openterrace import particle_models
+import numpy as np
+import contextlib
+import io
+
+grid_sizes = [(50, 1), (50, 200), (200, 1000)]
+
+def _kernels(package):
+    """All kernels of a scheme package, including the multi-threaded variants."""
+
+    names = []
+    for module in sorted(package.__all__):
+        for name in [module, module+'_parallel']:
+            if hasattr(getattr(package, module), name):
+                names.append(module+'.'+name)
+    return names
+
+def _kernel(package, name):
+    module, fcn = name.split('.')
+    return getattr(getattr(package, module), fcn)
+
+class DiffusionSchemes:
+    params = (_kernels(openterrace.diffusion_schemes), grid_sizes)
+    param_names = ['scheme', 'n']
+
+    def setup(self, scheme, n):
+        rng = np.random.default_rng(0)
+        self.fcn = _kernel(openterrace.diffusion_schemes, scheme)
+        self.T = 273.15+60*rng.random(n)
+        self.D = rng.random((2,)+n)
+        self.fcn(self.T, self.D)
+
+    def time_scheme(self, scheme, n):
+        self.fcn(self.T, self.D)
+
+class ConvectionSchemes:
+    params = (_kernels(openterrace.convection_schemes), grid_sizes)
+    param_names = ['scheme', 'n']
+
+    def setup(self, scheme, n):
+        rng = np.random.default_rng(0)
+        self.fcn = _kernel(openterrace.convection_schemes, scheme)
+        self.T = 273.15+60*rng.random(n)
+        self.F = 0.01*np.ones((2,)+n)*4200
+        self.fcn(self.T, self.F)
+
+    def time_scheme(self, scheme, n):
+        self.fcn(self.T, self.F)
+
+class Domains:
+    params = (sorted(domain for domain in openterrace.domains.__all__ if domain.endswith('_1d')), grid_sizes)
+    param_names = ['domain', 'n']
+    dimensions = {'block_1d': {'area': 1, 'length': 0.1}, 'cylinder_1d': {'D': 0.1, 'H': 1}, 'sphere_1d': {'radius': 0.01},
+                  'hollow_sphere_1d': {'radius_inner': 0.005, 'radius_outer': 0.01}}
+
+    def setup(self, domain, n):
+        self.phase = openterrace.Phase(type='bed')
+        self.phase.select_substance(substance='magnetite')
+        self.phase.select_domain_type(domain=domain)
+        self.phase.create_domain(n=n, **self.dimensions[domain])
+        self.phase.select_schemes(diff='central_difference_1d')
+        self.phase.initialise(T=273.15+20)
+        self.phase.select_bc(position=0, bc_type='fixed_gradient', value=0)
+        self.phase.select_bc(position=-1, bc_type='fixed_value', value=273.15+80)
+        self.time_step(domain, n)
+
+    def time_step(self, domain, n):
+        self.phase._update_properties()
+        self.phase._solve_equations(1e-3)
+
+class Substances:
+    params = ([type+'.'+name for type in ['bed', 'fluid'] for name in sorted(getattr(openterrace, type+'_substances').__all__)], ['h', 'T', 'rho', 'cp', 'k'])
+    param_names = ['substance', 'property']
+
+    def setup(self, substance, property):
+        type, name = substance.split('.')
+        fcns = getattr(getattr(openterrace, type+'_substances'), name)
+        self.fcn = getattr(fcns, property)
+        T = np.linspace(273.15+20, 273.15+90, 100000)
+        self.x = T if property == 'h' else fcns.h(T)
+        self.fcn(self.x)
+
+    def time_property(self, substance, property):
+        self.fcn(self.x)
+
+class PackedBed:
+    params = ([(20, 10), (100, 20), (200, 50)], [False, True])
+    param_names = ['n', 'fused']
+    timeout = 300
+
+    def setup(self, n, fused, model=None):
+        n_fluid, n_bed = n
+        self.ot = openterrace.Setup(t_simulate=1, dt=0.01)
+
+        fluid = openterrace.Phase(type='fluid')
+        fluid.select_substance(substance='water')
+        fluid.select_domain_type(domain='cylinder_1d')
+        fluid.create_domain(n=(n_fluid, 1), D=0.3, H=1)
+        fluid.select_porosity(phi=0.4)
+        fluid.select_schemes(diff='central_difference_1d', conv='upwind_1d', fused=fused)
+        fluid.initialise(T=273.15+20)
+        fluid.select_massflow(mdot=0.1)
+        fluid.select_bc(position=0, bc_type='fixed_value', value=273.15+80)
+        fluid.select_bc(position=-1, bc_type='fixed_gradient', value=0)
+
+        bed = openterrace.Phase(type='bed')
+        bed.select_substance(substance='ATS50')
+        if model is None:
+            bed.select_domain_type(domain='sphere_1d')
+            bed.create_domain(n=(n_bed, n_fluid), radius=0.025)
+            bed.select_schemes(diff='central_difference_1d', fused=fused)
+            bed.initialise(T=273.15+20)
+            bed.select_bc(position=0, bc_type='fixed_gradient', value=0)
+            bed.select_bc(position=-1, bc_type='fixed_gradient', value=0)
+        else:
+            bed.select_domain_type(domain='reduced_sphere')
+            bed.create_domain(n=(1, n_fluid), radius=0.025, model=model)
+            bed.initialise(T=273.15+20)
+
+        self.ot.select_coupling(fluid_phase=0, bed_phase=1, h_exp='constant', h_value=200)
+        self.phases = [fluid, bed]
+        self.time_run(n, fused)
+
+    def time_run(self, n, fused):
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.ot.run_simulation(phases=self.phases)
+
+class ReducedPackedBed(PackedBed):
+    """Packed bed with reduced-order particle models instead of resolved particles."""
+
+    params = ([(20, 10), (100, 20), (200, 50)], particle_models.models)
+    param_names = ['n', 'model']
+
+    def setup(self, n, model):
+        PackedBed.setup(self, n, False, model)
+
+    def time_run(self, n, model):
+        PackedBed.time_run(self, n, False)
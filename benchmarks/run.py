@@ -0,0 +1,77 @@
+"""
+Run the benchmarks without asv and compare with a stored baseline.
+
+    python benchmarks/run.py                      # run and compare with benchmarks/baseline.json
+    python benchmarks/run.py --save               # run and store as new baseline
+    python benchmarks/run.py --filter PackedBed   # run a subset
+
+Regressions slower than the baseline by more than the threshold and benchmarks missing from the baseline are listed and make the script exit with status 1.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks import benchmarks
+
+def run(filter:str=None, repeat:int=5):
+    """Run all benchmarks matching filter and return the best time of each in s."""
+
+    results = {}
+    for name, cls in vars(benchmarks).items():
+        if not isinstance(cls, type) or not hasattr(cls, 'params'):
+            continue
+        for method in [m for m in dir(cls) if m.startswith('time_')]:
+            for params in itertools.product(*cls.params):
+                key = name+'.'+method+'('+', '.join(str(p) for p in params)+')'
+                if filter and not filter in key:
+                    continue
+                bench = cls()
+                bench.setup(*params)
+                fcn = getattr(bench, method)
+                number, _ = timeit.Timer(lambda: fcn(*params)).autorange()
+                results[key] = min(timeit.repeat(lambda: fcn(*params), number=number, repeat=repeat))/number
+                print(f"{key:<80} {results[key]:.3e} s", flush=True)
+    return results
+
+def compare(results:dict=None, baseline:dict=None, threshold:float=1.5):
+    """List benchmarks that are slower than the baseline by more than a factor threshold or have no baseline."""
+
+    regressions = []
+    for key, t in results.items():
+        if not key in baseline['results']:
+            regressions.append((key, None, t))
+            print(f"NO BASELINE {key}: {t:.3e} s")
+        elif t > threshold*baseline['results'][key]:
+            regressions.append((key, baseline['results'][key], t))
+            print(f"REGRESSION {key}: {baseline['results'][key]:.3e} s -> {t:.3e} s ({t/baseline['results'][key]:.2f}x)")
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--baseline', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json'))
+    parser.add_argument('--save', action='store_true', help='store results as new baseline')
+    parser.add_argument('--filter', default=None, help='only run benchmarks containing this string')
+    parser.add_argument('--threshold', type=float, default=1.5, help='slowdown factor reported as regression')
+    parser.add_argument('--output', default=None, help='JSON file of the results')
+    args = parser.parse_args()
+
+    results = run(args.filter)
+    record = {'machine': platform.node(), 'processor': platform.processor(), 'python': platform.python_version(), 'results': results}
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(record, f, indent=2)
+    if args.save:
+        if os.path.isfile(args.baseline):
+            with open(args.baseline) as f:
+                record['results'] = {**json.load(f)['results'], **results}
+        with open(args.baseline, 'w') as f:
+            json.dump(record, f, indent=2)
+    elif os.path.isfile(args.baseline):
+        with open(args.baseline) as f:
+            sys.exit(1 if compare(results, json.load(f), args.threshold) else 0)
@@ -1,4 +1,6 @@
 __version__ = "0.0.0" # This will be overwritten by the dynamic versioning by Poetry
 from openterrace.openterrace import Setup
 from openterrace.openterrace import Phase
+from openterrace.openterrace import register_substance
+from openterrace.compilation import precompile
 from openterrace.analytical_functions import *
\ No newline at end of file
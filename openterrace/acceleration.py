@@ -0,0 +1,38 @@
+"""
+Acceleration of fixed-point iterations x = F(x), used for the cycle map of cyclic steady-state simulations.
+
+anderson: Anderson mixing over the last depth iterations. The next iterate combines the previous map values with the weights that minimise the linearised residual F(x)-x in the least-squares sense.
+aitken: Vector Aitken (Irons-Tuck) extrapolation, i.e. Anderson mixing with a depth of 1.
+none: Plain fixed-point iteration x = F(x).
+"""
+
+import numpy as np
+
+methods = ['none', 'aitken', 'anderson']
+
+def extrapolate(x:list=None, f:list=None, method:str='anderson', depth:int=5):
+    """Next iterate of a fixed-point iteration from the previous iterates and their map values.
+
+    Args:
+        x (list): Previous iterates, oldest first
+        f (list): Map values F(x) of the previous iterates
+        method (str): Acceleration method ('none', 'aitken' or 'anderson')
+        depth (int): Number of previous iterations used by 'anderson'
+
+    Returns:
+        Next iterate
+    """
+
+    if not method in methods:
+        raise Exception("method \'"+str(method)+"\' specified. Valid options for method are:", methods)
+
+    m = {'none': 0, 'aitken': 1, 'anderson': depth}[method]
+    m = min(m, len(x)-1)
+    if m == 0:
+        return f[-1]
+
+    g = [f_i-x_i for x_i, f_i in zip(x[-m-1:], f[-m-1:])]
+    dG = np.column_stack([g[i+1]-g[i] for i in range(m)])
+    dF = np.column_stack([f[-m+i]-f[-m-1+i] for i in range(m)])
+    gamma = np.linalg.lstsq(dG, g[-1], rcond=None)[0]
+    return f[-1]-dF@gamma
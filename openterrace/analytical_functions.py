@@ -1,5 +1,4 @@
 import numpy as np
-from scipy.optimize import brentq
 
 def analytical_step(X:float, n=int):
     y_H_arr = np.linspace(0,1,n)
@@ -10,6 +9,8 @@ def analytical_step(X:float, n=int):
     return y_H_arr, theta_arr
 
 def analytical_diffusion_wall(Bi:float, Fo:float, n:int):
+    from scipy.optimize import brentq
+
     def theta_fcn(Bi:float, Fo:float, r_r0:float, n_terms:int=100):
         def lambda_fcn(Bi, i):
             left = np.pi*i
@@ -35,6 +36,8 @@ def analytical_diffusion_wall(Bi:float, Fo:float, n:int):
     return x_x0_arr, theta_arr
 
 def analytical_diffusion_sphere(Bi:float, Fo:float, n:int):
+    from scipy.optimize import brentq
+
     def theta_fcn(Bi:float, Fo:float, r_r0:float, n_terms:int=100):
         def lambda_fcn(Bi, i):
             left = np.pi*(i) + 1e-12
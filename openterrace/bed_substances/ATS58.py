@@ -16,6 +16,7 @@ h_l = T_s*cp+h_f (mass specific enthalpy at after phase change)
 """
 
 import numpy as np
+import numba as nb
 
 _T_s = 56+273.15 #Solidification temperature
 _T_l = 58+273.15 #Liquid temperature
@@ -28,6 +29,7 @@ _rho_s = _rho_l #Solid density
 _h_s = _T_s*_cp #Mass specific enthalpy at point of solidification
 _h_l = _h_s+_h_f #Mass specific enthalpy after phase shift
 
+@nb.njit(cache=True)
 def h(T:float) -> float:
     """Mass specific enthalpy as function of temperature at 1 atm (fit assumes piecewice constant cp with phase change).
 
@@ -37,8 +39,9 @@ def h(T:float) -> float:
     Returns:
         Specific enthalpy in J/kg
     """
-    return np.piecewise(T, [T <= _T_s, (T > _T_s) & (T <= _T_l), T > _T_l], [lambda T: _cp*T, lambda T: _h_s + (T-_T_s)/(_T_l-_T_s)*_h_f, lambda T: _h_l + _cp*(T-_T_l)])
+    return np.where(T <= _T_s, _cp*T, np.where(T <= _T_l, _h_s + (T-_T_s)/(_T_l-_T_s)*_h_f, _h_l + _cp*(T-_T_l)))
 
+@nb.njit(cache=True)
 def T(h:float, p:float=None) -> float:
     """Temperature as function of mass specific enthalpy at 1 atm (fit assumes piecewice constant cp with phase change).
 
@@ -49,9 +52,10 @@ def T(h:float, p:float=None) -> float:
     Returns:
         Temperature in kelvin
     """
-    return np.piecewise(h, [h <= _h_s, (h > _h_s) & (h <= _h_l), h > _h_l], [lambda h: 1/_cp*h, lambda h: _T_s + (_T_l-_T_s)*(h-_h_s)/(_h_l-_h_s), lambda h: _T_l + 1/_cp*(h-_h_l)])
+    return np.where(h <= _h_s, 1/_cp*h, np.where(h <= _h_l, _T_s + (_T_l-_T_s)*(h-_h_s)/(_h_l-_h_s), _T_l + 1/_cp*(h-_h_l)))
 
 
+@nb.njit(cache=True)
 def rho(h:float, p:float=None) -> float:
     """Density as function of mass specific entahlpy at 1 atm (fit assumes constant density).
 
@@ -64,6 +68,7 @@ def rho(h:float, p:float=None) -> float:
     """
     return _rho_l*h**0
 
+@nb.njit(cache=True)
 def k(h:float, p:float=None) -> float:
     """Thermal conductivity as function of mass specific enthalpy at 1 atm (fit assumes piecewice constant k).
 
@@ -74,8 +79,9 @@ def k(h:float, p:float=None) -> float:
     Returns:
         float: Thermal conductivity in W/(m K)
     """
-    return np.piecewise(h, [h <= _h_s, (h > _h_s) & (h <= _h_l), h > _h_l], [_k_s, lambda h: _k_s + (_k_l-_k_s)/(_h_l-_h_s)*(h-_h_s), _k_l])
+    return np.where(h <= _h_s, _k_s, np.where(h <= _h_l, _k_s + (_k_l-_k_s)/(_h_l-_h_s)*(h-_h_s), _k_l))
 
+@nb.njit(cache=True)
 def cp(h:float, p:float=None) -> float:
     """Specific heat capacity as function of mass specific enthalpy at 1 atm (fit assumes piecewice constant cp with phase change).
 
@@ -6,6 +6,9 @@ rho = 5150 (density)
 k = 1.9 (thermal conductivity)
 """
 
+import numba as nb
+
+@nb.njit(cache=True)
 def h(T:float) -> float:
     """Mass specific enthalpy as function of temperature at 1 atm (fit assumes constant cp).
 
@@ -17,6 +20,7 @@ def h(T:float) -> float:
     """
     return 1130*T
 
+@nb.njit(cache=True)
 def T(h:float, p:float=None) -> float:
     """Temperature as function of mass specific enthalpy at 1 atm (fit assumes constant cp).
 
@@ -29,6 +33,7 @@ def T(h:float, p:float=None) -> float:
     """
     return 1/1130*h
 
+@nb.njit(cache=True)
 def rho(h:float, p:float=None) -> float:
     """Density as function of mass specific entahlpy at 1 atm (fit assumes constant density).
 
@@ -41,6 +46,7 @@ def rho(h:float, p:float=None) -> float:
     """
     return 5150*h**0
 
+@nb.njit(cache=True)
 def k(h:float, p:float=None) -> float:
     """Thermal conductivity as function of mass specific enthalpy at 1 atm (fit assumes constant thermal conductivity).
 
@@ -53,6 +59,7 @@ def k(h:float, p:float=None) -> float:
     """
     return 1.9*h**0
 
+@nb.njit(cache=True)
 def cp(h:float, p:float=None) -> float:
     """Specific heat capacity as function of mass specific enthalpy at 1 atm (fit assumes constant specific heat capacity).
 
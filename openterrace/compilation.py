@@ -0,0 +1,93 @@
+"""
+Compilation of the numba kernels ahead of a simulation.
+
+All kernels are compiled with cache=True, so the machine code is stored on disk next to the modules (or in NUMBA_CACHE_DIR) and loaded by later processes instead of being compiled again. precompile fills this cache for the argument types used by the solver, e.g. once after installation or in the parent process of a parameter sweep, so short runs and worker processes do not pay the compilation cost.
+"""
+
+import numpy as np
+
+def precompile(phases:list=None, parallel:bool=True):
+    """Compile kernels for float64 fields and store them in the on-disk cache. Kernels already in the cache are only loaded.
+
+    Args:
+        phases (list): Phases ready for run_simulation. Only the kernels used by these phases are compiled. If not specified, all schemes, solvers and predefined substances are compiled. The fused kernel evaluating compiled substance functions cannot be cached and is compiled in each process
+        parallel (bool): Also compile the multi-threaded variants if phases is not specified
+
+    Returns:
+        Number of compiled kernels
+    """
+    from . import diffusion_schemes, convection_schemes, fused_step, implicit_diffusion, coupling, particle_models, monitors, energy_flows, property_tables, bed_substances, fluid_substances
+
+    if phases is None:
+        suffixes = ['', '_parallel'] if parallel else ['']
+        schemes = [getattr(getattr(package, module), module+suffix, None) for package in [diffusion_schemes, convection_schemes] for module in package.__all__ for suffix in suffixes]
+        solvers = [getattr(module, name+suffix) for module, name in [(fused_step, 'fused_step_1d'), (implicit_diffusion, 'implicit_diffusion_1d')] for suffix in suffixes]
+        substances = [getattr(package, name) for package in [bed_substances, fluid_substances] for name in package.__all__]
+        tables, use_monitors, use_energy_balance, use_particle_models = True, True, True, True
+    else:
+        schemes = [getattr(phase, scheme) for phase in phases for scheme in ['diff', 'conv'] if hasattr(phase, scheme)]
+        solvers = []
+        for phase in phases:
+            suffix = '_parallel' if phase._flag_parallel else ''
+            if phase._flag_fused and not phase._compiled_properties():
+                solvers.append(getattr(fused_step, 'fused_step_1d'+suffix))
+            elif not phase._flag_fused and phase.time_integration != 'explicit':
+                solvers.append(getattr(implicit_diffusion, 'implicit_diffusion_1d'+suffix))
+        substances = [phase.fcns for phase in phases]
+        tables = any(isinstance(phase.fcns, property_tables.PropertyTable) for phase in phases)
+        use_monitors = any(hasattr(phase, 'monitors') for phase in phases)
+        use_energy_balance = any(phase._flag_energy_balance for phase in phases)
+        use_particle_models = any(hasattr(phase.domain, 'model') for phase in phases)
+
+    n0, n1 = 4, 2
+    field = lambda value=1.0: np.full((n0, n1), value)
+    rows = np.ones(n1)
+    D = np.ones((2, n0, n1))
+    compiled = 0
+
+    for scheme in schemes:
+        if scheme is not None and hasattr(scheme, 'compile'):
+            scheme(field(), D)
+            compiled += 1
+
+    for solver in solvers:
+        if solver.__name__.startswith('fused'):
+            solver(field(), field(), field(), field(), field(), field(), field(), field(), field(), field(), rows, D.copy(), D.copy(),
+                   True, True, np.array([1, 2]), np.ones((2, n1)), field(0.0), field(0.0), 1.0)
+        else:
+            solver(field(), field(), field(), field(), D, D, field(0.0), field(), True,
+                   np.array([1, 2]), np.ones((2, n1)), np.ones((2, n1)), field(0.0), field(0.0), 0.5, 1.0)
+        compiled += 1
+
+    # Coupling of a fluid phase with n1 nodes to n1 bed columns
+    coupling.coupling_1d(np.ones((n1, 1)), np.ones((n1, 1)), np.ones((n1, 1)), rows, field(), field(), field(), 1.0, rows, 1.0, 1.0)
+    coupling.coupling_rates_1d(np.ones((n1, 1)), field(), rows, 1.0, np.zeros((n1, 1)), field(0.0))
+    compiled += 2
+
+    if use_particle_models:
+        particle_models.surface_temperature_1d(0, np.ones((n1, 1)), np.ones((1, n1)), np.ones((1, n1)), np.ones((1, n1)), np.ones((1, n1)), np.zeros(n1), 1.0, 1.0, 1.0, np.zeros((1, n1)))
+        compiled += 1
+
+    if use_monitors:
+        monitors.reduce(0, field(), field(), field(), 0, 0, 1, np.zeros(1))
+        compiled += 1
+
+    if use_energy_balance:
+        energy_flows.energy_flows_1d(field(), field(), field(), field(), field(), field(), D, D, True, True, np.array([1, 2]), np.ones((2, n1)), np.ones((2, n1)), field(0.0), field(0.0), 0.5, 1.0, np.zeros((4, n1)))
+        compiled += 1
+
+    if tables:
+        property_tables.interpolate_linear(rows, 0.0, 1.0, np.ones(n0))
+        property_tables.interpolate_cubic(rows, 0.0, 1.0, np.ones(n0), np.ones(n0))
+        compiled += 2
+
+    # Substance functions are called on columns inside kernels, on whole fields and on boundary values
+    for fcns in substances:
+        for name in ['h', 'T', 'rho', 'cp', 'k']:
+            fcn = getattr(fcns, name, None)
+            if hasattr(fcn, 'compile'):
+                for x in [np.full(n0, 300.0), field(300.0), 300.0, np.asarray(300.0)]:
+                    fcn(x)
+                compiled += 1
+
+    return compiled
@@ -1,4 +1,10 @@
-import os, glob
+import os, glob, importlib
 modules = glob.glob(os.path.join(os.path.dirname(__file__), "*.py"))
 __all__ = [ os.path.basename(f)[:-3] for f in modules if os.path.isfile(f) and not f.endswith('__init__.py')]
-from . import *
\ No newline at end of file
+
+def __getattr__(name:str):
+    """Import modules on first access, so only the modules used by a simulation are loaded and compiled."""
+
+    if name in __all__:
+        return importlib.import_module('.'+name, __name__)
+    raise AttributeError("module \'"+__name__+"\' has no attribute \'"+name+"\'")
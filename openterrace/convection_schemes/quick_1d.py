@@ -0,0 +1,24 @@
+import numpy as np
+import numba as nb
+from .. import flux_limiters
+
+# Largest Courant number for which the explicit time step is total variation diminishing
+courant_max = 0.5
+limiter = flux_limiters.limiters.index('quick')
+
+@nb.njit(cache=True)
+def quick_1d(x, F):
+    """Second-order accurate, bounded TVD advection scheme with the limited QUICK interpolation.
+    """
+    _out = np.zeros_like(x)
+    for i in range(0, x.shape[1]):
+        flux_limiters.tvd_column(limiter, x, F, _out, i)
+    return _out
+
+@nb.njit(cache=True)
+def quick_1d_parallel(x, F):
+    """Second-order accurate, bounded TVD advection scheme with the limited QUICK interpolation (multi-threaded over the rows of x).
+    """
+    _out = np.zeros_like(x)
+    flux_limiters.tvd_rows(limiter, x, F, _out)
+    return _out
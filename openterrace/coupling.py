@@ -0,0 +1,47 @@
+import numpy as np
+import numba as nb
+
+@nb.njit(cache=True)
+def coupling_1d(h_f, T_f, rho_f, inv_V_f, h_b, T_b, rho_b, inv_V_b, n_bed, hA, dt):
+    """Explicit heat exchange between the nodes of a fluid phase and the surface nodes of the bed phase particles. h_f and h_b are updated in place.
+
+    Args:
+        h_f (float): Mass specific enthalpy of the fluid phase of shape (n_f, n_members)
+        T_f (float): Temperature of the fluid phase of shape (n_f, n_members)
+        rho_f (float): Density of the fluid phase of shape (n_f, n_members)
+        inv_V_f (float): Inverse volume of the fluid node of each bed column of shape (n_members*n_f,)
+        h_b (float): Mass specific enthalpy of the bed phase of shape (n_r, n_members*n_f)
+        T_b (float): Temperature of the bed phase of shape (n_r, n_members*n_f)
+        rho_b (float): Density of the bed phase of shape (n_r, n_members*n_f)
+        inv_V_b (float): Inverse volume of the bed surface node
+        n_bed (float): Number of particles per fluid node of each bed column of shape (n_members*n_f,)
+        hA (float): Heat transfer coefficient times particle surface area in W/K
+        dt (float): Time step size in s
+    """
+    n_f = T_f.shape[0]
+    for c in range(h_b.shape[1]):
+        j = c % n_f
+        m = c // n_f
+        Q = hA*(T_f[j,m]-T_b[-1,c])*dt
+        h_b[-1,c] += Q*inv_V_b/rho_b[-1,c]
+        h_f[j,m] -= n_bed[c]*Q*inv_V_f[c]/rho_f[j,m]
+
+@nb.njit(cache=True)
+def coupling_rates_1d(T_f, T_b, n_bed, hA, q_f, q_b):
+    """Heat transfer rates between the nodes of a fluid phase and the surface nodes of the bed phase particles. The rates are added to q_f and q_b.
+
+    Args:
+        T_f (float): Temperature of the fluid phase of shape (n_f, n_members)
+        T_b (float): Temperature of the bed phase of shape (n_r, n_members*n_f)
+        n_bed (float): Number of particles per fluid node of each bed column of shape (n_members*n_f,)
+        hA (float): Heat transfer coefficient times particle surface area in W/K
+        q_f (float): Heat transfer rate into the fluid nodes in W of shape (n_f, n_members)
+        q_b (float): Heat transfer rate into the bed nodes in W of shape (n_r, n_members*n_f)
+    """
+    n_f = T_f.shape[0]
+    for c in range(T_b.shape[1]):
+        j = c % n_f
+        m = c // n_f
+        Qdot = hA*(T_f[j,m]-T_b[-1,c])
+        q_b[-1,c] += Qdot
+        q_f[j,m] -= n_bed[c]*Qdot
@@ -1,7 +1,7 @@
 import numpy as np
 import numba as nb
 
-@nb.njit
+@nb.njit(cache=True)
 def central_difference_1d(x, D):
     """Second-order accurate central diffence scheme.
     """
@@ -10,4 +10,15 @@ def central_difference_1d(x, D):
         for i in range(0, x.shape[1]):
             _out[j,i] = x[j-1,i]*D[0,j,i] + x[j+1,i]*D[1,j,i]\
                 - x[j,i]*(D[0,j,i]+D[1,j,i])             
-    return _out
\ No newline at end of file
+    return _out
+
+@nb.njit(parallel=True, cache=True)
+def central_difference_1d_parallel(x, D):
+    """Second-order accurate central diffence scheme (multi-threaded over the rows of x).
+    """
+    _out = np.zeros_like(x)
+    for j in nb.prange(1, x.shape[0]-1):
+        for i in range(0, x.shape[1]):
+            _out[j,i] = x[j-1,i]*D[0,j,i] + x[j+1,i]*D[1,j,i]\
+                - x[j,i]*(D[0,j,i]+D[1,j,i])
+    return _out
@@ -1,8 +1,13 @@
 import numpy as np
+from .. import grids
 
 class Domain:
     """Domain class."""
 
+    grid = 'uniform'
+    refine = 'end'
+    stretch = None
+
     def required_input(self):
         """List of required input."""
 
@@ -12,20 +17,35 @@ class Domain:
         """Update parameters."""
         
         self.dx = self.dx_fcn()
+        self.dx_face = self.dx_face_fcn()
         self.node_pos = self.node_pos_fcn()
         self.A = self.A_fcn()
         self.V = self.V_fcn()
         self.V0 = self.V0_fcn()
 
+    def x_fcn(self):
+        """Node positions along the length. Nodes are clustered towards refine on non-uniform grids."""
+
+        return grids.node_positions(0, self.length, self.n[0], self.grid, self.refine, self.stretch)
+
     def dx_fcn(self):
         """Node spacing function."""
 
+        if self.grid != 'uniform':
+            return grids.element_lengths(self.x_fcn())
         return np.tile(self.length/(self.n[0]-1), (self.n[0], 1))
 
+    def dx_face_fcn(self):
+        """Distance to the neighbouring nodes towards node j-1 and j+1."""
+
+        if self.grid != 'uniform':
+            return grids.face_distances(self.x_fcn())
+        return (self.dx, self.dx)
+
     def node_pos_fcn(self):
         """Node position function."""
 
-        return np.tile(np.linspace(0,self.length,self.n[0]), (self.n[1],1)).T
+        return np.tile(self.x_fcn(), (self.n[1],1)).T
 
     def A_fcn(self):
         """Area of faces between nodes."""
@@ -35,10 +55,12 @@ class Domain:
     def V_fcn(self):
         """Volume of node element."""
 
+        if self.grid != 'uniform':
+            return self.dx*self.area
         dx = self.length/(self.n[0]-1)
         return np.tile(dx*self.area, (self.n[0],1))
 
     def V0_fcn(self):
         """Volume of shape."""
             
-        return self.area*self.length
\ No newline at end of file
+        return self.area*self.length
@@ -1,8 +1,13 @@
 import numpy as np
+from .. import grids
 
 class Domain:
     """Domain class."""
 
+    grid = 'uniform'
+    refine = 'end'
+    stretch = None
+
     def required_input(self):
         """List of required input."""
 
@@ -12,20 +17,35 @@ class Domain:
         """Update parameters."""
 
         self.dx = self.dx()
+        self.dx_face = self.dx_face()
         self.node_pos = self.node_pos()
         self.A = self.A()
         self.V = self.V()
         self.V0 = self.V0()
 
+    def x(self):
+        """Node positions along the height. Nodes are clustered towards refine on non-uniform grids."""
+
+        return grids.node_positions(0, self.H, self.n[0], self.grid, self.refine, self.stretch)
+
     def dx(self):
         """Node spacing function."""
 
+        if self.grid != 'uniform':
+            return grids.element_lengths(self.x())
         return np.tile(self.H/(self.n[0]-1), (self.n[0], 1))
 
+    def dx_face(self):
+        """Distance to the neighbouring nodes towards node j-1 and j+1."""
+
+        if self.grid != 'uniform':
+            return grids.face_distances(self.x())
+        return (self.dx, self.dx)
+
     def node_pos(self):
         """Node position function."""
 
-        return np.tile(np.linspace(0,self.H,self.n[0]), (self.n[1],1)).T
+        return np.tile(self.x(), (self.n[1],1)).T
 
     def A(self):
         """Area of faces between nodes."""
@@ -35,10 +55,12 @@ class Domain:
     def V(self):
         """Volume of node element."""
         
+        if self.grid != 'uniform':
+            return self.dx*np.pi*self.D**2/4
         dx = self.H/(self.n[0]-1)
         return np.tile(dx*np.pi*self.D**2/4, (self.n[0],1))
 
     def V0(self):
         """Volume of shape."""
         
-        return np.pi*(self.D/2)**2*self.H
\ No newline at end of file
+        return np.pi*(self.D/2)**2*self.H
@@ -1,8 +1,13 @@
 import numpy as np
+from .. import grids
 
 class Domain:
     """Domain class."""
 
+    grid = 'uniform'
+    refine = 'end'
+    stretch = None
+
     def required_input(self):
             """List of required input."""
 
@@ -12,36 +17,57 @@ class Domain:
         """Update parameters."""
         
         self.dx = self.dx_fcn()
+        self.dx_face = self.dx_face_fcn()
         self.node_pos = self.node_pos_fcn()
         self.A = self.A_fcn()
         self.V = self.V_fcn()
         self.V0 = self.V0_fcn()
 
+    def x_fcn(self):
+        """Node positions along the radius. Nodes are clustered towards refine on non-uniform grids (the outer surface by default)."""
+
+        return grids.node_positions(self.radius_inner, self.radius_outer, self.n[0], self.grid, self.refine, self.stretch)
+
     def dx_fcn(self):
         """Node spacing function."""
 
+        if self.grid != 'uniform':
+            return grids.element_lengths(self.x_fcn())
         return np.tile((self.radius_outer-self.radius_inner)/(self.n[0]-1), (self.n[0], 1))
 
+    def dx_face_fcn(self):
+        """Distance to the neighbouring nodes towards node j-1 and j+1."""
+
+        if self.grid != 'uniform':
+            return grids.face_distances(self.x_fcn())
+        return (self.dx, self.dx)
+
     def node_pos_fcn(self):
         """Node position function."""
 
-        return np.tile(np.linspace(self.radius_inner,self.radius_outer,self.n[0]), (self.n[1],1)).T
+        return np.tile(self.x_fcn(), (self.n[1],1)).T
+
+    def face_pos_fcn(self):
+        """Positions of the faces between nodes including the inner and outer surface."""
+
+        if self.grid != 'uniform':
+            return grids.face_positions(self.x_fcn())
+        dx = (self.radius_outer-self.radius_inner)/(self.n[0]-1)
+        return np.concatenate(([self.radius_inner],np.linspace(self.radius_inner+dx/2,self.radius_outer-dx/2,self.n[0]-1),[self.radius_outer]))
 
     def A_fcn(self):
         """Area of faces between nodes."""
 
-        dx = (self.radius_outer-self.radius_inner)/(self.n[0]-1)
-        face_pos_vec = np.concatenate(([self.radius_inner],np.linspace(self.radius_inner+dx/2,self.radius_outer-dx/2,self.n[0]-1),[self.radius_outer]))
+        face_pos_vec = self.face_pos_fcn()
         return (np.tile(4*np.pi*face_pos_vec[:-1]**2, (1,1)).T, np.tile(4*np.pi*face_pos_vec[1:]**2, (1,1)).T)
 
     def V_fcn(self):
         """Volume of node element."""
 
-        dx = (self.radius_outer-self.radius_inner)/(self.n[0]-1)
-        face_pos_vec = np.concatenate(([self.radius_inner],np.linspace(self.radius_inner+dx/2,self.radius_outer-dx/2,self.n[0]-1),[self.radius_outer]))
+        face_pos_vec = self.face_pos_fcn()
         return np.tile(np.diff(4/3*np.pi*face_pos_vec**3), (1,1)).T
 
     def V0_fcn(self):
         """Volume of shape."""
             
-        return 4/3*np.pi*self.radius_outer**3
\ No newline at end of file
+        return 4/3*np.pi*self.radius_outer**3
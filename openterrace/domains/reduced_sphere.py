@@ -0,0 +1,57 @@
+import numpy as np
+from .. import particle_models
+
+class Domain:
+    """Domain class of spherical particles with a reduced-order model of the temperature profile (see particle_models). Each column holds a single node with the mean enthalpy of the particle, so n must be (1, n1)."""
+
+    model = 'lumped'
+
+    def required_input(self):
+        """List of required input."""
+
+        return ['n','radius']
+
+    def update_parameters(self):
+        """Update parameters."""
+
+        if self.n[0] != 1:
+            raise Exception("Domain \'reduced_sphere\' has a single node per column. Specify n as (1, n1).")
+        if not self.model in particle_models.models:
+            raise Exception("model \'"+str(self.model)+"\' specified. Valid options for model are:", particle_models.models)
+
+        self.dx = self.dx_fcn()
+        self.dx_face = self.dx_face_fcn()
+        self.node_pos = self.node_pos_fcn()
+        self.A = self.A_fcn()
+        self.V = self.V_fcn()
+        self.V0 = self.V0_fcn()
+
+    def dx_fcn(self):
+        """Node spacing function."""
+
+        return np.tile(self.radius, (1, 1))
+
+    def dx_face_fcn(self):
+        """Distance to the neighbouring nodes towards node j-1 and j+1."""
+
+        return (self.dx, self.dx)
+
+    def node_pos_fcn(self):
+        """Node position function. The mean temperature is assigned to the centre."""
+
+        return np.zeros((1, self.n[1]))
+
+    def A_fcn(self):
+        """Area of faces between nodes."""
+
+        return (np.zeros((1, 1)), np.tile(4*np.pi*self.radius**2, (1, 1)))
+
+    def V_fcn(self):
+        """Volume of node element."""
+
+        return np.tile(self.V0_fcn(), (1, 1))
+
+    def V0_fcn(self):
+        """Volume of shape."""
+
+        return 4/3*np.pi*self.radius**3
@@ -0,0 +1,59 @@
+import numpy as np
+import numba as nb
+
+@nb.njit(cache=True)
+def energy_flows_1d(h0, h, T, rho, cp, V, D, F, diff, conv, bc_type, h_bc, T_bc, G, GT, theta, dt, out):
+    """Energy flows of a time step per column, evaluated in a single pass over the rows of the fields. Implicit terms are theta-weighted between the old and new temperatures, and source terms at fixed_value boundary nodes use the old temperature.
+
+    Args:
+        h0 (float): Mass specific enthalpy before the time step of shape (n0, n1)
+        h (float): Mass specific enthalpy after the time step of shape (n0, n1)
+        T (float): Temperature used in the time step of shape (n0, n1)
+        rho (float): Density used in the time step of shape (n0, n1)
+        cp (float): Specific heat capacity used in the time step of shape (n0, n1)
+        V (float): Volume of node elements of shape (n0, n1)
+        D (float): Diffusion coefficients of shape (2, n0, n1)
+        F (float): Convection coefficients of shape (2, n0, n1)
+        diff (bool): Include diffusion
+        conv (bool): Include convection
+        bc_type (int): Boundary condition type at position 0 and -1 (0: none, 1: fixed_value, 2: fixed_gradient)
+        h_bc (float): Enthalpy of fixed_value boundary conditions of shape (2, n1)
+        T_bc (float): Temperature of fixed_value boundary conditions of shape (2, n1)
+        G (float): Sum of 2/R over all thermal resistance source terms of shape (n0, n1)
+        GT (float): Sum of 2*T_inf/R over all thermal resistance source terms of shape (n0, n1)
+        theta (float): Weight of the new temperature (0: explicit, 1: backward Euler, 0.5: Crank-Nicolson)
+        dt (float): Time step size in s
+        out (float): Energies in J of shape (4, n1) with rows stored, convection, boundary and source, overwritten
+    """
+    n0 = h.shape[0]
+    out[:] = 0.0
+    for j in range(n0):
+        held = (j == 0 and bc_type[0] == 1) or (j == n0-1 and bc_type[1] == 1)
+        for i in range(h.shape[1]):
+            dh = h[j,i]-h0[j,i]
+            out[0,i] += rho[j,i]*V[j,i]*dh
+            T_theta = T[j,i]
+            if theta > 0 and not held:
+                T_theta += theta*dh/cp[j,i]
+            out[3,i] += (GT[j,i]-G[j,i]*T_theta)*dt
+
+    for i in range(h.shape[1]):
+        if conv:
+            out[1,i] = (F[1,0,i]*T[0,i]-F[0,n0-1,i]*T[n0-1,i])*dt
+        if bc_type[0] == 1:
+            out[2,i] += rho[0,i]*V[0,i]*(h_bc[0,i]-h0[0,i])
+            if diff:
+                out[2,i] += D[0,1,i]*(_T_theta(0, i, h0, h, T, cp, bc_type, T_bc, theta)-_T_theta(1, i, h0, h, T, cp, bc_type, T_bc, theta))*dt
+        if bc_type[1] == 1:
+            out[2,i] += rho[n0-1,i]*V[n0-1,i]*(h_bc[1,i]-h0[n0-1,i])
+            if diff:
+                out[2,i] += D[1,n0-2,i]*(_T_theta(n0-1, i, h0, h, T, cp, bc_type, T_bc, theta)-_T_theta(n0-2, i, h0, h, T, cp, bc_type, T_bc, theta))*dt
+
+@nb.njit(cache=True)
+def _T_theta(j, i, h0, h, T, cp, bc_type, T_bc, theta):
+    """Theta-weighted temperature of node (j, i), which is held at the boundary value at fixed_value boundary nodes."""
+    if j == 0 and bc_type[0] == 1:
+        return T[j,i] + theta*(T_bc[0,i]-T[j,i])
+    if j == h.shape[0]-1 and bc_type[1] == 1:
+        return T[j,i] + theta*(T_bc[1,i]-T[j,i])
+    return T[j,i] + theta*(h[j,i]-h0[j,i])/cp[j,i]
@@ -5,6 +5,9 @@ Reference 1: Eric W. Lemmon, Richard T. Jacobsen, Steven G. Penoncello, and Dani
 Reference 2: E. W. Lemmon and R. T Jacobsen. Viscosity and Thermal Conductivity Equations for Nitrogen, Oxygen, Argon, and Air. Int. J. Thermophys., 25(1):21–69, 2004. doi:10.1023/B:IJOT.0000022327.04529.f3.
 """
 
+import numba as nb
+
+@nb.njit(cache=True)
 def h(T:float) -> float:
     """Mass specific enthalpy as function of temperature at 1 atm (fit valid between 273.15 K to 1000 K).
 
@@ -16,6 +19,7 @@ def h(T:float) -> float:
     """
     return 1062.3436205*T + 100613.952812
   
+@nb.njit(cache=True)
 def T(h:float, p:float=None) -> float:
     """Temperature as function of mass specific enthalpy at 1 atm (fit valid between 273.15 K to 1000 K).
 
@@ -28,6 +32,7 @@ def T(h:float, p:float=None) -> float:
     """
     return 9.41315014e-04*h - 9.47094244e+01
 
+@nb.njit(cache=True)
 def rho(h:float, p:float=None) -> float:
     """Density as function of mass specific enthalpy at 1 atm (fit valid between 273.15 K to 1000 K).
 
@@ -40,6 +45,7 @@ def rho(h:float, p:float=None) -> float:
     """
     return -2.99101902e-18*h**3 + 8.99511511e-12*h**2 - 9.18059393e-06*h + 3.68623992e+00
 
+@nb.njit(cache=True)
 def k(h:float, p:float=None) -> float:
     """Thermal conductivity as function of mass specific enthalpy at 1 atm (fit valid between 273.15 K to 1000 K).
 
@@ -53,6 +59,7 @@ def k(h:float, p:float=None) -> float:
     return -1.91985865e-14*h**2 + 8.53813872e-08*h - 6.32545058e-03
     
 
+@nb.njit(cache=True)
 def cp(h:float, p:float=None) -> float:
     """Specific heat capacity as function of mass specific enthalpy at 1 atm (fit valid between 273.15 K to 1000 K).
 
@@ -65,6 +72,7 @@ def cp(h:float, p:float=None) -> float:
     """
     return -3.31926950e-16*h**3 + 8.48767643e-10*h**2 - 4.95535470e-04*h + 1.08860162e+03
 
+@nb.njit(cache=True)
 def mu(h:float, p:float=None) -> float:
     """Dynamic viscosity as function of mass specific enthalpy at 1 atm (fit valid between 273.15 K to 1000 K).
 
@@ -77,6 +85,7 @@ def mu(h:float, p:float=None) -> float:
     """
     return -1.49118910e-17*h**2 + 5.64575734e-11*h - 2.65149023e-06
 
+@nb.njit(cache=True)
 def Pr(h:float, p:float=None) -> float:
     """Dynamic viscosity as function of mass specific enthalpy at 1 atm (fit valid between 273.15 K to 1000 K).
 
@@ -4,6 +4,9 @@ Data for liquid mixture of sodium (22%) and potassium (78%).
 Reference 1: https://www-pub.iaea.org/MTCD/publications/PDF/IAEA-THPH_web.pdf
 """
 
+import numba as nb
+
+@nb.njit(cache=True)
 def h(T:float) -> float:
     """Mass specific enthalpy as function of temperature at 1 atm (fit valid between 473.15 K to 873.15 K).
 
@@ -15,6 +18,7 @@ def h(T:float) -> float:
     """
     return 880.390075624882e+000*T - 227.268561225071e+003
 
+@nb.njit(cache=True)
 def T(h:float, p:float=None) -> float:
     """Temperature as function of mass specific enthalpy at 1 atm (fit valid between 273 K to 373 K).
 
@@ -27,6 +31,7 @@ def T(h:float, p:float=None) -> float:
     """
     return 1.13586014618602e-003*h + 258.145301176596e+000
 
+@nb.njit(cache=True)
 def rho(h:float, p:float=None) -> float:
     """Density as function of mass specific enthalpy at 1 atm (fit valid between 273 K to 373 K).
 
@@ -39,6 +44,7 @@ def rho(h:float, p:float=None) -> float:
     """
     return -267.073587305967e-006*h + 868.620522246425e+000
 
+@nb.njit(cache=True)
 def k(h:float, p:float=None) -> float:
     """Thermal conductivity as function of mass specific enthalpy at 1 atm (fit valid between 273 K to 373 K).
 
@@ -51,6 +57,7 @@ def k(h:float, p:float=None) -> float:
     """
     return -26.2590503127977e-012*h**2 + 21.6513924586817e-006*h + 21.5505803714445e+000
 
+@nb.njit(cache=True)
 def cp(h:float, p:float=None) -> float:
     """Specific heat capacity as function of mass specific enthalpy at 1 atm (fit valid between 273 K to 373 K).
 
@@ -63,6 +70,7 @@ def cp(h:float, p:float=None) -> float:
     """
     return 474.869992698948e-012*h**2 - 455.554064632647e-006*h**1 + 980.401559485058e+000
 
+@nb.njit(cache=True)
 def mu(h:float, p:float=None) -> float:
     """Dynamic viscosity as function of mass specific enthalpy at 1 atm (fit valid between 273 K to 373 K).
 
@@ -75,6 +83,7 @@ def mu(h:float, p:float=None) -> float:
     """
     return -2.72327193790784e-021*h**3 + 4.15934757530690e-015*h**2 - 2.31891771547815e-009*h + 625.420290036714e-006
 
+@nb.njit(cache=True)
 def Pr(h:float, p:float=None) -> float:
     """Prandtl number as function of mass specific enthalpy at 1 atm (fit valid between 273 K to 373 K).
 
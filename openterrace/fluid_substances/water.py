@@ -6,6 +6,9 @@ Reference 2: M. L. Huber, R. A. Perkins, D. G. Friend, J. V. Sengers, M. J. Assa
 Reference 3: M. L. Huber, R. A. Perkins, A. Laesecke, D. G. Friend, J. V. Sengers, M. J Assael, I. M. Metaxa, E. Vogel, R. Mareš, and K. Miyagawa. New International Formulation for the Viscosity of H2O. J. Phys. Chem. Ref. Data, 38(2):101–125, 2009. doi:10.1063/1.3088050.
 """
 
+import numba as nb
+
+@nb.njit(cache=True)
 def h(T:float) -> float:
     """Mass specific enthalpy as function of temperature at 1 atm (fit valid between 273 K to 373 K).
 
@@ -17,6 +20,7 @@ def h(T:float) -> float:
     """
     return 4186.56437769*T - 1143381.31556279
 
+@nb.njit(cache=True)
 def T(h:float, p:float=None) -> float:
     """Temperature as function of mass specific enthalpy at 1 atm (fit valid between 273 K to 373 K).
 
@@ -29,6 +33,7 @@ def T(h:float, p:float=None) -> float:
     """
     return 2.38859172e-04*h + 2.73107340e+02
 
+@nb.njit(cache=True)
 def rho(h:float, p:float=None) -> float:
     """Density as function of mass specific enthalpy at 1 atm (fit valid between 273 K to 373 K).
 
@@ -41,6 +46,7 @@ def rho(h:float, p:float=None) -> float:
     """
     return -2.01577822e-10*h**2 - 1.84350638e-05*h + 1.00080945e+03
 
+@nb.njit(cache=True)
 def k(h:float, p:float=None) -> float:
     """Thermal conductivity as function of mass specific enthalpy at 1 atm (fit valid between 273 K to 373 K).
 
@@ -53,6 +59,7 @@ def k(h:float, p:float=None) -> float:
     """
     return -5.45934292e-13*h**2 + 5.09161571e-07*h + 5.58152818e-01
 
+@nb.njit(cache=True)
 def cp(h:float, p:float=None) -> float:
     """Specific heat capacity as function of mass specific enthalpy at 1 atm (fit valid between 273 K to 373 K).
 
@@ -65,6 +72,7 @@ def cp(h:float, p:float=None) -> float:
     """
     return -1.91167239e-15*h**3 + 1.96122501e-09*h**2 - 4.90430569e-04*h**1 + 4.21421348e+03    
 
+@nb.njit(cache=True)
 def mu(h:float, p:float=None) -> float:
     """Dynamic viscosity as function of mass specific enthalpy at 1 atm (fit valid between 273 K to 373 K).
 
@@ -77,6 +85,7 @@ def mu(h:float, p:float=None) -> float:
     """
     return 1.05996810e-14*h**2 - 7.39076316e-09*h + 1.61251851e-03
 
+@nb.njit(cache=True)
 def Pr(h:float, p:float=None) -> float:
     """Prandtl number as function of mass specific enthalpy at 1 atm (fit valid between 273 K to 373 K).
 
@@ -0,0 +1,101 @@
+import numpy as np
+import numba as nb
+
+@nb.njit(cache=True)
+def fused_step_1d(h, T, rho, cp, k, A0, A1, dx0, dx1, V, mdot, D, F, diff, conv, bc_type, h_bc, G, GT, dt):
+    """Single-pass explicit time step combining central difference diffusion, upwind convection, boundary conditions and thermal resistance source terms. The enthalpy field h is updated in place.
+
+    Args:
+        h (float): Mass specific enthalpy field of shape (n0, n1), updated in place
+        T (float): Temperature field of shape (n0, n1)
+        rho (float): Density field of shape (n0, n1)
+        cp (float): Specific heat capacity field of shape (n0, n1)
+        k (float): Thermal conductivity field of shape (n0, n1)
+        A0 (float): Area of faces towards node j-1 of shape (n0, n1)
+        A1 (float): Area of faces towards node j+1 of shape (n0, n1)
+        dx0 (float): Distance to node j-1 of shape (n0, n1)
+        dx1 (float): Distance to node j+1 of shape (n0, n1)
+        V (float): Volume of node elements of shape (n0, n1)
+        mdot (float): Mass flow rate of shape (n1,)
+        D (float): Diffusion coefficients of shape (2, n0, n1), overwritten
+        F (float): Convection coefficients of shape (2, n0, n1), overwritten
+        diff (bool): Include diffusion
+        conv (bool): Include convection
+        bc_type (int): Boundary condition type at position 0 and -1 (0: none, 1: fixed_value, 2: fixed_gradient)
+        h_bc (float): Enthalpy of fixed_value boundary conditions of shape (2, n1)
+        G (float): Sum of 2/R over all thermal resistance source terms of shape (n0, n1)
+        GT (float): Sum of 2*T_inf/R over all thermal resistance source terms of shape (n0, n1)
+        dt (float): Time step size in s
+    """
+    for i in range(h.shape[1]):
+        _fused_column(i, h, T, rho, cp, k, A0, A1, dx0, dx1, V, mdot, D, F, diff, conv, bc_type, h_bc, G, GT, dt)
+
+@nb.njit(parallel=True, cache=True)
+def fused_step_1d_parallel(h, T, rho, cp, k, A0, A1, dx0, dx1, V, mdot, D, F, diff, conv, bc_type, h_bc, G, GT, dt):
+    """Multi-threaded variant of fused_step_1d where the columns of h are distributed over threads. Arguments are identical to fused_step_1d.
+    """
+    for i in nb.prange(h.shape[1]):
+        _fused_column(i, h, T, rho, cp, k, A0, A1, dx0, dx1, V, mdot, D, F, diff, conv, bc_type, h_bc, G, GT, dt)
+
+# Kernels taking substance functions as arguments are compiled in each process, as numba cannot cache them
+@nb.njit
+def fused_step_properties_1d(h, T, rho, cp, k, fT, frho, fcp, fk, A0, A1, dx0, dx1, V, mdot, D, F, diff, conv, bc_type, h_bc, G, GT, dt):
+    """Variant of fused_step_1d that first evaluates the compiled substance functions on h, so no properties are computed in Python. T, rho, cp and k are overwritten. Other arguments are identical to fused_step_1d.
+
+    Args:
+        fT (function): Compiled temperature function of the substance
+        frho (function): Compiled density function of the substance
+        fcp (function): Compiled specific heat capacity function of the substance
+        fk (function): Compiled thermal conductivity function of the substance
+    """
+    for i in range(h.shape[1]):
+        _column_properties(i, h, T, rho, cp, k, fT, frho, fcp, fk)
+        _fused_column(i, h, T, rho, cp, k, A0, A1, dx0, dx1, V, mdot, D, F, diff, conv, bc_type, h_bc, G, GT, dt)
+
+@nb.njit(parallel=True)
+def fused_step_properties_1d_parallel(h, T, rho, cp, k, fT, frho, fcp, fk, A0, A1, dx0, dx1, V, mdot, D, F, diff, conv, bc_type, h_bc, G, GT, dt):
+    """Multi-threaded variant of fused_step_properties_1d. Arguments are identical to fused_step_properties_1d.
+    """
+    for i in nb.prange(h.shape[1]):
+        _column_properties(i, h, T, rho, cp, k, fT, frho, fcp, fk)
+        _fused_column(i, h, T, rho, cp, k, A0, A1, dx0, dx1, V, mdot, D, F, diff, conv, bc_type, h_bc, G, GT, dt)
+
+@nb.njit
+def _column_properties(i, h, T, rho, cp, k, fT, frho, fcp, fk):
+    """Evaluate the substance functions on column i of h."""
+    hi = np.ascontiguousarray(h[:,i])
+    T[:,i] = fT(hi)
+    rho[:,i] = frho(hi)
+    cp[:,i] = fcp(hi)
+    k[:,i] = fk(hi)
+
+@nb.njit(cache=True)
+def _fused_column(i, h, T, rho, cp, k, A0, A1, dx0, dx1, V, mdot, D, F, diff, conv, bc_type, h_bc, G, GT, dt):
+    """Advance column i of the fused time step."""
+    n0 = h.shape[0]
+    for j in range(n0):
+        if diff:
+            D[0,j,i] = k[j,i]*A0[j,i]/dx0[j,i]
+            D[1,j,i] = k[j,i]*A1[j,i]/dx1[j,i]
+        if conv:
+            F[0,j,i] = mdot[i]*cp[j,i]
+            F[1,j,i] = mdot[i]*cp[j,i]
+
+    for j in range(n0):
+        q = GT[j,i] - G[j,i]*T[j,i]
+        if j > 0 and j < n0-1:
+            if diff:
+                q += T[j-1,i]*D[0,j,i] + T[j+1,i]*D[1,j,i] - T[j,i]*(D[0,j,i]+D[1,j,i])
+            if conv:
+                q += T[j+1,i]*(-min(F[0,j,i],0)) + T[j-1,i]*max(F[1,j,i],0) + T[j,i]*(min(F[0,j,i],0)-max(F[1,j,i],0))
+        elif j == 0:
+            if bc_type[0] == 1:
+                h[j,i] = h_bc[0,i]
+            elif bc_type[0] == 2:
+                q += 2*T[1,i]*D[1,0,i] - 2*T[0,i]*D[1,0,i] - F[0,1,i]*T[1,i] + F[1,0,i]*T[0,i]
+        else:
+            if bc_type[1] == 1:
+                h[j,i] = h_bc[1,i]
+            elif bc_type[1] == 2:
+                q += 2*T[-2,i]*D[0,-1,i] - 2*T[-1,i]*D[0,-1,i] + F[1,-2,i]*T[-2,i] - F[0,-1,i]*T[-1,i]
+        h[j,i] += q/(rho[j,i]*V[j,i])*dt
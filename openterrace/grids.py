@@ -0,0 +1,86 @@
+import numpy as np
+
+grids = ['uniform', 'geometric', 'tanh']
+refinements = ['start', 'end', 'both']
+
+def node_positions(start:float=None, end:float=None, n:int=None, grid:str='uniform', refine:str='end', stretch:float=None):
+    """Positions of n nodes from start to end, optionally clustered towards one or both ends.
+
+    Args:
+        start (float): Position of the first node
+        end (float): Position of the last node
+        n (int): Number of nodes
+        grid (str): Node distribution ('uniform', 'geometric' or 'tanh')
+        refine (str): End the nodes are clustered towards ('start', 'end' or 'both')
+        stretch (float): Ratio of neighbouring node spacings for 'geometric' (defaults to 1.1) or clustering strength for 'tanh' (defaults to 2)
+
+    Returns:
+        Node positions of shape (n,)
+    """
+
+    if not grid in grids:
+        raise Exception("grid \'"+str(grid)+"\' specified. Valid options for grid are:", grids)
+    if not refine in refinements:
+        raise Exception("refine \'"+str(refine)+"\' specified. Valid options for refine are:", refinements)
+
+    if grid == 'uniform':
+        return np.linspace(start, end, n)
+
+    xi = np.linspace(0, 1, n)
+    if grid == 'geometric':
+        q = 1.1 if stretch is None else stretch
+        k = np.arange(n-1)
+        if refine == 'end':
+            k = k[::-1]
+        elif refine == 'both':
+            k = np.minimum(k, k[::-1])
+        s = np.concatenate(([0], np.cumsum(q**k.astype(float))))
+        s = s/s[-1]
+    else:
+        beta = 2.0 if stretch is None else stretch
+        if refine == 'end':
+            s = np.tanh(beta*xi)/np.tanh(beta)
+        elif refine == 'start':
+            s = 1-np.tanh(beta*(1-xi))/np.tanh(beta)
+        else:
+            s = 0.5*(1+np.tanh(beta*(2*xi-1))/np.tanh(beta))
+    s[0], s[-1] = 0, 1
+    return start + (end-start)*s
+
+def face_positions(x:np.ndarray=None):
+    """Positions of the faces between nodes midway between neighbouring nodes, including the first and last node.
+
+    Args:
+        x (np.ndarray): Node positions of shape (n,)
+
+    Returns:
+        Face positions of shape (n+1,)
+    """
+
+    return np.concatenate(([x[0]], (x[1:]+x[:-1])/2, [x[-1]]))
+
+def face_distances(x:np.ndarray=None):
+    """Distances from each node to its neighbours towards node j-1 and j+1. Boundary nodes use the distance to their only neighbour.
+
+    Args:
+        x (np.ndarray): Node positions of shape (n,)
+
+    Returns:
+        Tuple of distances of shape (n, 1)
+    """
+
+    dx = np.diff(x)
+    return (np.concatenate(([dx[0]], dx))[:,np.newaxis], np.concatenate((dx, [dx[-1]]))[:,np.newaxis])
+
+def element_lengths(x:np.ndarray=None):
+    """Lengths of the node elements of planar domains. Interior elements extend midway to the neighbouring nodes, and boundary elements have the length of the adjacent node spacing as on uniform grids.
+
+    Args:
+        x (np.ndarray): Node positions of shape (n,)
+
+    Returns:
+        Element lengths of shape (n, 1)
+    """
+
+    dx = np.diff(x)
+    return np.concatenate(([dx[0]], (dx[1:]+dx[:-1])/2, [dx[-1]]))[:,np.newaxis]
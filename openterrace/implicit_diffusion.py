@@ -0,0 +1,108 @@
+import numpy as np
+import numba as nb
+
+@nb.njit(cache=True)
+def thomas(a, b, c, d, x, w):
+    """Thomas algorithm for a tridiagonal system with lower diagonal a, main diagonal b and upper diagonal c.
+
+    Args:
+        a (float): Lower diagonal, a[0] is not used
+        b (float): Main diagonal
+        c (float): Upper diagonal, c[-1] is not used
+        d (float): Right-hand side, overwritten
+        x (float): Solution vector
+        w (float): Work array of same length as b
+    """
+    n = b.shape[0]
+    w[0] = c[0]/b[0]
+    d[0] = d[0]/b[0]
+    for j in range(1, n):
+        m = b[j] - a[j]*w[j-1]
+        w[j] = c[j]/m
+        d[j] = (d[j] - a[j]*d[j-1])/m
+    x[n-1] = d[n-1]
+    for j in range(n-2, -1, -1):
+        x[j] = d[j] - w[j]*x[j+1]
+
+@nb.njit(cache=True)
+def implicit_diffusion_1d(h, T, rho, cp, D, F, C, V, conv, bc_type, h_bc, T_bc, G, GT, theta, dt):
+    """Theta-method time step of the central difference diffusion operator (theta=1: backward Euler, theta=0.5: Crank-Nicolson). Convection is treated explicitly and thermal resistance source terms with the same theta-weighting as diffusion. One tridiagonal system is solved per column and h is updated in place.
+
+    Args:
+        h (float): Mass specific enthalpy field of shape (n0, n1), updated in place
+        T (float): Temperature field of shape (n0, n1)
+        rho (float): Density field of shape (n0, n1)
+        cp (float): Specific heat capacity field of shape (n0, n1)
+        D (float): Diffusion coefficients of shape (2, n0, n1)
+        F (float): Convection coefficients of shape (2, n0, n1)
+        C (float): Explicit convection contribution of interior nodes of shape (n0, n1)
+        V (float): Volume of node elements of shape (n0, n1)
+        conv (bool): Include convection in fixed_gradient boundary nodes
+        bc_type (int): Boundary condition type at position 0 and -1 (0: none, 1: fixed_value, 2: fixed_gradient)
+        h_bc (float): Enthalpy of fixed_value boundary conditions of shape (2, n1)
+        T_bc (float): Temperature of fixed_value boundary conditions of shape (2, n1)
+        G (float): Sum of 2/R over all thermal resistance source terms of shape (n0, n1)
+        GT (float): Sum of 2*T_inf/R over all thermal resistance source terms of shape (n0, n1)
+        theta (float): Implicitness of the time integration
+        dt (float): Time step size in s
+    """
+    n0 = h.shape[0]
+    a, b, c, d, x, w = np.zeros(n0), np.zeros(n0), np.zeros(n0), np.zeros(n0), np.zeros(n0), np.zeros(n0)
+    for i in range(h.shape[1]):
+        _implicit_column(i, h, T, rho, cp, D, F, C, V, conv, bc_type, h_bc, T_bc, G, GT, theta, dt, a, b, c, d, x, w)
+
+@nb.njit(parallel=True, cache=True)
+def implicit_diffusion_1d_parallel(h, T, rho, cp, D, F, C, V, conv, bc_type, h_bc, T_bc, G, GT, theta, dt):
+    """Multi-threaded variant of implicit_diffusion_1d where the tridiagonal systems of the columns are distributed over threads. Arguments are identical to implicit_diffusion_1d.
+    """
+    n0 = h.shape[0]
+    for i in nb.prange(h.shape[1]):
+        a, b, c, d, x, w = np.zeros(n0), np.zeros(n0), np.zeros(n0), np.zeros(n0), np.zeros(n0), np.zeros(n0)
+        _implicit_column(i, h, T, rho, cp, D, F, C, V, conv, bc_type, h_bc, T_bc, G, GT, theta, dt, a, b, c, d, x, w)
+
+@nb.njit(cache=True)
+def _implicit_column(i, h, T, rho, cp, D, F, C, V, conv, bc_type, h_bc, T_bc, G, GT, theta, dt, a, b, c, d, x, w):
+    """Assemble and solve the tridiagonal system of column i and update h."""
+    n0 = h.shape[0]
+    for j in range(n0):
+        Dl = 0.0
+        Du = 0.0
+        q = C[j,i]
+        if j > 0 and j < n0-1:
+            Dl = D[0,j,i]
+            Du = D[1,j,i]
+        elif j == 0 and bc_type[0] == 2:
+            Du = 2*D[1,0,i]
+            if conv:
+                q += -F[0,1,i]*T[1,i] + F[1,0,i]*T[0,i]
+        elif j == n0-1 and bc_type[1] == 2:
+            Dl = 2*D[0,-1,i]
+            if conv:
+                q += F[1,-2,i]*T[-2,i] - F[0,-1,i]*T[-1,i]
+
+        if (j == 0 and bc_type[0] == 1) or (j == n0-1 and bc_type[1] == 1):
+            a[j] = 0.0
+            b[j] = 1.0
+            c[j] = 0.0
+            d[j] = T_bc[0,i] if j == 0 else T_bc[1,i]
+            continue
+
+        M = rho[j,i]*V[j,i]*cp[j,i]/dt
+        a[j] = -theta*Dl
+        b[j] = M + theta*(Dl+Du+G[j,i])
+        c[j] = -theta*Du
+        d[j] = M*T[j,i] + GT[j,i] - (1-theta)*G[j,i]*T[j,i] + q
+        if Dl != 0.0:
+            d[j] += (1-theta)*Dl*(T[j-1,i]-T[j,i])
+        if Du != 0.0:
+            d[j] += (1-theta)*Du*(T[j+1,i]-T[j,i])
+
+    thomas(a, b, c, d, x, w)
+
+    for j in range(n0):
+        if j == 0 and bc_type[0] == 1:
+            h[j,i] = h_bc[0,i] + (GT[j,i]-G[j,i]*T[j,i])/(rho[j,i]*V[j,i])*dt
+        elif j == n0-1 and bc_type[1] == 1:
+            h[j,i] = h_bc[1,i] + (GT[j,i]-G[j,i]*T[j,i])/(rho[j,i]*V[j,i])*dt
+        else:
+            h[j,i] += cp[j,i]*(x[j]-T[j,i])
@@ -0,0 +1,42 @@
+import numpy as np
+import numba as nb
+
+reductions = ['mass_weighted_mean', 'mass_weighted_sum', 'node', 'min', 'max']
+
+@nb.njit(cache=True)
+def reduce(kind, x, rho, V, j, i, n_members, out):
+    """Reduce a field to one value per ensemble member.
+
+    Args:
+        kind (int): Index of the reduction in reductions
+        x (float): Field of shape (n0, n_members*n1)
+        rho (float): Density field of shape (n0, n_members*n1)
+        V (float): Volume of node elements of shape (n0, n_members*n1)
+        j (int): Node index along axis 0 of node reductions
+        i (int): Node index along axis 1 within each member of node reductions
+        n_members (int): Number of ensemble members
+        out (float): Reduced values of shape (n_members,)
+    """
+    n1 = x.shape[1]//n_members
+    for m in range(n_members):
+        c0 = m*n1
+        if kind == 2:
+            out[m] = x[j,c0+i]
+            continue
+        acc = 0.0
+        w = 0.0
+        if kind == 3:
+            acc = np.inf
+        elif kind == 4:
+            acc = -np.inf
+        for jj in range(x.shape[0]):
+            for ii in range(c0, c0+n1):
+                if kind <= 1:
+                    mass = rho[jj,ii]*V[jj,ii]
+                    acc += mass*x[jj,ii]
+                    w += mass
+                elif kind == 3:
+                    acc = min(acc, x[jj,ii])
+                else:
+                    acc = max(acc, x[jj,ii])
+        out[m] = acc/w if kind == 0 else acc
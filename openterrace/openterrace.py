@@ -5,37 +5,321 @@ from . import domains
 from . import diffusion_schemes
 from . import convection_schemes
 from . import boundary_conditions
+from . import output_backends
+from . import fused_step
+from . import implicit_diffusion
+from . import coupling
+from . import acceleration as acceleration_methods
+from . import particle_models
+from . import property_tables
+from . import monitors
+from . import energy_flows
+from . import profiler
 
 # Import common Python modules
 import sys
-import tqdm
+import os
 import numpy as np
-import matplotlib
+import numba as nb
 import time
-matplotlib.use('agg')
+
+# Select the non-interactive matplotlib backend without importing matplotlib
+os.environ.setdefault('MPLBACKEND', 'agg')
+
+def register_substance(type:str=None, name:str=None, substance=None):
+    """Registers a user-defined substance, which can then be selected with Phase.select_substance like the predefined substances.
+
+    Args:
+        type (str): Type of phase ('bed' or 'fluid')
+        name (str): Substance name
+        substance (module): Module or object with the functions h, T, rho, cp and k. If these are numba.njit functions, properties are evaluated inside the fused kernel
+    """
+
+    valid_types = ['fluid','bed']
+    if type not in valid_types:
+        raise Exception("Type \'"+str(type)+"\' specified. Valid options for types are:", valid_types)
+    if not name:
+        raise Exception("Keyword 'name' not specified.")
+    for fcn in ['h', 'T', 'rho', 'cp', 'k']:
+        if not callable(getattr(substance, fcn, None)):
+            raise Exception("Substance \'"+name+"\' is missing function \'"+fcn+"\'.")
+
+    substances = globals()[type+'_substances']
+    setattr(substances, name, substance)
+    if not name in substances.__all__:
+        substances.__all__.append(name)
 
 class Setup:
     """OpenTerrace class."""
 
-    def __init__(self, t_simulate:float=None, dt:float=None, t_start:float=0):
+    def __init__(self, t_simulate:float=None, dt:float=None, t_start:float=0, n_threads:int=None):
         """Initialise with various control parameters.
 
         Args:
             t_simulate (float): Start time in s
             dt (float): Time step size in s
+            n_threads (int): Number of threads used by phases with parallel schemes (defaults to all available cores)
         """
+
+        if n_threads is not None and not 1 <= n_threads <= nb.config.NUMBA_NUM_THREADS:
+            raise Exception("n_threads must be between 1 and "+str(nb.config.NUMBA_NUM_THREADS)+".")
+
         self.t_simulate = t_simulate
         self.dt = dt
+        self.n_threads = n_threads
         self.coupling = []
         self.flag_coupling = False
+        self.flag_adaptive_dt = False
+        self.flag_checkpoint = False
+        self.flag_profiling = False
+        self.flag_cyclic = False
+        self.events = []
         self.t = t_start
-        
+
+    def select_adaptive_dt(self, dt_min:float=None, dt_max:float=None, safety:float=0.9, growth:float=1.2):
+        """Selects adaptive time stepping. The time step size is limited by the CFL and Fourier numbers of the explicit terms in all phases and lands exactly on output times.
+
+        Args:
+            dt_min (float): Minimum time step size in s
+            dt_max (float): Maximum time step size in s
+            safety (float): Fraction of the stable time step size to use
+            growth (float): Maximum growth factor of the time step size between two steps
+        """
+
+        if dt_min is None or dt_max is None:
+            raise Exception("Keywords 'dt_min' and 'dt_max' must be specified.")
+        if not 0 < dt_min <= dt_max:
+            raise Exception("Keywords 'dt_min' and 'dt_max' must satisfy 0 < dt_min <= dt_max.")
+
+        self.dt_min = dt_min
+        self.dt_max = dt_max
+        self.safety = safety
+        self.growth = growth
+        self.flag_adaptive_dt = True
+
+    def select_profiling(self, progress_bar:bool=True, path:str=None):
+        """Selects profiling of run_simulation. The wall time of each stage of the time step is recorded, and a summary with node updates per second is printed at the end of the run, stored in self.profile and optionally written to a JSON file.
+
+        Args:
+            progress_bar (bool): Show a progress bar with node updates per second and estimated time remaining
+            path (str): JSON file of the summary
+        """
+
+        self.profiler = profiler.Profiler(progress_bar=progress_bar, path=path)
+        self.flag_profiling = True
+
+    def select_cyclic_steady_state(self, tol:float=1e-3, max_cycles:int=50, acceleration:str='anderson', depth:int=5):
+        """Selects cyclic steady-state mode. run_simulation then repeats cycles of length t_simulate, each from the same start time, until the state at the end of a cycle equals the state at its start. Time-dependent mass flow rates are therefore the same in every cycle. The cycle is a map from the initial to the final enthalpy fields, and the initial state of the next cycle is extrapolated from the previous cycles. Output, monitors and energy balances hold the last cycle, and the largest temperature change of each cycle is stored in self.cycle_residuals.
+
+        Args:
+            tol (float): Largest change of the temperature of any node over a cycle at convergence in K
+            max_cycles (int): Maximum number of cycles
+            acceleration (str): Extrapolation over cycles ('none', 'aitken' or 'anderson')
+            depth (int): Number of previous cycles used by 'anderson'
+        """
+
+        if not acceleration in acceleration_methods.methods:
+            raise Exception("acceleration \'"+str(acceleration)+"\' specified. Valid options for acceleration are:", acceleration_methods.methods)
+        if max_cycles is None or max_cycles < 1:
+            raise Exception("Keyword 'max_cycles' must be a positive integer.")
+
+        self.cyclic_tol = tol
+        self.max_cycles = max_cycles
+        self.acceleration = acceleration
+        self.acceleration_depth = depth
+        self.flag_cyclic = True
+
+    def add_event(self, condition=None, action=None, terminal:bool=False, direction:int=0, locate:bool=True, name:str=None):
+        """Adds an event that occurs when a condition on the state of the phases changes sign during a time step, e.g. when the outlet temperature crosses a cut-off temperature. Events can stop the simulation and change boundary conditions and mass flow rates. Occurred events are listed in self.event_log as tuples of name and time.
+
+        Args:
+            condition (function): Function condition(t, phases) of the time and the list of phases returning a float. It is evaluated after each time step, where the enthalpy h of the phases is current and T and the other properties are those of the start of the time step, so phase.fcns.T(phase.h) gives the current temperature
+            action (function): Function action(t, phases) called when the event occurs, e.g. to call select_bc or select_massflow of a phase
+            terminal (bool): Stop the simulation when the event occurs
+            direction (int): Detect only crossings from negative to positive (1), from positive to negative (-1) or both (0)
+            locate (bool): Repeat the time step in which the event occurs so that it ends at the time of the crossing, interpolated linearly between the condition values at the start and end of the time step
+            name (str): Name of the event (defaults to the number of the event)
+        """
+
+        if not callable(condition):
+            raise Exception("Keyword 'condition' must be a function of the time and the list of phases.")
+        if not direction in [-1, 0, 1]:
+            raise Exception("direction \'"+str(direction)+"\' specified. Valid options for direction are:", [-1, 0, 1])
+
+        self.events.append({'name': str(len(self.events)) if name is None else name, 'condition': condition, 'action': action,
+                            'terminal': terminal, 'direction': direction, 'locate': locate})
+
+    def _event_state(self, phases:list=None):
+        """State of all phases at the start of a time step needed to repeat the step with a shorter time step size. The properties follow from the enthalpy and are only evaluated when a step is repeated, and the enthalpy is copied to a buffer reused in every time step."""
+
+        state = []
+        for phase in phases:
+            if getattr(phase, '_h_event', None) is None or phase._h_event.shape != np.shape(phase.h):
+                phase._h_event = np.zeros(np.shape(phase.h))
+            np.copyto(phase._h_event, phase.h)
+            state.append({'h': phase._h_event})
+            state[-1].update({var: np.array(getattr(phase, var)) for var in ['mdot', 'dT_profile'] if hasattr(phase, var)})
+            if phase._flag_energy_balance:
+                state[-1]['energy_balance'] = {name: value.copy() for name, value in phase.energy_balance.items()}
+        return state
+
+    def _handle_events(self, phases:list=None, state:list=None, t:float=None, dt:float=None, multirate:bool=False):
+        """Detect the events that occurred during the last time step. The first event is located in time by repeating the time step, and its action is applied.
+
+        Args:
+            phases (list): List of phases
+            state (list): State of the phases at the start of the time step
+            t (float): Start time of the time step
+            dt (float): Time step size
+            multirate (bool): Phases are advanced with sub-steps
+
+        Returns:
+            True if a terminal event occurred
+        """
+
+        values = [float(event['condition'](self.t, phases)) for event in self.events]
+        crossed = []
+        for i, event in enumerate(self.events):
+            g0, g1 = self._event_values[i], values[i]
+            if (event['direction'] >= 0 and g0 < 0 <= g1) or (event['direction'] <= 0 and g0 > 0 >= g1):
+                crossed.append((g0/(g0-g1), i))
+        if not crossed:
+            self._event_values = values
+            return False
+
+        fraction, i = min(crossed)
+        event = self.events[i]
+        if event['locate'] and fraction < 1:
+            for phase, phase_state in zip(phases, state):
+                for var, value in phase_state.items():
+                    setattr(phase, var, {name: x.copy() for name, x in value.items()} if var == 'energy_balance' else value.copy())
+                phase._refresh_properties()
+            self.t = t
+            self._step(phases, fraction*dt, t+fraction*dt, multirate)
+            g1 = values[i]
+            values = [float(event['condition'](self.t, phases)) for event in self.events]
+            # The located step may end just before the crossing, so the event keeps the value after the crossing
+            values[i] = g1
+
+        self.event_log.append((event['name'], self.t))
+        print("Event \'"+str(event['name'])+"\' occurred at t = "+str(self.t)+" s")
+        if event['action'] is not None:
+            event['action'](self.t, phases)
+        self._event_values = values
+        return event['terminal']
+
+    def select_checkpoint(self, path:str=None, every_steps:int=None, every_minutes:float=None):
+        """Selects periodic checkpointing of the simulation state. The checkpoint file is written at the selected interval and at the end of run_simulation, and is replaced atomically so an interrupted write leaves the previous checkpoint intact.
+
+        Args:
+            path (str): Checkpoint file
+            every_steps (int): Number of time steps between checkpoints
+            every_minutes (float): Wall-clock time in minutes between checkpoints
+        """
+
+        if path is None:
+            raise Exception("Keyword 'path' not specified.")
+        if every_steps is None and every_minutes is None:
+            raise Exception("Keyword 'every_steps' or 'every_minutes' must be specified.")
+
+        self.checkpoint_path = path
+        self.checkpoint_every_steps = every_steps
+        self.checkpoint_every_minutes = every_minutes
+        self.flag_checkpoint = True
+
+    def restore(self, path:str=None, phases:list=None):
+        """Restores the simulation state from a checkpoint file. The setup and phases must be configured as in the run that wrote the checkpoint. The simulation then continues from the time of the checkpoint to the end time of this setup. Monitors are restored, but output stored with on-disk backends is not part of the checkpoint.
+
+        Args:
+            path (str): Checkpoint file
+            phases (list): List of phases in the same order as in the run that wrote the checkpoint
+        """
+
+        with np.load(path) as checkpoint:
+            if int(checkpoint['n_phases']) != len(phases):
+                raise Exception("Checkpoint contains "+str(int(checkpoint['n_phases']))+" phases, but "+str(len(phases))+" phases were specified.")
+
+            t = float(checkpoint['t'])
+            self.t_simulate = self.t_simulate+self.t-t
+            self.t = t
+            if 'dt_adaptive' in checkpoint:
+                self._dt_restart = float(checkpoint['dt_adaptive'])
+
+            for i, phase in enumerate(phases):
+                prefix = 'phase'+str(i)+'_'
+                for var in ['h', 'T', 'rho', 'cp', 'k', 'mdot', 'dT_profile']:
+                    if prefix+var in checkpoint:
+                        setattr(phase, var, checkpoint[prefix+var].copy())
+                for j, bc in enumerate(phase.bc):
+                    bc['value'] = checkpoint[prefix+'bc'+str(j)].copy()
+                if hasattr(phase, 'monitors'):
+                    phase._monitor_step = int(checkpoint[prefix+'monitor_step'])
+                    for name, monitor in phase.monitors.items():
+                        monitor['times'][:] = checkpoint[prefix+'monitor_'+name+'_times']
+                        monitor['values'][:] = checkpoint[prefix+'monitor_'+name+'_values']
+                        monitor['count'] = int(checkpoint[prefix+'monitor_'+name+'_count'])
+                if phase._flag_energy_balance:
+                    for name in phase.energy_balance:
+                        if prefix+'energy_'+name in checkpoint:
+                            phase.energy_balance[name] = checkpoint[prefix+'energy_'+name].copy()
+                if hasattr(phase, 'data'):
+                    phase._q = int(checkpoint[prefix+'q'])
+                    for parameter in phase.data.parameters:
+                        if prefix+'data_'+parameter in checkpoint:
+                            phase.data.parameters[parameter][:] = checkpoint[prefix+'data_'+parameter]
+                phase._plan = None
+
+    def _write_checkpoint(self, phases:list=None):
+        """Write the simulation state to the checkpoint file."""
+
+        state = {'t': self.t, 'n_phases': len(phases)}
+        if self.flag_adaptive_dt:
+            state['dt_adaptive'] = self._dt_adaptive
+        for i, phase in enumerate(phases):
+            prefix = 'phase'+str(i)+'_'
+            for var in ['h', 'T', 'rho', 'cp', 'k', 'mdot', 'dT_profile']:
+                if hasattr(phase, var):
+                    state[prefix+var] = getattr(phase, var)
+            for j, bc in enumerate(phase.bc):
+                state[prefix+'bc'+str(j)] = bc['value']
+            if hasattr(phase, 'monitors'):
+                state[prefix+'monitor_step'] = phase._monitor_step
+                for name, monitor in phase.monitors.items():
+                    for var in ['times', 'values', 'count']:
+                        state[prefix+'monitor_'+name+'_'+var] = monitor[var]
+            if phase._flag_energy_balance:
+                for name, value in phase.energy_balance.items():
+                    state[prefix+'energy_'+name] = value
+            if hasattr(phase, 'data'):
+                state[prefix+'q'] = phase._q
+                for parameter, value in phase.data.parameters.items():
+                    if isinstance(value, np.ndarray) and not isinstance(value, np.memmap):
+                        state[prefix+'data_'+parameter] = value
+
+        tmp = self.checkpoint_path+'.tmp'
+        with open(tmp, 'wb') as f:
+            np.savez(f, **state)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.checkpoint_path)
+        self._checkpoint_step = 0
+        self._checkpoint_time = time.time()
+
+    def _checkpoint_due(self):
+        """Check if a checkpoint is due at the current time."""
+
+        if self.checkpoint_every_steps is not None and self._checkpoint_step >= self.checkpoint_every_steps:
+            return True
+        if self.checkpoint_every_minutes is not None and time.time()-self._checkpoint_time >= 60*self.checkpoint_every_minutes:
+            return True
+        return False
+
     def select_coupling(self, fluid_phase:int=None, bed_phase:int=None, h_exp:str=None, h_value:float=None):
         """Selects coupling of a fluid and bed phase
 
         Args:
-            fluid_phase (int): phase number
-            bed_phase (int): phase number
+            fluid_phase (int): Index of the fluid phase in the list of phases passed to run_simulation
+            bed_phase (int): Index of the bed phase in the list of phases passed to run_simulation
             h_exp (str): Predefined function for convective heat transfer
             h_value (float): Convective heat transfer coefficient in W/(m^2 K)
         """
@@ -47,40 +331,371 @@ class Setup:
         self.coupling.append({"fluid_phase":fluid_phase, "bed_phase":bed_phase, "h_exp":h_exp, "h_value":h_value})
         self.flag_coupling = True
 
-    def _coupling(self):
-        """This is the function that couples the fluid and bed phase."""
+    def _build_coupling_plan(self):
+        """Resolve the phases of each coupling and precompute constant geometric quantities."""
+
+        self._coupling_plan = []
         for couple in self.coupling:
-            n_bed = self.Phase.instances[couple['fluid_phase']].domain.V/self.Phase.instances[couple['fluid_phase']].phi*(1-self.Phase.instances[couple['fluid_phase']].phi)/self.Phase.instances[couple['bed_phase']].domain.V0 #ok
+            fluid = self.phases[couple['fluid_phase']]
+            bed = self.phases[couple['bed_phase']]
+            if fluid.n_members != bed.n_members or fluid.domain.n[1] != 1 or bed.T.shape[1] != fluid.T.size:
+                raise Exception("Coupled phases must have the same number of ensemble members and one bed column per fluid node.")
+
+            # Per bed column c = member*n_f + fluid node
+            per_column = lambda x: np.require(np.broadcast_to(x, fluid.T.shape).T.ravel(), np.float64, ['C', 'W'])
+            self._coupling_plan.append({
+                'fluid': fluid,
+                'bed': bed,
+                'n_bed': per_column(fluid.domain.V/fluid.phi*(1-fluid.phi)/bed.domain.V0),
+                'hA': float(couple['h_value']*np.asarray(bed.domain.A[1][-1]).item()),
+                'inv_V_f': per_column(1/fluid.domain.V),
+                'inv_V_b': float(1/np.asarray(bed.domain.V[-1]).item()),
+                'model': particle_models.models.index(bed.domain.model) if hasattr(bed.domain, 'model') else -1,
+                'hR': float(couple['h_value']*getattr(bed.domain, 'radius', 0)),
+                'T_s': np.zeros((1, bed.T.shape[1])),
+            })
+            bed._energy_weight = self._coupling_plan[-1]['n_bed']
+
+    def _coupling(self, dt:float=None):
+        """This is the function that couples the fluid and bed phase.
 
-            Q = couple['h_value']*self.Phase.instances[couple['bed_phase']].domain.A[-1][-1]*(self.Phase.instances[couple['fluid_phase']].T[0]-self.Phase.instances[couple['bed_phase']].T[:,-1])*self.dt #ok
+        Args:
+            dt (float): Time step size
+        """
 
-            self.Phase.instances[couple['bed_phase']].h[:,-1] = self.Phase.instances[couple['bed_phase']].h[:,-1] + Q/(self.Phase.instances[couple['bed_phase']].rho[:,-1] * self.Phase.instances[couple['bed_phase']].domain.V[-1]) #ok
+        for plan in self._coupling_plan:
+            fluid = plan['fluid']
+            bed = plan['bed']
+            T_s = self._surface_temperature(plan, dt)
+            balance = fluid._flag_energy_balance or bed._flag_energy_balance
+            if balance:
+                Q = plan['hA']*(np.broadcast_to(fluid.T, fluid.h.shape).T.ravel()-T_s[-1])*dt
+                h_f, h_b = np.array(fluid.h, dtype=np.float64), np.array(bed.h[-1], dtype=np.float64)
+            coupling.coupling_1d(fluid.h, fluid.T, fluid.rho, plan['inv_V_f'], bed.h, T_s, bed.rho, plan['inv_V_b'], plan['n_bed'], plan['hA'], dt)
+            if balance:
+                fluid._add_energy(stored=np.sum(fluid.rho*fluid.domain.V*(fluid.h-h_f), axis=0), coupling=-np.sum((plan['n_bed']*Q).reshape(fluid.n_members, -1), axis=1))
+                bed._add_energy(stored=bed.rho[-1]*np.asarray(bed.domain.V[-1])*(bed.h[-1]-h_b), coupling=Q)
+
+    def _surface_temperature(self, plan:dict=None, dt:float=None):
+        """Temperature of the particle surfaces seen by the fluid. Resolved particles use the temperature of their surface nodes, and reduced-order particle models derive it from the mean temperature of the particles and the fluid temperature and advance their internal state over the time step.
+
+        Args:
+            plan (dict): Coupling plan entry
+            dt (float): Time step size
+
+        Returns:
+            Temperature of shape (n_r, n_members*n_f) with the surface temperature in the last row
+        """
+
+        bed = plan['bed']
+        if plan['model'] < 0:
+            return bed.T
+        bed.k = np.require(np.broadcast_to(bed.fcns.k(bed.h), bed.h.shape), np.float64, ['C', 'W'])
+        particle_models.surface_temperature_1d(plan['model'], plan['fluid'].T, bed.T, bed.rho, bed.cp, bed.k, bed.dT_profile, plan['hR'], bed.domain.radius, dt, plan['T_s'])
+        return plan['T_s']
+
+    def get_energy_balance(self, phases:list=None):
+        """Returns the energy balance of all phases with an energy balance. Heat exchanged by coupling cancels between the phases, so the residual is the energy created or lost by the simulation as a whole.
+
+        Args:
+            phases (list): Phases to include (defaults to the phases of the last run)
+
+        Returns:
+            Dictionary of energies in J with the same keys as Phase.get_energy_balance, summed over the phases
+        """
+
+        phases = [phase for phase in (self.phases if phases is None else phases) if phase._flag_energy_balance]
+        if not phases:
+            raise Exception("No phase has an energy balance. Use select_energy_balance before running the simulation.")
+        balances = [phase.get_energy_balance() for phase in phases]
+        return {name: sum(balance[name] for balance in balances) for name in balances[0]}
+
+    def _coupling_stable_dt(self):
+        """Largest stable time step size of the explicit coupling between phases.
+
+        Returns:
+            Stable time step size in s
+        """
+
+        dt = np.inf
+        for plan in self._coupling_plan:
+            fluid = plan['fluid']
+            bed = plan['bed']
+            C_bed = bed.rho[-1,:]*bed.cp[-1,:]/plan['inv_V_b']
+            C_fluid = (fluid.rho*fluid.cp).T.ravel()/plan['inv_V_f']
+            dt = min(dt, np.min(1/(plan['hA']/C_bed + plan['n_bed']*plan['hA']/C_fluid)))
+        return dt
+
+    def _adaptive_dt(self, phases:list=None, t_end:float=None):
+        """Compute the next time step size and the time it ends at.
+
+        Args:
+            phases (list): Phases to advance
+            t_end (float): End time of the simulation in s
+
+        Returns:
+            Time step size in s and end time of the time step in s
+        """
+
+        dt_stable = np.inf
+        for phase in phases:
+            if not hasattr(phase, 'n_substeps'):
+                dt_stable = min(dt_stable, phase._stable_dt(self.t, self._dt_adaptive*self.growth))
+        if self.flag_coupling:
+            dt_stable = min(dt_stable, self._coupling_stable_dt())
+
+        dt = min(self.dt_max, self._dt_adaptive*self.growth, self.safety*dt_stable)
+        dt = max(dt, self.dt_min)
+        self._dt_adaptive = dt
+
+        t_land = t_end
+        for phase in phases:
+            if hasattr(phase, 'data') and phase._q < len(phase.data.times):
+                t_land = min(t_land, max(phase.data.times[phase._q], self.t))
+        if self.t+dt >= t_land:
+            return t_land-self.t, t_land
+        return dt, self.t+dt
+
+    def _advance_multirate(self, phases:list=None, dt:float=None):
+        """Advance all phases over a synchronisation interval with their own number of sub-steps. The coupling heat transfer rates are evaluated once at the start of the interval and applied in every sub-step of both phases, so the energy leaving one phase equals the energy entering the other.
+
+        Args:
+            phases (list): Phases to advance
+            dt (float): Synchronisation interval in s
+        """
+
+        t = self.t
+        safety = self.safety if self.flag_adaptive_dt else 0.9
+
+        for phase in phases:
+            phase._q_coupling = np.zeros(phase.T.shape)
+        if self.flag_coupling:
+            for plan in self._coupling_plan:
+                fluid = plan['fluid']
+                bed = plan['bed']
+                coupling.coupling_rates_1d(fluid.T, self._surface_temperature(plan, dt), plan['n_bed'], plan['hA'], fluid._q_coupling, bed._q_coupling)
+
+        for phase in phases:
+            n = phase._substeps(t, dt, safety)
+            for k in range(n):
+                if hasattr(phase, 'mdot_array'):
+                    phase._update_massflow_rate(t+(k+1)*dt/n)
+                phase._update_properties()
+                phase._solve_equations(dt/n)
+                phase._apply_coupling(dt/n)
 
-            self.Phase.instances[couple['fluid_phase']].h[0] = self.Phase.instances[couple['fluid_phase']].h[0] - n_bed * Q/(self.Phase.instances[couple['fluid_phase']].rho*self.Phase.instances[couple['fluid_phase']].domain.V) #ok
-            
     def run_simulation(self, phases:list[str]=None):
         """If you want to run the simulation, you need to call this function. If data output is specified using the select_output function, the data will live in that specific phase instance. For more details on how to access the data, please refer to the tutorials."""
-        
+
+        if self.flag_cyclic:
+            self._run_cycles(phases)
+        else:
+            self._run(phases)
+
+    def _run_cycles(self, phases:list=None):
+        """Repeat cycles from the same start time until the cyclic steady state is reached, extrapolating the initial state of each cycle from the previous cycles.
+
+        Args:
+            phases (list): List of phases
+        """
+
         t_start = self.t
+        x, f = [], []
+        self.cycle_residuals = []
+        self.cyclic_converged = False
+
+        for cycle in range(self.max_cycles):
+            x.append(self._cycle_state(phases))
+            self.t = t_start
+            for phase in phases:
+                if hasattr(phase, 'data'):
+                    phase._q = 0
+                    phase._previous_data = None
+                if hasattr(phase, 'monitors'):
+                    phase._monitor_step = 0
+                    for monitor in phase.monitors.values():
+                        monitor['count'] = 0
+                if phase._flag_energy_balance:
+                    phase.select_energy_balance()
+            self._run(phases)
+
+            f.append(self._cycle_state(phases))
+            self.cycle_residuals.append(np.max(np.abs(f[-1]-x[-1])/self._cycle_scale(phases)))
+            print("Cycle "+str(cycle+1)+": largest temperature change "+f"{self.cycle_residuals[-1]:.3g}"+" K")
+            if self.cycle_residuals[-1] < self.cyclic_tol:
+                self.cyclic_converged = True
+                return
+
+            # Restart the extrapolation if the last cycle diverged from the fixed point
+            if len(self.cycle_residuals) > 1 and self.cycle_residuals[-1] > self.cycle_residuals[-2]:
+                x, f = x[-1:], f[-1:]
+            x, f = x[-self.acceleration_depth-1:], f[-self.acceleration_depth-1:]
+            self._set_cycle_state(phases, acceleration_methods.extrapolate(x, f, self.acceleration, self.acceleration_depth))
+
+        print("Cyclic steady state not reached within "+str(self.max_cycles)+" cycles.")
+
+    def _cycle_state(self, phases:list=None):
+        """State of all phases at the start or end of a cycle as a single vector.
+
+        Args:
+            phases (list): List of phases
+
+        Returns:
+            Enthalpy fields of all phases followed by the internal states of reduced-order particle models
+        """
+
+        return np.concatenate([np.ravel(phase.h) for phase in phases]+[phase.dT_profile for phase in phases if hasattr(phase, 'dT_profile')])
+
+    def _cycle_scale(self, phases:list=None):
+        """Scale converting the entries of the cycle state to temperatures.
+
+        Args:
+            phases (list): List of phases
+
+        Returns:
+            Specific heat capacity for enthalpies and one for temperatures
+        """
+
+        return np.concatenate([np.ravel(np.broadcast_to(phase.cp, phase.h.shape)) for phase in phases]+[np.ones_like(phase.dT_profile) for phase in phases if hasattr(phase, 'dT_profile')])
+
+    def _set_cycle_state(self, phases:list=None, x:np.ndarray=None):
+        """Set the state of all phases from a cycle state vector and update their properties.
+
+        Args:
+            phases (list): List of phases
+            x (np.ndarray): Cycle state
+        """
+
+        i = 0
+        for phase in phases:
+            phase.h = x[i:i+phase.h.size].reshape(phase.h.shape).copy()
+            i += phase.h.size
+            phase._refresh_properties()
+        for phase in phases:
+            if hasattr(phase, 'dT_profile'):
+                phase.dT_profile = x[i:i+phase.dT_profile.size].copy()
+                i += phase.dT_profile.size
+
+    def _run(self, phases:list=None):
+        """Advance all phases from the current time by t_simulate.
+
+        Args:
+            phases (list): List of phases
+        """
+
+        self.phases = phases
+        if self.flag_coupling:
+            self._build_coupling_plan()
+        multirate = any(hasattr(phase, 'n_substeps') for phase in phases)
+        t_start = self.t
+        t_end = t_start+self.t_simulate
+
+        if self.n_threads is not None:
+            nb.set_num_threads(self.n_threads)
 
         print("Simulation started at t = "+str(t_start)+" s")
-        print("Simulation will run until t = "+str(t_start+self.t_simulate)+" s")
-        print("Time step size is "+str(self.dt)+" s")
+        print("Simulation will run until t = "+str(t_end)+" s")
+        if self.flag_adaptive_dt:
+            print("Time step size is adaptive between "+str(self.dt_min)+" s and "+str(self.dt_max)+" s")
+            self._dt_adaptive = min(max(self.dt if self.dt is not None else self.dt_min, self.dt_min), self.dt_max)/self.growth
+            if hasattr(self, '_dt_restart'):
+                self._dt_adaptive = self.__dict__.pop('_dt_restart')
+        else:
+            print("Time step size is "+str(self.dt)+" s")
 
-        while self.t < t_start+self.t_simulate:
-            self.t = self.t+self.dt
+        if self.flag_profiling:
+            self.profiler.start(self, phases, t_end-t_start)
 
+        try:
             for phase in phases:
+                if hasattr(phase, 'monitors') and phase._monitor_step == 0:
+                    phase._record_monitors(self.t)
+
+            if self.flag_checkpoint:
+                self._checkpoint_step = 0
+                self._checkpoint_time = time.time()
+
+            self.event_log = []
+            if self.events:
+                self._event_values = [float(event['condition'](self.t, phases)) for event in self.events]
+            locate = any(event['locate'] for event in self.events)
+
+            while self.t < t_end:
+                for phase in phases:
+                    if hasattr(phase, 'data'):
+                        phase._save_data(self.t)
+
+                if self.flag_checkpoint:
+                    if self._checkpoint_due():
+                        self._write_checkpoint(phases)
+                    self._checkpoint_step += 1
+
+                if self.flag_adaptive_dt:
+                    dt, t_new = self._adaptive_dt(phases, t_end)
+                    if dt <= 0:
+                        continue
+                else:
+                    dt, t_new = self.dt, self.t+self.dt
+
+                for phase in phases:
+                    if hasattr(phase, 'data'):
+                        phase._store_previous_data(self.t, t_new)
+
+                t, state = self.t, self._event_state(phases) if locate else None
+                self._step(phases, dt, t_new, multirate)
+                terminate = self._handle_events(phases, state, t, dt, multirate) if self.events else False
+
+                for phase in phases:
+                    if hasattr(phase, 'monitors'):
+                        phase._record_monitors(self.t)
+
+                if self.flag_profiling:
+                    self.profiler.step(self.t-t)
+
+                if terminate:
+                    break
+
+            for phase in phases:
+                phase._refresh_properties()
                 if hasattr(phase, 'data'):
                     phase._save_data(self.t)
+                    phase.data.backend.flush()
+            if self.flag_checkpoint:
+                self._write_checkpoint(phases)
+        finally:
+            # Release output files and remove the timers also if the run is interrupted, so they are not stacked by the next run
+            for phase in phases:
+                if hasattr(phase, 'data'):
+                    phase.data.backend.close()
+            if self.flag_profiling:
+                self.profile = self.profiler.stop()
+        if self.flag_profiling:
+            self.profiler.report()
+        self.t_start = self.t
+
+    def _step(self, phases:list=None, dt:float=None, t_new:float=None, multirate:bool=False):
+        """Advance all phases by one time step.
+
+        Args:
+            phases (list): List of phases
+            dt (float): Time step size
+            t_new (float): Time at the end of the time step
+            multirate (bool): Advance the phases with sub-steps
+        """
+
+        if multirate:
+            self._advance_multirate(phases, dt)
+            self.t = t_new
+        else:
+            self.t = t_new
+            for phase in phases:
                 if hasattr(phase, 'mdot_array'):
                     phase._update_massflow_rate(self.t)
                 phase._update_properties()
-                phase._solve_equations(self.dt)
+                phase._solve_equations(dt)
 
-                if self.flag_coupling:
-                    self._coupling()
-        self.t_start = self.t
+            if self.flag_coupling:
+                self._coupling(dt)
 
 class Phase:
     instances = []
@@ -101,6 +716,13 @@ class Phase:
         self.sources = []
 
         self._flag_save_data = False
+        self._flag_fused = False
+        self._flag_parallel = False
+        self._flag_energy_balance = False
+        self._energy_weight = 1.0
+        self.n_members = 1
+        self._plan = None
+        self.time_integration = 'explicit'
         self.type = type
 
     def select_substance_on_the_fly(self, cp:float=None, rho:float=None, k:float=None):
@@ -134,6 +756,23 @@ class Phase:
             raise Exception(substance+" specified as "+self.type+" substance. Valid "+self.type+" substances are:", valid_substances)
         self.fcns = getattr(globals()[self.type+'_substances'], substance)
 
+    def select_property_tables(self, T_min:float=None, T_max:float=None, n:int=None, order:str='linear', rtol:float=1e-5):
+        """Replaces the property functions of the selected substance by compiled lookup tables on a uniform mass specific enthalpy grid. Must be called after the substance is selected.
+
+        Args:
+            T_min (float): Minimum temperature of the tables in K
+            T_max (float): Maximum temperature of the tables in K
+            n (int): Number of grid points (refined until rtol is met if not specified)
+            order (str): Interpolation order ('linear' or 'cubic')
+            rtol (float): Maximum interpolation error relative to the largest absolute value of each property
+        """
+
+        if not hasattr(self, 'fcns'):
+            raise Exception("Substance must be selected before property tables.")
+        fcns = self.fcns.fcns if isinstance(self.fcns, property_tables.PropertyTable) else self.fcns
+        self.fcns = property_tables.PropertyTable(fcns, T_min=T_min, T_max=T_max, n=n, order=order, rtol=rtol)
+        self._plan = None
+
     def select_h_coeff(self, h_exp:str=None, value:float=None):
         """Selects an expression for the heat transfer coefficient.
 
@@ -181,37 +820,117 @@ class Phase:
             phi (float): Porosity value
         """
 
+        phi = self._member_values(phi)
         self.domain.V = self.domain.V*phi
         self.phi = phi
 
-    def select_schemes(self, diff:str=None, conv:str=None):
+    def select_ensemble(self, n_members:int=None):
+        """Advance several scenarios (members) of the same phase at once. Member m occupies columns m*n[1] to (m+1)*n[1] of all fields, so all members are advanced by a single call of each kernel. Must be called after create_domain and before select_porosity, initialise, select_massflow and select_bc, which then also accept a list with one value per member.
+
+        Args:
+            n_members (int): Number of ensemble members
+        """
+
+        if n_members is None or n_members < 1:
+            raise Exception("Keyword 'n_members' must be a positive integer.")
+        self.n_members = n_members
+
+    def ensemble_view(self, x:np.ndarray=None):
+        """View of a field with the ensemble members along a leading axis, e.g. T of shape (n0, n_members*n1) as (n_members, n0, n1). Works for D, F and output data as well. No data is copied.
+
+        Args:
+            x (np.ndarray): Field with the last axis of length n_members*n1
+
+        Returns:
+            View of shape (n_members, ..., n0, n1)
+        """
+
+        x = np.asarray(x)
+        x = x.reshape(x.shape[:-1]+(self.n_members, x.shape[-1]//self.n_members))
+        return np.moveaxis(x, -2, 0)
+
+    def _member_values(self, value:float=None):
+        """Expand a list with one value per ensemble member to one value per column.
+
+        Args:
+            value (float): Scalar or list with one value per member
+
+        Returns:
+            Scalar or array with one value per column
+        """
+
+        if self.n_members > 1 and np.ndim(value) == 1:
+            if len(value) != self.n_members:
+                raise ValueError("List of "+str(len(value))+" values specified for "+str(self.n_members)+" ensemble members. Specify a scalar or one value per member.")
+            return np.repeat(np.asarray(value, dtype=np.float64), self.domain.n[1])
+        return value
+
+    def select_schemes(self, diff:str=None, conv:str=None, fused:bool=False, time_integration:str=None, parallel:bool=False):
         """Imports the specified diffusion and convection schemes.
 
         Args:
             diff (str): Differenctial scheme
             conv (str): Convection scheme
+            fused (bool): Advance the phase with a single compiled kernel (requires central_difference_1d and/or upwind_1d)
+            time_integration (str): Time integration of the diffusion term ('explicit', 'backward_euler' or 'crank_nicolson')
+            parallel (bool): Use the multi-threaded variants of the schemes (number of threads is set on Setup). These only pay off with several cores and large fields
         """
 
+        if parallel:
+            self._flag_parallel = True
+        suffix = '_parallel' if self._flag_parallel else ''
+
         if diff is not None:
             try:
-                self.diff = getattr(getattr(globals()['diffusion_schemes'], diff), diff)
+                self.diff = getattr(getattr(globals()['diffusion_schemes'], diff), diff+suffix)
             except:
                 raise Exception("Diffusion scheme \'"+diff+"\' specified. Valid options for diffusion schemes are:", diffusion_schemes.__all__)
+            self.diff_scheme = diff
+        elif parallel and hasattr(self, 'diff'):
+            self.diff = getattr(getattr(globals()['diffusion_schemes'], self.diff_scheme), self.diff_scheme+suffix)
 
         if conv is not None:
             try:
-                self.conv = getattr(getattr(globals()['convection_schemes'], conv), conv)
+                self.conv = getattr(getattr(globals()['convection_schemes'], conv), conv+suffix)
             except:
                 raise Exception("Convection scheme \'"+conv+"\' specified. Valid options for convection schemes are:", convection_schemes.__all__)
+            self.conv_scheme = conv
+        elif parallel and hasattr(self, 'conv'):
+            self.conv = getattr(getattr(globals()['convection_schemes'], self.conv_scheme), self.conv_scheme+suffix)
+
+        if fused:
+            self._flag_fused = True
+            self._plan = None
+
+        if time_integration is not None:
+            valid_time_integration = ['explicit', 'backward_euler', 'crank_nicolson']
+            if time_integration not in valid_time_integration:
+                raise Exception("time_integration \'"+time_integration+"\' specified. Valid options for time_integration are:", valid_time_integration)
+            self.time_integration = time_integration
+            self._plan = None
+
+    def select_substeps(self, n:int=None):
+        """Advance the phase with sub-steps within each time step of the simulation (multi-rate time stepping). Coupling to other phases is exchanged once per time step of the simulation.
+
+        Args:
+            n (int): Number of sub-steps per time step. If not specified, the number is chosen from the stable time step size of the phase
+        """
+
+        if n is not None and n < 1:
+            raise Exception("Keyword 'n' must be a positive integer.")
+        self.n_substeps = n
 
     def initialise(self, T:float=None):
         """Initialises temperature field.
 
         Args:
-            T (float): List of length n with initial temperatures
+            T (float): Initial temperature. For ensembles, a scalar or a list with one initial temperature per member. Profiles along the nodes are not supported for ensembles, set h after initialise instead
         """
         
-        self.T = np.tile(T,self.domain.n)
+        if self.n_members > 1:
+            self.T = np.tile(self._member_values(T if np.ndim(T) == 1 else np.full(self.n_members, T)), (self.domain.n[0], 1))
+        else:
+            self.T = np.tile(T,self.domain.n)
         self.h = self.fcns.h(self.T)
         self.T = self.fcns.T(self.h)
         self.rho = self.fcns.rho(self.h)
@@ -220,15 +939,26 @@ class Phase:
         self.D = np.zeros(((2,)+(self.T.shape)))
         self.F = np.zeros(((2,)+(self.T.shape)))
         self.S = np.zeros(self.T.shape)
+        if hasattr(self.domain, 'model'):
+            self.dT_profile = np.zeros(self.T.shape[1])
 
     def select_massflow(self, mdot:list[float]=None):
         """Initialises mass flow rate field.
 
         Args:
-            mdot (float): Array of mass flow rate. Column 0 is time and column 1 is mass flow rate
+            mdot (float): Array of mass flow rate. Column 0 is time and column 1 is mass flow rate. For ensembles, a list with one mass flow rate or array per member
         """
 
+        if self.n_members > 1 and isinstance(mdot, (list, tuple)) and len(set(np.shape(m) for m in mdot)) > 1:
+            # Constant members become two-point arrays and shorter arrays are padded with their last row, so all members fit in one array
+            tables = [np.array([[0, m], [1, m]], dtype=np.float64) if np.ndim(m) == 0 else np.asarray(m, dtype=np.float64) for m in mdot]
+            if any(table.ndim != 2 or table.shape[1] != 2 for table in tables):
+                raise ValueError("Mass flow rate of each ensemble member must be a scalar or an array with columns time and mass flow rate.")
+            n = max(len(table) for table in tables)
+            mdot = [np.concatenate([table, np.repeat(table[-1:], n-len(table), axis=0)]) for table in tables]
         self.mdot_array = np.array(mdot)
+        if self.n_members > 1 and self.mdot_array.ndim in [1, 3] and len(self.mdot_array) != self.n_members:
+            raise ValueError("List of "+str(len(self.mdot_array))+" mass flow rates specified for "+str(self.n_members)+" ensemble members. Specify one mass flow rate or array for all members or one per member.")
 
     def select_bc(self, position:int=None, bc_type:str=None, value:float=None):
         """Specify boundary condition type.
@@ -248,6 +978,7 @@ class Phase:
             raise Exception("Keyword 'position' should be either 0 or -1.")
         if value is None:
             raise Exception("Keyword 'value' not specified.")
+        value = self._member_values(value)
       
         for bc_cond in self.bc:
             if bc_cond['position'] == np.s_[position,:]:
@@ -256,6 +987,7 @@ class Phase:
                 break
         else:
             self.bc.append({'type': bc_type, 'value': value, 'position': np.s_[position,:]})
+        self._plan = None
 
     def add_sourceterm_thermal_resistance(self, R:list[float], T_inf:list[float]):
         """Specify a thermal resistance source term.
@@ -271,38 +1003,201 @@ class Phase:
             raise Exception("Length of T_inf must be 1 or equal to n")
 
         self.sources.append({'R': R, 'T_inf': T_inf})
+        self._plan = None
+
+    def add_monitor(self, name:str=None, parameter:str='h', reduction:str='mass_weighted_mean', node:tuple=None, every:int=1, size:int=10000):
+        """Adds a monitor that reduces a field to a single value per ensemble member (e.g. mean bed enthalpy, stored energy or outlet temperature) every few time steps. The values are computed in compiled code and kept in a ring buffer holding the latest samples.
+
+        Args:
+            name (str): Monitor name
+            parameter (str): Field to reduce, e.g. 'h' or 'T'
+            reduction (str): Reduction of the field ('mass_weighted_mean', 'mass_weighted_sum', 'node', 'min' or 'max')
+            node (tuple): Node (j, i) of reduction 'node'
+            every (int): Number of time steps between samples
+            size (int): Number of samples kept in the ring buffer
+        """
+
+        if not name:
+            raise Exception("Keyword 'name' not specified.")
+        if not reduction in monitors.reductions:
+            raise Exception("Reduction \'"+reduction+"\' specified. Valid options for reduction are:", monitors.reductions)
+        if reduction == 'node' and node is None:
+            raise Exception("Keyword 'node' must be specified for reduction 'node'.")
+
+        if not hasattr(self, 'monitors'):
+            self.monitors = {}
+            self._monitor_step = 0
+        j, i = (0, 0) if node is None else (node[0] % self.domain.n[0], node[1] % self.domain.n[1])
+        self.monitors[name] = {'parameter': parameter, 'kind': monitors.reductions.index(reduction), 'j': j, 'i': i, 'every': every,
+                               'times': np.zeros(size), 'values': np.zeros((size, self.n_members)), 'count': 0}
+
+    def get_monitor(self, name:str=None):
+        """Returns the samples of a monitor in chronological order.
+
+        Args:
+            name (str): Monitor name
 
-    def select_output(self, times:list[float]=None, parameters:list[str]=['T']):
+        Returns:
+            Tuple of sample times of shape (n,) and values of shape (n,) or (n, n_members) for ensembles. These are views of the ring buffer until it wraps around
+        """
+
+        monitor = self.monitors[name]
+        size = len(monitor['times'])
+        if monitor['count'] <= size:
+            order = np.s_[:monitor['count']]
+        else:
+            order = np.arange(monitor['count']-size, monitor['count']) % size
+        values = monitor['values'][order]
+        return monitor['times'][order], values[:,0] if self.n_members == 1 else values
+
+    def _record_monitors(self, t:float=None):
+        """Sample monitors which are due after the current time step.
+
+        Args:
+            t (float): Current time
+        """
+
+        due = [monitor for monitor in self.monitors.values() if self._monitor_step % monitor['every'] == 0]
+        if due:
+            # Masses of the mass-weighted reductions use the density of the current enthalpy
+            V = np.require(np.broadcast_to(self.domain.V, self.h.shape), np.float64, ['C', 'W'])
+            rho = np.require(np.broadcast_to(self._current('rho'), self.h.shape), np.float64, ['C', 'W']) if any(monitor['kind'] <= 1 for monitor in due) else V
+        for monitor in due:
+            k = monitor['count'] % len(monitor['times'])
+            x = np.require(np.broadcast_to(self._current(monitor['parameter']), self.h.shape), np.float64, ['C', 'W'])
+            monitors.reduce(monitor['kind'], x, rho, V, monitor['j'], monitor['i'], self.n_members, monitor['values'][k])
+            monitor['times'][k] = t
+            monitor['count'] += 1
+        self._monitor_step += 1
+
+    def select_energy_balance(self):
+        """Keeps running integrals of the energy flows into the phase, evaluated alongside each time step from the same fields the solver uses. The stored energy is the sum of rho*V*dh over all updates, so the residual of the balance measures energy created or lost by the discretisation. Energies of a bed phase coupled to a fluid phase are multiplied by the number of particles each column represents. Calling it again resets the integrals."""
+
+        self.energy_balance = {name: np.zeros(self.n_members) for name in ['stored', 'convection', 'boundary', 'source', 'coupling']}
+        self._flag_energy_balance = True
+
+    def get_energy_balance(self):
+        """Returns the energy balance of the phase since select_energy_balance was called.
+
+        Returns:
+            Dictionary of energies in J with keys 'stored' (change of energy content), 'convection' (enthalpy advected in through the ends of the domain), 'boundary' (energy supplied by fixed_value boundary conditions), 'source' (thermal resistance source terms), 'coupling' (heat from coupled phases) and 'residual' (stored energy minus all flows). Values are floats or arrays of shape (n_members,) for ensembles
+        """
+
+        if not self._flag_energy_balance:
+            raise Exception("Energy balance not selected. Use select_energy_balance before running the simulation.")
+        balance = dict(self.energy_balance)
+        balance['residual'] = balance['stored']-balance['convection']-balance['boundary']-balance['source']-balance['coupling']
+        return {name: value[0] if self.n_members == 1 else value.copy() for name, value in balance.items()}
+
+    def _add_energy(self, **flows):
+        """Add energies per column to the running integrals of the energy balance.
+
+        Args:
+            **flows (float): Energy per column in J of shape (n1,) for each term of the balance
+        """
+
+        if not self._flag_energy_balance:
+            return
+        for name, value in flows.items():
+            value = np.broadcast_to(value*self._energy_weight, (self.T.shape[1],))
+            self.energy_balance[name] += np.sum(value.reshape(self.n_members, -1), axis=1)
+
+    def _update_energy_balance(self, h:np.ndarray=None, dt:float=None):
+        """Add the energy flows of the last time step to the energy balance. Flows are evaluated with the temperatures, properties and coefficients used in the time step, with implicit terms theta-weighted between the old and new temperatures.
+
+        Args:
+            h (np.ndarray): Mass specific enthalpy before the time step
+            dt (float): Time step size
+        """
+
+        if self._plan is None:
+            self._prepare_plan()
+        plan = self._plan
+
+        shape = self.h.shape
+        full = lambda x: x if np.shape(x) == shape else np.broadcast_to(x, shape)
+        theta = 0.0 if self._flag_fused else {'explicit': 0.0, 'backward_euler': 1.0, 'crank_nicolson': 0.5}[self.time_integration]
+        energy_flows.energy_flows_1d(h, self.h, full(self.T), full(self.rho), full(self.cp), plan['V'], self.D, self.F, hasattr(self, 'diff'), hasattr(self, 'conv'),
+                                     plan['bc_type'], plan['h_bc'], plan['T_bc'], plan['G'], plan['GT'], theta, dt, self._flows)
+        self._add_energy(stored=self._flows[0], convection=self._flows[1], boundary=self._flows[2], source=self._flows[3])
+
+    def select_output(self, times:list[float]=None, parameters:list[str]=['T'], backend:str='memory', path:str=None):
         """Specify output times.
 
         Args:
             times (float): List of times to output data
+            parameters (str): List of parameters to output
+            backend (str): Storage of output data
+            path (str): Output file or directory of backends storing output on disk
         """
 
+        if not backend in globals()['output_backends'].__all__:
+            raise Exception("backend \'"+backend+"\' specified. Valid options for backend are:", globals()['output_backends'].__all__)
+
         class Data(object):
             pass
 
         self.data = Data()
         self.data.times = times
         self.data.parameters = {}
+        self.data.backend = getattr(globals()['output_backends'], backend).Backend(path)
 
         for i in range(len(parameters)):
-            self.data.parameters.update({parameters[i]:np.zeros((len(times),)+self.T.shape)})
+            self.data.parameters.update({parameters[i]:self.data.backend.create(parameters[i], (len(times),)+self.T.shape)})
 
         self._q = 0
+        self._previous_data = None
+
+    def _store_previous_data(self, t:float=None, t_new:float=None):
+        """Keep a copy of the output parameters if an output time is passed in the coming time step.
+
+        Args:
+            t (float): Current time
+            t_new (float): Time after the coming time step
+        """
+
+        self._previous_data = None
+        if self._q < len(self.data.times) and self.data.times[self._q] < t_new:
+            self._previous_data = (t, {parameter: np.array(self._current(parameter), dtype=np.float64) for parameter in self.data.parameters})
 
     def _save_data(self, t:float=None):
-        """Save data at specified times.
+        """Save data at all specified times up to the current time. Output times passed during the last time step are interpolated linearly between the previous and current state.
             
         Args:
             t (float): Current time
         """
 
-        if hasattr(self, 'data'):
-            if t>=self.data.times[self._q]:
-                for parameter in self.data.parameters:
-                    self.data.parameters[parameter][self._q] = getattr(self,parameter)
-                self._q = self._q+1
+        while hasattr(self, 'data') and self._q < len(self.data.times) and t >= self.data.times[self._q]:
+            t_q = self.data.times[self._q]
+            for parameter in self.data.parameters:
+                value = self._current(parameter)
+                if self._previous_data is not None and self._previous_data[0] < t_q < t:
+                    t_prev, previous = self._previous_data
+                    value = previous[parameter] + (t_q-t_prev)/(t-t_prev)*(value-previous[parameter])
+                self.data.parameters[parameter][self._q] = value
+            self._q = self._q+1
+
+    def _massflow_rate(self, t:float):
+        """Mass flow rate at a given time.
+
+        Args:
+            t (float): Time
+
+        Returns:
+            Mass flow rate in kg/s
+        """
+
+        if self.mdot_array.ndim == 0:
+            return self.mdot_array
+
+        if self.mdot_array.ndim == 2:
+            return np.interp(t, self.mdot_array[:,0], self.mdot_array[:,1])
+
+        if self.mdot_array.ndim == 1:
+            return self._member_values(self.mdot_array)
+
+        if self.mdot_array.ndim == 3:
+            return self._member_values([np.interp(t, mdot[:,0], mdot[:,1]) for mdot in self.mdot_array])
 
     def _update_massflow_rate(self, t:float):
         """Update mass flow rate at specified times.
@@ -311,23 +1206,117 @@ class Phase:
             t (float): Current time
         """
 
-        if self.mdot_array.ndim == 0:
-            self.mdot = self.mdot_array
+        self.mdot = self._massflow_rate(t)
 
-        if self.mdot_array.ndim == 2:
-            self.mdot = np.interp(t, self.mdot_array[:,0], self.mdot_array[:,1])
+    def _substeps(self, t:float=None, dt:float=None, safety:float=0.9):
+        """Number of sub-steps to take within a time step.
+
+        Args:
+            t (float): Start time of the time step
+            dt (float): Time step size
+            safety (float): Fraction of the stable time step size to use
+
+        Returns:
+            Number of sub-steps
+        """
+
+        if not hasattr(self, 'n_substeps'):
+            return 1
+        if self.n_substeps is not None:
+            return self.n_substeps
+        return max(1, int(np.ceil(dt/(safety*self._stable_dt(t, dt)))))
+
+    def _apply_coupling(self, dt:float=None):
+        """Apply the heat transfer rate from coupling to other phases.
+
+        Args:
+            dt (float): Time step size
+        """
+
+        if hasattr(self, '_q_coupling'):
+            dh = self._q_coupling*dt/(self.rho*self.domain.V)
+            self.h = self.h + dh
+            self._add_energy(stored=np.sum(self.rho*self.domain.V*dh, axis=0), coupling=np.sum(self._q_coupling, axis=0)*dt)
+
+    def _stable_dt(self, t:float=None, dt:float=None):
+        """Largest stable time step size of the explicit terms based on the current properties.
+
+        Args:
+            t (float): Start time of the time step
+            dt (float): Tentative time step size used to bound the mass flow rate over the time step
+
+        Returns:
+            Stable time step size in s
+        """
+
+        S = np.zeros(self.T.shape)
+
+        if hasattr(self, 'diff') and self.time_integration == 'explicit':
+            D0 = self.k*self.domain.A[0]/self.domain.dx_face[0]
+            D1 = self.k*self.domain.A[1]/self.domain.dx_face[1]
+            S = S + D0 + D1
+            S[0] = 2*D1[0]
+            S[-1] = 2*D0[-1]
+
+        if self.time_integration == 'explicit':
+            for source in self.sources:
+                S = S + 2/np.asarray(source['R'], dtype=np.float64)
+
+        if hasattr(self, 'conv'):
+            mdot = np.maximum(np.abs(self._massflow_rate(t)), np.abs(self._massflow_rate(t+dt)))
+            S = S + mdot*self.cp/getattr(getattr(convection_schemes, self.conv_scheme), 'courant_max', 1)
+
+        with np.errstate(divide='ignore'):
+            return np.min(self.rho*self.domain.V*self.cp/S)
             
+    def _compiled_properties(self):
+        """Check if the property functions of the substance are compiled with numba and can be evaluated inside kernels."""
+
+        return all(isinstance(getattr(self.fcns, fcn, None), nb.core.dispatcher.Dispatcher) for fcn in ['T', 'rho', 'cp', 'k'])
+
+    def _current(self, parameter:str=None):
+        """Value of a field consistent with the current enthalpy. The properties T, rho, cp and k are only updated at the start of each time step, so they are evaluated from h.
+
+        Args:
+            parameter (str): Field name
+
+        Returns:
+            Field value
+        """
+
+        if parameter in ['T', 'rho', 'cp', 'k']:
+            return getattr(self.fcns, parameter)(self.h)
+        return getattr(self, parameter)
+
+    def _refresh_properties(self):
+        """Evaluate the properties from the current enthalpy, e.g. at the end of a simulation."""
+
+        self.T = self.fcns.T(self.h)
+        self.rho = self.fcns.rho(self.h)
+        self.cp = self.fcns.cp(self.h)
+        self.k = self.fcns.k(self.h)
+
     def _update_properties(self):
         """Update properties at each time step."""
             
+        if self._flag_fused and self._compiled_properties():
+            return
+
         self.T = self.fcns.T(self.h)
         self.rho = self.fcns.rho(self.h)
         self.cp = self.fcns.cp(self.h)
 
+        if self._flag_fused:
+            if self._compiled_properties():
+                return
+            if hasattr(self, 'diff'):
+                self.k = self.fcns.k(self.h)
+            return
+
         if hasattr(self, 'diff'):
             self.k = self.fcns.k(self.h)
-            self.D[0] = self.k*self.domain.A[0]/self.domain.dx
-            self.D[1] = self.k*self.domain.A[1]/self.domain.dx
+            self.D[0] = self.k*self.domain.A[0]/self.domain.dx_face[0]
+            self.D[1] = self.k*self.domain.A[1]/self.domain.dx_face[1]
             
         if hasattr(self, 'conv'):
             self.F[0] = self.mdot*self.cp
@@ -368,19 +1357,117 @@ class Phase:
             dt (float): Time step size
         """
 
-        self._update_boundary_nodes(dt)
+        if self._flag_energy_balance:
+            # Enthalpy before the time step is kept in a buffer reused in every time step
+            if getattr(self, '_h_old', None) is None or self._h_old.shape != np.shape(self.h):
+                self._h_old = np.zeros(np.shape(self.h))
+                self._flows = np.zeros((4, np.shape(self.h)[1]))
+            np.copyto(self._h_old, self.h)
+
+        if self._flag_fused:
+            self._solve_equations_fused(dt)
+        elif self.time_integration != 'explicit':
+            self._solve_equations_implicit(dt)
+        else:
+            self._update_boundary_nodes(dt)
 
-        # print("Before solving eq")
-        # print("h: ", self.h)
-        # print("T: ", self.T)
+            # print("Before solving eq")
+            # print("h: ", self.h)
+            # print("T: ", self.T)
+
+            if hasattr(self, 'diff'):
+                self.h = self.h + self.diff(self.T, self.D)/(self.rho*self.domain.V)*dt
+            if hasattr(self, 'conv'):
+                self.h = self.h + self.conv(self.T, self.F)/(self.rho*self.domain.V)*dt
+            if self.sources is not None:
+                self._update_source(dt)
+
+            # print("After solving eq")
+            # print("h: ", self.h)
+            # print("T: ", self.T)
+
+        if self._flag_energy_balance:
+            self._update_energy_balance(self._h_old, dt)
+
+    def _prepare_plan(self):
+        """Collect geometry, boundary conditions and source terms as contiguous arrays for the compiled kernels."""
+
+        shape = self.T.shape
+        full = lambda x: np.require(np.broadcast_to(x, shape), np.float64, ['C', 'W'])
+
+        bc_type = np.zeros(2, dtype=np.int64)
+        h_bc = np.zeros((2, shape[1]))
+        for bc in self.bc:
+            side = 0 if bc['position'] == np.s_[0,:] else 1
+            if bc['type'] == 'fixed_value':
+                bc_type[side] = 1
+                h_bc[side] = self.fcns.h(np.asarray(bc['value'], dtype=np.float64))
+            if bc['type'] == 'fixed_gradient':
+                bc_type[side] = 2
+
+        G = np.zeros(shape)
+        GT = np.zeros(shape)
+        for source in self.sources:
+            G = G + 2/np.asarray(source['R'], dtype=np.float64)
+            GT = GT + 2*np.asarray(source['T_inf'], dtype=np.float64)/np.asarray(source['R'], dtype=np.float64)
+
+        self._plan = {'A0': full(self.domain.A[0]), 'A1': full(self.domain.A[1]), 'dx0': full(self.domain.dx_face[0]), 'dx1': full(self.domain.dx_face[1]), 'V': full(self.domain.V),
+                      'bc_type': bc_type, 'h_bc': h_bc, 'T_bc': np.asarray(self.fcns.T(h_bc), dtype=np.float64), 'G': full(G), 'GT': full(GT)}
+
+    def _solve_equations_fused(self, dt:float=None):
+        """Solve equations at each time step with the fused kernel.
+
+        Args:
+            dt (float): Time step size
+        """
+
+        if self._plan is None:
+            if hasattr(self, 'diff') and self.diff_scheme != 'central_difference_1d':
+                raise Exception("Fused solver only supports diffusion scheme 'central_difference_1d'.")
+            if hasattr(self, 'conv') and self.conv_scheme != 'upwind_1d':
+                raise Exception("Fused solver only supports convection scheme 'upwind_1d'.")
+            if self.time_integration != 'explicit':
+                raise Exception("Fused solver only supports explicit time integration.")
+            self._prepare_plan()
+        plan = self._plan
 
-        if hasattr(self, 'diff'):
-            self.h = self.h + self.diff(self.T, self.D)/(self.rho*self.domain.V)*dt
         if hasattr(self, 'conv'):
-            self.h = self.h + self.conv(self.T, self.F)/(self.rho*self.domain.V)*dt
-        if self.sources is not None:
-            self._update_source(dt)
+            mdot = np.require(np.broadcast_to(np.asarray(self.mdot, dtype=np.float64), (self.T.shape[1],)), np.float64, ['C', 'W'])
+        else:
+            mdot = np.zeros(self.T.shape[1])
+        self.h = np.ascontiguousarray(self.h, dtype=np.float64)
+        if self._compiled_properties():
+            self.T, self.rho, self.cp, self.k = [np.require(x if np.shape(x) == self.h.shape else np.broadcast_to(x, self.h.shape), np.float64, ['C', 'W']) for x in (self.T, self.rho, self.cp, self.k)]
+            kernel = fused_step.fused_step_properties_1d_parallel if self._flag_parallel else fused_step.fused_step_properties_1d
+            kernel(self.h, self.T, self.rho, self.cp, self.k, self.fcns.T, self.fcns.rho, self.fcns.cp, self.fcns.k, plan['A0'], plan['A1'], plan['dx0'], plan['dx1'], plan['V'], mdot, self.D, self.F,
+                   hasattr(self, 'diff'), hasattr(self, 'conv'), plan['bc_type'], plan['h_bc'], plan['G'], plan['GT'], dt)
+            return
+
+        k = self.k if hasattr(self, 'diff') else self.T
+        kernel = fused_step.fused_step_1d_parallel if self._flag_parallel else fused_step.fused_step_1d
+        kernel(self.h, self.T, self.rho, self.cp, k, plan['A0'], plan['A1'], plan['dx0'], plan['dx1'], plan['V'], mdot, self.D, self.F,
+               hasattr(self, 'diff'), hasattr(self, 'conv'), plan['bc_type'], plan['h_bc'], plan['G'], plan['GT'], dt)
+
+    def _solve_equations_implicit(self, dt:float=None):
+        """Solve equations at each time step with implicit diffusion and explicit convection.
+
+        Args:
+            dt (float): Time step size
+        """
+
+        if self._plan is None:
+            if not hasattr(self, 'diff') or self.diff_scheme != 'central_difference_1d':
+                raise Exception("Implicit time integration requires diffusion scheme 'central_difference_1d'.")
+            self._prepare_plan()
+        plan = self._plan
+
+        if hasattr(self, 'conv'):
+            C = self.conv(self.T, self.F)
+        else:
+            C = np.zeros(self.T.shape)
+        theta = {'backward_euler': 1.0, 'crank_nicolson': 0.5}[self.time_integration]
 
-        # print("After solving eq")
-        # print("h: ", self.h)
-        # print("T: ", self.T)
\ No newline at end of file
+        self.h = np.ascontiguousarray(self.h, dtype=np.float64)
+        kernel = implicit_diffusion.implicit_diffusion_1d_parallel if self._flag_parallel else implicit_diffusion.implicit_diffusion_1d
+        kernel(self.h, self.T, self.rho, self.cp, self.D, self.F, C, plan['V'], hasattr(self, 'conv'),
+               plan['bc_type'], plan['h_bc'], plan['T_bc'], plan['G'], plan['GT'], theta, dt)
@@ -0,0 +1,82 @@
+import numpy as np
+
+class Backend:
+    """Output stored in a HDF5 file with one chunked and compressed dataset per parameter. Each snapshot is a chunk, so snapshots are written as they are saved. Requires h5py."""
+
+    def __init__(self, path:str=None, compression:str='gzip'):
+        """Initialise backend.
+
+        Args:
+            path (str): Output file
+            compression (str): Compression filter of the datasets
+        """
+        import h5py
+
+        if path is None:
+            raise Exception("Keyword 'path' not specified.")
+        self.h5py = h5py
+        self.path = path
+        self.file = h5py.File(path, 'w')
+        self.compression = compression
+
+    def create(self, name:str=None, shape:tuple=None):
+        """Create output dataset for a parameter.
+
+        Args:
+            name (str): Parameter name
+            shape (tuple): Shape of output dataset (n_times, n0, n1)
+
+        Returns:
+            Output dataset
+        """
+        self.file.create_dataset(name, shape=shape, dtype='f8', chunks=(1,)+tuple(shape[1:]), compression=self.compression)
+        return Dataset(self, name, shape)
+
+    def flush(self):
+        """Write pending output to storage."""
+        if self.file is not None:
+            self.file.flush()
+
+    def close(self):
+        """Close the output file. Datasets reopen it when they are read or written again."""
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+class Dataset:
+    """Dataset of the output file that can be indexed like an array while the file is closed."""
+
+    def __init__(self, backend:Backend=None, name:str=None, shape:tuple=None):
+        """Initialise dataset.
+
+        Args:
+            backend (Backend): Backend of the output file
+            name (str): Parameter name
+            shape (tuple): Shape of output dataset (n_times, n0, n1)
+        """
+        self.backend = backend
+        self.name = name
+        self.shape = tuple(shape)
+        self.ndim = len(self.shape)
+        self.dtype = np.dtype('f8')
+
+    def __len__(self):
+        """Number of output times."""
+        return self.shape[0]
+
+    def __getitem__(self, key):
+        """Read snapshots, opening the file read-only if it is closed."""
+        if self.backend.file is not None:
+            return self.backend.file[self.name][key]
+        with self.backend.h5py.File(self.backend.path, 'r') as f:
+            return f[self.name][key]
+
+    def __setitem__(self, key, value):
+        """Write snapshots, reopening the file if it is closed."""
+        if self.backend.file is None:
+            self.backend.file = self.backend.h5py.File(self.backend.path, 'r+')
+        self.backend.file[self.name][key] = value
+
+    def __array__(self, dtype=None, copy=None):
+        """Read all snapshots."""
+        return np.asarray(self[()], dtype=dtype)
@@ -0,0 +1,39 @@
+import numpy as np
+import os
+
+class Backend:
+    """Output stored in memory-mapped .npy files with one file per parameter. Only snapshots being written are kept in memory."""
+
+    def __init__(self, path:str=None):
+        """Initialise backend.
+
+        Args:
+            path (str): Directory of output files
+        """
+        if path is None:
+            raise Exception("Keyword 'path' not specified.")
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.arrays = []
+
+    def create(self, name:str=None, shape:tuple=None):
+        """Create output array for a parameter.
+
+        Args:
+            name (str): Parameter name
+            shape (tuple): Shape of output array (n_times, n0, n1)
+
+        Returns:
+            Output array
+        """
+        self.arrays.append(np.lib.format.open_memmap(os.path.join(self.path, name+'.npy'), mode='w+', dtype=np.float64, shape=shape))
+        return self.arrays[-1]
+
+    def flush(self):
+        """Write pending output to storage."""
+        for array in self.arrays:
+            array.flush()
+
+    def close(self):
+        """Write pending output to storage. The memory maps stay readable."""
+        self.flush()
@@ -0,0 +1,29 @@
+import numpy as np
+
+class Backend:
+    """Output stored in memory (default)."""
+
+    def __init__(self, path:str=None):
+        """Initialise backend.
+
+        Args:
+            path (str): Not used
+        """
+
+    def create(self, name:str=None, shape:tuple=None):
+        """Create output array for a parameter.
+
+        Args:
+            name (str): Parameter name
+            shape (tuple): Shape of output array (n_times, n0, n1)
+
+        Returns:
+            Output array
+        """
+        return np.zeros(shape)
+
+    def flush(self):
+        """Write pending output to storage."""
+
+    def close(self):
+        """Nothing to release."""
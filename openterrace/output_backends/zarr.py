@@ -0,0 +1,35 @@
+import os
+
+class Backend:
+    """Output stored in a Zarr store with one chunked and compressed array per parameter. Each snapshot is a chunk, so snapshots are written as they are saved. Requires zarr."""
+
+    def __init__(self, path:str=None):
+        """Initialise backend.
+
+        Args:
+            path (str): Directory of the store
+        """
+        import zarr
+
+        if path is None:
+            raise Exception("Keyword 'path' not specified.")
+        self.zarr = zarr
+        self.path = path
+
+    def create(self, name:str=None, shape:tuple=None):
+        """Create output array for a parameter.
+
+        Args:
+            name (str): Parameter name
+            shape (tuple): Shape of output array (n_times, n0, n1)
+
+        Returns:
+            Output array
+        """
+        return self.zarr.open_array(store=os.path.join(self.path, name), mode='w', shape=shape, chunks=(1,)+tuple(shape[1:]), dtype='f8')
+
+    def flush(self):
+        """Write pending output to storage."""
+
+    def close(self):
+        """Nothing to release, as arrays are written to the store as they are saved."""
@@ -0,0 +1,72 @@
+"""
+Reduced-order models of the temperature profile inside spherical bed particles.
+
+Instead of resolving the radius with sphere_1d, a bed phase with the reduced_sphere domain stores one mass specific enthalpy per particle, the volume average. The models give the surface temperature seen by the fluid from the mean temperature, the fluid temperature and the Biot number Bi = h R/k, so the coupling kernels exchange heat with the surface as for resolved particles and the energy of the particles is conserved exactly.
+
+lumped: Parabolic profile T = a0 + a2 (r/R)^2. The surface temperature follows from the Robin condition at the surface, which gives lumped capacitance with the heat transfer coefficient h/(1+Bi/5) of Jeffreson.
+polynomial: Profile T = a0 + a2 (r/R)^2 + a4 (r/R)^4 with the volume average and the second radial moment 5/R^5 int T r^4 dr as unknowns (Galerkin moments of the heat equation). The difference of the moment and the mean is stored in Phase.dT_profile and relaxes towards its equilibrium with the fluid temperature.
+
+Largest error of the mean temperature response to a step in fluid temperature, relative to the step, compared with the exact series solution:
+
+    Bi      lumped  polynomial
+    0.1     0.0001  0.0000
+    1       0.0074  0.0005
+    5       0.0476  0.0059
+    20      0.102   0.018
+    1000    0.168   0.019
+
+Without the correction (plain lumped capacitance) the error is 0.064 at Bi = 1.
+"""
+
+import numpy as np
+import numba as nb
+
+models = ['lumped', 'polynomial']
+
+@nb.njit(cache=True)
+def _polynomial_coefficients(Bi, dT, dT_p):
+    """Coefficients a2 and a4 of the polynomial profile.
+
+    Args:
+        Bi (float): Biot number
+        dT (float): Fluid temperature minus mean particle temperature
+        dT_p (float): Second radial moment minus mean particle temperature
+
+    Returns:
+        Coefficients a2 and a4 in K
+    """
+    det = 4/35*(4+4*Bi/7) - 8/63*(2+2*Bi/5)
+    a2 = ((4+4*Bi/7)*dT_p - 8/63*Bi*dT)/det
+    a4 = (4/35*Bi*dT - (2+2*Bi/5)*dT_p)/det
+    return a2, a4
+
+@nb.njit(cache=True)
+def surface_temperature_1d(model, T_f, T_b, rho_b, cp_b, k_b, dT_p, hR, R, dt, T_s):
+    """Surface temperature of the particles of each bed column at the start of a time step. The second radial moment of the polynomial profile is then advanced over the time step: it relaxes exponentially towards its equilibrium with the fluid and mean temperature held constant, so the update is stable for any time step size. T_s is overwritten and dT_p is updated in place.
+
+    Args:
+        model (int): Index of the model in models
+        T_f (float): Temperature of the fluid phase of shape (n_f, n_members)
+        T_b (float): Mean temperature of the particles of shape (1, n_members*n_f)
+        rho_b (float): Density of the particles of shape (1, n_members*n_f)
+        cp_b (float): Specific heat capacity of the particles of shape (1, n_members*n_f)
+        k_b (float): Thermal conductivity of the particles of shape (1, n_members*n_f)
+        dT_p (float): Second radial moment minus mean temperature of shape (n_members*n_f,)
+        hR (float): Heat transfer coefficient times particle radius in W/m
+        R (float): Particle radius in m
+        dt (float): Time step size in s
+        T_s (float): Surface temperature of shape (1, n_members*n_f)
+    """
+    n_f = T_f.shape[0]
+    for c in range(T_b.shape[1]):
+        Bi = hR/k_b[-1,c]
+        dT = T_f[c % n_f, c // n_f]-T_b[-1,c]
+        if model == 0:
+            T_s[0,c] = T_b[-1,c] + Bi/(5+Bi)*dT
+        else:
+            a2, a4 = _polynomial_coefficients(Bi, dT, dT_p[c])
+            T_s[0,c] = T_b[-1,c] + 0.4*a2 + 4/7*a4
+            det = 4/35*(4+4*Bi/7) - 8/63*(2+2*Bi/5)
+            rate = 16/7*(2+2*Bi/5)/det*k_b[-1,c]/(rho_b[-1,c]*cp_b[-1,c]*R**2)
+            dT_eq = 4/35*Bi*dT/(2+2*Bi/5)
+            dT_p[c] = dT_eq + (dT_p[c]-dT_eq)*np.exp(-rate*dt)
@@ -0,0 +1,127 @@
+"""
+Rendering of output data to videos or PNG sequences.
+
+Snapshots are read one at a time, rendered to PNG with the agg backend in a process pool and written in order to a PNG sequence or piped to ffmpeg, so only the frames being rendered are held in memory.
+"""
+
+import numpy as np
+import io
+import contextlib
+import os
+import shutil
+import subprocess
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+video_formats = ['.gif', '.mkv', '.mov', '.mp4', '.webm']
+
+def render_animation(source=None, path:str=None, parameter:str='T', times:list[float]=None, fps:float=10, vmin:float=None, vmax:float=None, dpi:int=100, max_workers:int=None, start_method:str='spawn'):
+    """Render the snapshots of an output parameter to a video or a PNG sequence. Fields with one column are drawn as line plots and all other fields as images.
+
+    Args:
+        source (Phase): Phase with output data, array of snapshots of shape (n_times, n0, n1) or path of a .npy file written by the memmap output backend
+        path (str): Video file with an extension in video_formats (requires ffmpeg) or directory of a PNG sequence
+        parameter (str): Output parameter rendered if source is a phase
+        times (float): Times of the snapshots used in the frame titles (taken from the phase if source is a phase)
+        fps (float): Frames per second of videos
+        vmin (float): Lower limit of the colour or value axis (defaults to the minimum of all snapshots)
+        vmax (float): Upper limit of the colour or value axis (defaults to the maximum of all snapshots)
+        dpi (int): Resolution of the frames
+        max_workers (int): Number of worker processes
+        start_method (str): Start method of the worker processes
+
+    Returns:
+        Number of rendered frames
+    """
+
+    if path is None:
+        raise Exception("Keyword 'path' not specified.")
+
+    x, n_frames, file, positions = source, None, None, None
+    if hasattr(getattr(source, 'data', None), 'parameters'):
+        x = source.data.parameters[parameter]
+        n_frames = source._q
+        times = source.data.times if times is None else times
+        positions = np.ravel(source.domain.node_pos) if hasattr(source.domain, 'node_pos') else None
+    elif isinstance(source, str):
+        file = source
+        x = np.load(source, mmap_mode='r')
+    if n_frames is None:
+        n_frames = len(x)
+
+    if vmin is None or vmax is None:
+        limits = [(np.min(x[q]), np.max(x[q])) for q in range(n_frames)]
+        vmin = min(limit[0] for limit in limits) if vmin is None else vmin
+        vmax = max(limit[1] for limit in limits) if vmax is None else vmax
+
+    video = os.path.splitext(path)[1].lower() in video_formats
+    if video:
+        if shutil.which('ffmpeg') is None:
+            raise Exception("ffmpeg is required to render videos. Specify a directory to render a PNG sequence.")
+        encoder = subprocess.Popen(['ffmpeg', '-y', '-loglevel', 'error', '-f', 'image2pipe', '-framerate', str(fps), '-c:v', 'png', '-i', '-',
+                                    '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2', '-pix_fmt', 'yuv420p', path], stdin=subprocess.PIPE)
+    else:
+        os.makedirs(path, exist_ok=True)
+
+    def frame(q):
+        snapshot = (file, q) if file is not None else np.asarray(x[q])
+        title = parameter+' at t = '+str(times[q])+' s' if times is not None else parameter+' snapshot '+str(q)
+        png = None if video else os.path.join(path, 'frame_'+str(q).zfill(5)+'.png')
+        return executor.submit(_render_frame, snapshot, title, parameter, positions, vmin, vmax, dpi, png)
+
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context(start_method)) as executor:
+            window = 2*(max_workers or os.cpu_count() or 1)
+            pending = [frame(q) for q in range(min(window, n_frames))]
+            for q in range(n_frames):
+                data = pending.pop(0).result()
+                if q+len(pending)+1 < n_frames:
+                    pending.append(frame(q+len(pending)+1))
+                if video:
+                    encoder.stdin.write(data)
+    except BaseException:
+        # Stop the encoder, so it does not keep running and holding the output file
+        if video:
+            encoder.kill()
+            encoder.wait()
+            with contextlib.suppress(OSError):
+                encoder.stdin.close()
+        raise
+
+    if video:
+        encoder.stdin.close()
+        if encoder.wait() != 0:
+            raise Exception("ffmpeg failed to encode \'"+path+"\'.")
+    return n_frames
+
+def _render_frame(snapshot=None, title:str=None, label:str=None, positions=None, vmin:float=None, vmax:float=None, dpi:int=None, png:str=None):
+    """Render a single snapshot and return it as PNG data or write it to the file png."""
+
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    if isinstance(snapshot, tuple):
+        snapshot = np.load(snapshot[0], mmap_mode='r')[snapshot[1]]
+
+    fig = Figure(figsize=(6, 4), dpi=dpi)
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    if snapshot.shape[1] == 1:
+        ax.plot(positions if positions is not None and len(positions) == snapshot.shape[0] else np.arange(snapshot.shape[0]), snapshot[:,0])
+        ax.set_ylim(vmin, vmax)
+        ax.set_ylabel(label)
+        ax.grid()
+    else:
+        im = ax.imshow(snapshot, aspect='auto', origin='lower', vmin=vmin, vmax=vmax, interpolation='nearest')
+        fig.colorbar(im, ax=ax, label=label)
+        ax.set_xlabel('Column')
+        ax.set_ylabel('Node')
+    ax.set_title(title)
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png')
+    if png is not None:
+        with open(png, 'wb') as f:
+            f.write(buffer.getvalue())
+        return None
+    return buffer.getvalue()
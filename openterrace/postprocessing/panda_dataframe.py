@@ -1 +1,122 @@
-class 
\ No newline at end of file
+"""
+Export of output data and monitors to pandas and Apache Arrow.
+
+The exported frames and tables view the NumPy output buffers (in memory or memory-mapped) wherever possible instead of copying them. Output stored in HDF5 or Zarr is read one snapshot at a time by arrow_batches. pandas and pyarrow are only imported when used and are installed with the dataframe extra (pip install openterrace[dataframe]).
+"""
+
+import numpy as np
+
+def _saved(phase=None, parameters:list[str]=None):
+    """Number of saved output times and list of parameters to export."""
+
+    if not hasattr(phase, 'data'):
+        raise Exception("Phase has no output data. Use select_output before running the simulation.")
+    if parameters is None:
+        parameters = list(phase.data.parameters.keys())
+    for parameter in parameters:
+        if not parameter in phase.data.parameters:
+            raise Exception("Parameter \'"+parameter+"\' specified. Valid options for parameter are:", list(phase.data.parameters.keys()))
+    return phase._q, parameters
+
+def _flat(x=None, n:int=None):
+    """View of the first n snapshots of an output array as a 1d array. Arrays that are not NumPy arrays are read."""
+
+    x = x[:n] if isinstance(x, np.ndarray) else np.asarray(x[:n])
+    return x.reshape(-1)
+
+def to_long(phase=None, parameters:list[str]=None):
+    """Output data in long format with one row per output time, node and column and one column per parameter.
+
+    Args:
+        phase (Phase): Phase with output data
+        parameters (list): Parameters to export (defaults to all output parameters)
+
+    Returns:
+        pandas.DataFrame with index (time, node, column)
+    """
+    import pandas as pd
+
+    n, parameters = _saved(phase, parameters)
+    shape = phase.data.parameters[parameters[0]].shape
+    index = pd.MultiIndex.from_product([np.asarray(phase.data.times)[:n], np.arange(shape[1]), np.arange(shape[2])], names=['time', 'node', 'column'])
+    return pd.DataFrame({parameter: _flat(phase.data.parameters[parameter], n) for parameter in parameters}, index=index, copy=False)
+
+def to_wide(phase=None, parameter:str='T'):
+    """Output data of a parameter in wide format with one row per output time and one column per node.
+
+    Args:
+        phase (Phase): Phase with output data
+        parameter (str): Parameter to export
+
+    Returns:
+        pandas.DataFrame with index time and columns (node, column)
+    """
+    import pandas as pd
+
+    n, _ = _saved(phase, [parameter])
+    x = phase.data.parameters[parameter]
+    values = _flat(x, n).reshape(n, -1)
+    columns = pd.MultiIndex.from_product([np.arange(x.shape[1]), np.arange(x.shape[2])], names=['node', 'column'])
+    return pd.DataFrame(values, index=pd.Index(np.asarray(phase.data.times)[:n], name='time'), columns=columns, copy=False)
+
+def monitors_to_frame(phase=None, names:list[str]=None):
+    """Monitors of a phase with one row per sample.
+
+    Args:
+        phase (Phase): Phase with monitors
+        names (list): Monitors to export (defaults to all monitors)
+
+    Returns:
+        Dictionary of pandas.DataFrame with index time and one column per ensemble member for each monitor
+    """
+    import pandas as pd
+
+    if not hasattr(phase, 'monitors'):
+        raise Exception("Phase has no monitors. Use add_monitor before running the simulation.")
+    if names is None:
+        names = list(phase.monitors.keys())
+
+    frames = {}
+    for name in names:
+        t, values = phase.get_monitor(name)
+        frames[name] = pd.DataFrame(values.reshape(len(t), -1), index=pd.Index(t, name='time'), copy=False)
+    return frames
+
+def arrow_batches(phase=None, parameters:list[str]=None):
+    """Output data in long format as Arrow record batches with one batch per output time. Each batch views one snapshot of the output buffers, and output stored on disk is read one snapshot at a time.
+
+    Args:
+        phase (Phase): Phase with output data
+        parameters (list): Parameters to export (defaults to all output parameters)
+
+    Yields:
+        pyarrow.RecordBatch with columns time, node, column and one column per parameter
+    """
+    import pyarrow as pa
+
+    n, parameters = _saved(phase, parameters)
+    shape = phase.data.parameters[parameters[0]].shape
+    size = shape[1]*shape[2]
+    node = pa.array(np.repeat(np.arange(shape[1], dtype=np.int32), shape[2]))
+    column = pa.array(np.tile(np.arange(shape[2], dtype=np.int32), shape[1]))
+
+    for q in range(n):
+        arrays = [pa.array(np.full(size, phase.data.times[q], dtype=np.float64)), node, column]
+        for parameter in parameters:
+            x = np.ascontiguousarray(phase.data.parameters[parameter][q], dtype=np.float64).reshape(-1)
+            arrays.append(pa.Array.from_buffers(pa.float64(), size, [None, pa.py_buffer(x)]))
+        yield pa.RecordBatch.from_arrays(arrays, names=['time', 'node', 'column']+parameters)
+
+def to_arrow(phase=None, parameters:list[str]=None):
+    """Output data in long format as an Arrow table. The parameter columns are chunked per output time and view the output buffers.
+
+    Args:
+        phase (Phase): Phase with output data
+        parameters (list): Parameters to export (defaults to all output parameters)
+
+    Returns:
+        pyarrow.Table with columns time, node, column and one column per parameter
+    """
+    import pyarrow as pa
+
+    return pa.Table.from_batches(list(arrow_batches(phase, parameters)))
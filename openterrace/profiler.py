@@ -0,0 +1,109 @@
+import time
+import json
+
+class Profiler:
+    """Wall time per stage of run_simulation and throughput of a simulation."""
+
+    setup_stages = ['_coupling', '_advance_multirate', '_write_checkpoint']
+    phase_stages = ['_update_massflow_rate', '_update_properties', '_update_boundary_nodes', 'diff', 'conv', '_update_source',
+                    '_solve_equations_fused', '_solve_equations_implicit', '_apply_coupling', '_save_data', '_record_monitors']
+
+    def __init__(self, progress_bar:bool=True, path:str=None):
+        """Initialise profiler.
+
+        Args:
+            progress_bar (bool): Show a progress bar with node updates per second and estimated time remaining
+            path (str): JSON file of the summary
+        """
+
+        self.progress_bar = progress_bar
+        self.path = path
+        self.stages = {}
+        self._wrapped = []
+
+    def start(self, setup=None, phases:list=None, t_simulate:float=None):
+        """Wrap the stages of the setup and phases with timers and start the clock.
+
+        Args:
+            setup (Setup): Setup running the simulation
+            phases (list): List of phases
+            t_simulate (float): Simulated time of the run in s
+        """
+        import tqdm
+
+        self.stages = {}
+        self._wrap(setup, self.setup_stages)
+        for phase in phases:
+            self._wrap(phase, self.phase_stages)
+        self.n_nodes = sum(phase.T.size for phase in phases)
+        self.steps = 0
+        self.t_simulated = 0
+        self._bar = tqdm.tqdm(total=t_simulate, unit='s', unit_scale=True, disable=not self.progress_bar)
+        self._t0 = time.perf_counter()
+
+    def step(self, dt:float=None):
+        """Register a completed time step.
+
+        Args:
+            dt (float): Time step size in s
+        """
+
+        self.steps += 1
+        self.t_simulated += dt
+        self._bar.update(dt)
+        if self.progress_bar and self.steps % 100 == 0:
+            self._bar.set_postfix(node_updates_per_s=f"{self.n_nodes*self.steps/(time.perf_counter()-self._t0):.3g}", refresh=False)
+
+    def stop(self):
+        """Stop the clock, remove the timers and summarise the run.
+
+        Returns:
+            Dictionary with wall time, number of time steps, node updates per second and wall time and number of calls per stage
+        """
+
+        wall_time = time.perf_counter()-self._t0
+        self._bar.close()
+        for obj, name, original in reversed(self._wrapped):
+            if original is None:
+                delattr(obj, name)
+            else:
+                setattr(obj, name, original)
+        self._wrapped = []
+
+        self.summary = {'wall_time': wall_time, 'steps': self.steps, 't_simulated': self.t_simulated, 'nodes': self.n_nodes,
+                        'node_updates_per_second': self.n_nodes*self.steps/wall_time if wall_time > 0 else 0.0,
+                        'stages': {name: {'time': stage[0], 'calls': stage[1], 'fraction': stage[0]/wall_time if wall_time > 0 else 0.0}
+                                   for name, stage in self.stages.items() if stage[1] > 0}}
+        if self.path is not None:
+            with open(self.path, 'w') as f:
+                json.dump(self.summary, f, indent=2)
+        return self.summary
+
+    def report(self):
+        """Print the summary of the last run."""
+
+        print("Wall time "+f"{self.summary['wall_time']:.3f}"+" s for "+str(self.summary['steps'])+" time steps ("+f"{self.summary['node_updates_per_second']:.3g}"+" node updates per second)")
+        for name, stage in sorted(self.summary['stages'].items(), key=lambda item: -item[1]['time']):
+            print(f"{name:>28}: {stage['time']:10.3f} s {100*stage['fraction']:6.1f} % {stage['calls']:10d} calls")
+
+    def _wrap(self, obj=None, names:list[str]=None):
+        """Replace the methods and functions names of obj by timed wrappers."""
+
+        for name in names:
+            if not hasattr(obj, name):
+                continue
+            self._wrapped.append((obj, name, obj.__dict__.get(name)))
+            setattr(obj, name, self._timed(name, getattr(obj, name)))
+
+    def _timed(self, name:str=None, fcn=None):
+        """Timed wrapper of fcn accumulating into stage name. Stages calling other stages include their time."""
+
+        stage = self.stages.setdefault(name, [0.0, 0])
+        def timed(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return fcn(*args, **kwargs)
+            finally:
+                stage[0] += time.perf_counter()-t0
+                stage[1] += 1
+        return timed
@@ -0,0 +1,185 @@
+import numpy as np
+import numba as nb
+
+class PropertyTable:
+    """Substance with the temperature, density, specific heat capacity and thermal conductivity tabulated on a uniform mass specific enthalpy grid. Can be used in place of any module in bed_substances or fluid_substances. All other functions, including h(T), are taken from the substance."""
+
+    properties = ['T', 'rho', 'cp', 'k']
+
+    def __init__(self, fcns=None, T_min:float=None, T_max:float=None, n:int=None, order:str='linear', rtol:float=1e-5, n_max:int=2**22+1):
+        """Build the tables. Unless n is given, the grid is refined until the interpolation error of all properties between the grid points is below rtol.
+
+        Args:
+            fcns (module): Substance module or object with functions h, T, rho, cp and k
+            T_min (float): Minimum temperature of the tables in K
+            T_max (float): Maximum temperature of the tables in K
+            n (int): Number of grid points
+            order (str): Interpolation order ('linear' or 'cubic')
+            rtol (float): Maximum interpolation error relative to the largest absolute value of each property
+            n_max (int): Maximum number of grid points
+        """
+
+        valid_orders = ['linear', 'cubic']
+        if T_min is None or T_max is None:
+            raise Exception("Keywords 'T_min' and 'T_max' must be specified.")
+        if not order in valid_orders:
+            raise Exception("Order \'"+order+"\' specified. Valid options for order are:", valid_orders)
+
+        self.fcns = fcns
+        self.order = order
+        self.h_min = float(np.asarray(fcns.h(np.array([T_min], dtype=np.float64)))[0])
+        self.h_max = float(np.asarray(fcns.h(np.array([T_max], dtype=np.float64)))[0])
+
+        if n is not None:
+            self._build(n)
+            self.error = self._error()
+            return
+
+        n = 257
+        while True:
+            self._build(n)
+            self.error = self._error()
+            if self.error <= rtol or n >= n_max:
+                break
+            n = 2*(n-1)+1
+
+    def __getattr__(self, name:str):
+        if name == 'fcns':
+            raise AttributeError(name)
+        return getattr(self.fcns, name)
+
+    def _build(self, n:int=None):
+        """Tabulate all properties on n uniformly distributed grid points."""
+
+        self.n = n
+        self.h_grid = np.linspace(self.h_min, self.h_max, n)
+        self.inv_dh = (n-1)/(self.h_max-self.h_min)
+        self.tables = {}
+        for prop in self.properties:
+            y = np.require(np.broadcast_to(getattr(self.fcns, prop)(self.h_grid), (n,)), np.float64, ['C', 'W'])
+            m = np.empty(n)
+            m[1:-1] = (y[2:]-y[:-2])/2
+            m[0] = y[1]-y[0]
+            m[-1] = y[-1]-y[-2]
+            self.tables[prop] = (y, m)
+
+    def _error(self):
+        """Largest relative interpolation error of all properties between the grid points."""
+
+        dh = (self.h_max-self.h_min)/(self.n-1)
+        h = np.concatenate([self.h_grid[:-1]+f*dh for f in (0.25, 0.5, 0.75)])
+        error = 0
+        for prop in self.properties:
+            exact = np.broadcast_to(getattr(self.fcns, prop)(h), h.shape)
+            scale = max(np.max(np.abs(self.tables[prop][0])), np.finfo(float).tiny)
+            error = max(error, np.max(np.abs(self._evaluate(prop, h)-exact))/scale)
+        return error
+
+    def _evaluate(self, prop:str=None, h:float=None):
+        """Evaluate table of property prop at mass specific enthalpy h."""
+
+        h = np.asarray(h, dtype=np.float64)
+        y, m = self.tables[prop]
+        if self.order == 'linear':
+            out = interpolate_linear(np.ascontiguousarray(h.ravel()), self.h_min, self.inv_dh, y)
+        else:
+            out = interpolate_cubic(np.ascontiguousarray(h.ravel()), self.h_min, self.inv_dh, y, m)
+        return out.reshape(h.shape)[()]
+
+    def T(self, h:float=None, p:float=None) -> float:
+        """Tabulated temperature as function of mass specific enthalpy.
+
+        Args:
+            h (float): Specific enthalpy in J/kg
+            p (float): Pressure in Pa
+
+        Returns:
+            Temperature in kelvin
+        """
+        return self._evaluate('T', h)
+
+    def rho(self, h:float=None, p:float=None) -> float:
+        """Tabulated density as function of mass specific enthalpy.
+
+        Args:
+            h (float): Specific enthalpy in J/kg
+            p (float): Pressure in Pa
+
+        Returns:
+            Density in kg/m^3
+        """
+        return self._evaluate('rho', h)
+
+    def cp(self, h:float=None, p:float=None) -> float:
+        """Tabulated specific heat capacity as function of mass specific enthalpy.
+
+        Args:
+            h (float): Specific enthalpy in J/kg
+            p (float): Pressure in Pa
+
+        Returns:
+            Specific heat capacity in J/(kg K)
+        """
+        return self._evaluate('cp', h)
+
+    def k(self, h:float=None, p:float=None) -> float:
+        """Tabulated thermal conductivity as function of mass specific enthalpy.
+
+        Args:
+            h (float): Specific enthalpy in J/kg
+            p (float): Pressure in Pa
+
+        Returns:
+            Thermal conductivity in W/(m K)
+        """
+        return self._evaluate('k', h)
+
+@nb.njit(cache=True)
+def interpolate_linear(x, x0, inv_dx, y):
+    """Linear interpolation on a uniform grid. Values outside the grid are extrapolated linearly from the first or last interval.
+
+    Args:
+        x (float): Points to evaluate of shape (n,)
+        x0 (float): First grid point
+        inv_dx (float): Inverse grid spacing
+        y (float): Tabulated values of shape (n_grid,)
+
+    Returns:
+        Interpolated values of shape (n,)
+    """
+    n = y.shape[0]
+    out = np.empty(x.shape[0])
+    for i in range(x.shape[0]):
+        s = (x[i]-x0)*inv_dx
+        j = min(max(int(np.floor(s)), 0), n-2)
+        t = s-j
+        out[i] = y[j] + t*(y[j+1]-y[j])
+    return out
+
+@nb.njit(cache=True)
+def interpolate_cubic(x, x0, inv_dx, y, m):
+    """Cubic Hermite interpolation on a uniform grid. Values outside the grid are extrapolated linearly from the first or last interval.
+
+    Args:
+        x (float): Points to evaluate of shape (n,)
+        x0 (float): First grid point
+        inv_dx (float): Inverse grid spacing
+        y (float): Tabulated values of shape (n_grid,)
+        m (float): Tabulated slopes per grid spacing of shape (n_grid,)
+
+    Returns:
+        Interpolated values of shape (n,)
+    """
+    n = y.shape[0]
+    out = np.empty(x.shape[0])
+    for i in range(x.shape[0]):
+        s = (x[i]-x0)*inv_dx
+        j = min(max(int(np.floor(s)), 0), n-2)
+        t = s-j
+        if t < 0 or t > 1:
+            out[i] = y[j] + t*(y[j+1]-y[j])
+            continue
+        t2 = t*t
+        t3 = t2*t
+        out[i] = (2*t3-3*t2+1)*y[j] + (t3-2*t2+t)*m[j] + (-2*t3+3*t2)*y[j+1] + (t3-t2)*m[j+1]
+    return out
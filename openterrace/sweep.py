@@ -0,0 +1,93 @@
+import numpy as np
+import itertools
+import json
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from . import compilation
+
+def expand_grid(grid:dict=None):
+    """Expand a parameter grid to a list of scenarios.
+
+    Args:
+        grid (dict): Dictionary of parameter names and lists of values. The full Cartesian product is taken. A list of dictionaries is returned as is
+
+    Returns:
+        List of dictionaries with one value per parameter
+    """
+
+    if isinstance(grid, dict):
+        keys = list(grid.keys())
+        return [dict(zip(keys, values)) for values in itertools.product(*[grid[key] for key in keys])]
+    return list(grid)
+
+def run_sweep(builder=None, grid:dict=None, path:str=None, max_workers:int=None, start_method:str='spawn', precompile:bool=True):
+    """Run a parameter sweep in a process pool. Each run writes the output data of its phases directly into memory-mapped .npy files in path, so no results are pickled back to the parent process.
+
+    Args:
+        builder (function): Module-level function called as builder(**scenario) returning a tuple (setup, phases) ready for run_simulation. Phases with output data must call select_output, with the same number of nodes and output times in all scenarios
+        grid (dict): Dictionary of parameter names and lists of values or a list of scenario dictionaries
+        path (str): Directory of the result files
+        max_workers (int): Number of worker processes
+        start_method (str): Start method of the worker processes. 'spawn' is safe after numba has started its threads in the parent process
+        precompile (bool): Compile the kernels used by the first scenario into the on-disk cache before starting the workers, so the workers load them instead of compiling them
+
+    Returns:
+        List with one dictionary per phase mapping output parameters to read-only arrays of shape (n_runs, n_times, n0, n1)
+    """
+
+    if builder is None:
+        raise Exception("Keyword 'builder' not specified.")
+    if path is None:
+        raise Exception("Keyword 'path' not specified.")
+    scenarios = expand_grid(grid)
+    os.makedirs(path, exist_ok=True)
+
+    _, phases = builder(**scenarios[0])
+    if precompile:
+        compilation.precompile(phases)
+    files = []
+    for i, phase in enumerate(phases):
+        files.append({})
+        if hasattr(phase, 'data'):
+            for parameter, value in phase.data.parameters.items():
+                files[i][parameter] = os.path.join(path, 'phase'+str(i)+'_'+parameter+'.npy')
+                np.lib.format.open_memmap(files[i][parameter], mode='w+', dtype=value.dtype, shape=(len(scenarios),)+value.shape).flush()
+
+    with open(os.path.join(path, 'scenarios.json'), 'w') as f:
+        json.dump(scenarios, f, default=_to_json)
+
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context(start_method)) as executor:
+        futures = [executor.submit(_run_scenario, builder, scenario, run, files) for run, scenario in enumerate(scenarios)]
+        for future in futures:
+            future.result()
+
+    return [{parameter: np.load(file, mmap_mode='r') for parameter, file in phase_files.items()} for phase_files in files]
+
+def _run_scenario(builder=None, scenario:dict=None, run:int=None, files:list=None):
+    """Run a single scenario with its output data stored in row run of the result files."""
+
+    setup, phases = builder(**scenario)
+    if len(phases) != len(files):
+        raise ValueError("Scenario "+str(run)+" "+str(scenario)+" has "+str(len(phases))+" phases, but scenario 0 has "+str(len(files))+".")
+    results = []
+    for i, (phase, phase_files) in enumerate(zip(phases, files)):
+        for parameter, file in phase_files.items():
+            results.append(np.load(file, mmap_mode='r+'))
+            shape = np.shape(phase.data.parameters[parameter]) if hasattr(phase, 'data') and parameter in phase.data.parameters else None
+            if shape != results[-1].shape[1:]:
+                raise ValueError("Output parameter \'"+parameter+"\' of phase "+str(i)+" has shape "+str(shape)+" in scenario "+str(run)+" "+str(scenario)+", but shape "+str(results[-1].shape[1:])+" in scenario 0. The number of nodes and output times must be the same in all scenarios.")
+            phase.data.parameters[parameter] = results[-1][run]
+
+    setup.run_simulation(phases=phases)
+    for result in results:
+        result.flush()
+
+def _to_json(x):
+    """Convert numpy values of scenarios to JSON."""
+
+    if isinstance(x, np.ndarray):
+        return x.tolist()
+    if isinstance(x, np.generic):
+        return x.item()
+    return str(x)
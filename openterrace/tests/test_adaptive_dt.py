@@ -0,0 +1,96 @@
+import openterrace
+import numpy as np
+
+def run(adaptive):
+    ot = openterrace.Setup(t_simulate=3600, dt=0.05)
+    if adaptive:
+        ot.select_adaptive_dt(dt_min=1e-3, dt_max=60)
+
+    fluid = openterrace.Phase(type='fluid')
+    fluid.select_substance(substance='water')
+    fluid.select_domain_type(domain='cylinder_1d')
+    fluid.create_domain(n=(50, 1), D=0.1, H=1)
+    fluid.select_schemes(diff='central_difference_1d', conv='upwind_1d')
+    fluid.initialise(T=273.15+20)
+    fluid.select_massflow(mdot=[[0, 0.01], [600, 0.01], [601, 0], [3600, 0]])
+    fluid.select_bc(position=0, bc_type='fixed_value', value=273.15+80)
+    fluid.select_bc(position=-1, bc_type='fixed_gradient', value=0)
+    fluid.select_output(times=range(0, 3600+300, 300))
+
+    dts = []
+    solve_equations = fluid._solve_equations
+    fluid._solve_equations = lambda dt: (dts.append(dt), solve_equations(dt))
+
+    ot.run_simulation(phases=[fluid])
+    return fluid, dts
+
+def test_adaptive_dt():
+    fluid_fixed, dts_fixed = run(adaptive=False)
+    fluid_adaptive, dts_adaptive = run(adaptive=True)
+
+    assert fluid_adaptive._q == len(fluid_adaptive.data.times)
+    assert len(dts_adaptive) < len(dts_fixed)/10
+    assert max(dts_adaptive) <= 60
+    np.testing.assert_allclose(fluid_adaptive.data.parameters['T'].mean(axis=(1,2)), fluid_fixed.data.parameters['T'].mean(axis=(1,2)), atol=1)
+
+def run_packed_bed(adaptive):
+    ot = openterrace.Setup(t_simulate=600, dt=0.05)
+    if adaptive:
+        ot.select_adaptive_dt(dt_min=1e-3, dt_max=10)
+
+    fluid = openterrace.Phase(type='fluid')
+    fluid.select_substance(substance='air')
+    fluid.select_domain_type(domain='cylinder_1d')
+    fluid.create_domain(n=(20, 1), D=0.3, H=1)
+    fluid.select_porosity(phi=0.4)
+    fluid.select_schemes(diff='central_difference_1d', conv='upwind_1d')
+    fluid.initialise(T=273.15+25)
+    fluid.select_massflow(mdot=0)
+    fluid.select_bc(position=0, bc_type='fixed_value', value=273.15+500)
+    fluid.select_bc(position=-1, bc_type='fixed_gradient', value=0)
+
+    bed = openterrace.Phase(type='bed')
+    bed.select_substance(substance='magnetite')
+    bed.select_domain_type(domain='reduced_sphere')
+    bed.create_domain(n=(1, 20), radius=0.05, model='lumped')
+    bed.initialise(T=273.15+25)
+
+    ot.select_coupling(fluid_phase=0, bed_phase=1, h_exp='constant', h_value=100)
+    ot.run_simulation(phases=[fluid, bed])
+    return fluid, bed, ot
+
+def test_adaptive_dt_coupled():
+    # Standby without flow, where only the coupling limits the time step size
+    fluid_fixed, bed_fixed, _ = run_packed_bed(adaptive=False)
+    fluid_adaptive, bed_adaptive, ot = run_packed_bed(adaptive=True)
+
+    assert ot._dt_adaptive < 10
+    assert np.all((fluid_adaptive.T > 273.15+24) & (fluid_adaptive.T < 273.15+501))
+    np.testing.assert_allclose(fluid_adaptive.T[1:], fluid_fixed.T[1:], atol=1)
+    np.testing.assert_allclose(bed_adaptive.T[:,1:], bed_fixed.T[:,1:], atol=1)
+
+def run_source(adaptive):
+    ot = openterrace.Setup(t_simulate=1000, dt=0.1)
+    if adaptive:
+        ot.select_adaptive_dt(dt_min=1e-3, dt_max=100)
+
+    bed = openterrace.Phase(type='bed')
+    bed.select_substance(substance='magnetite')
+    bed.select_domain_type(domain='block_1d')
+    bed.create_domain(n=(5, 1), length=0.1, area=1)
+    bed.initialise(T=273.15+20)
+    bed.add_sourceterm_thermal_resistance(R=1e-4, T_inf=273.15+80)
+
+    ot.run_simulation(phases=[bed])
+    return bed
+
+def test_adaptive_dt_source_only():
+    # The source term limits the time step size of a phase without diffusion scheme
+    bed_fixed = run_source(adaptive=False)
+    bed_adaptive = run_source(adaptive=True)
+
+    assert np.all((bed_adaptive.T > 273.15+19) & (bed_adaptive.T < 273.15+81))
+    np.testing.assert_allclose(bed_adaptive.T, bed_fixed.T, atol=0.5)
+
+if __name__ == "__main__":
+    test_adaptive_dt()
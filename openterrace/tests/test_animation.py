@@ -0,0 +1,57 @@
+import openterrace
+from openterrace.postprocessing import animation
+import numpy as np
+import os
+import shutil
+import subprocess
+import pytest
+
+def run_wall(path):
+    ot = openterrace.Setup(t_simulate=10, dt=0.05)
+
+    bed = openterrace.Phase(type='bed')
+    bed.select_substance(substance='magnetite')
+    bed.select_domain_type(domain='block_1d')
+    bed.create_domain(n=(10, 3), length=0.02, area=1)
+    bed.select_schemes(diff='central_difference_1d')
+    bed.initialise(T=273.15+20)
+    bed.select_bc(position=0, bc_type='fixed_value', value=273.15+20)
+    bed.select_bc(position=-1, bc_type='fixed_value', value=273.15+80)
+    bed.select_output(times=[0, 2, 4, 6, 8, 10], backend='memmap', path=path)
+
+    ot.run_simulation(phases=[bed])
+    return bed
+
+def test_png_sequence(tmp_path):
+    bed = run_wall(os.path.join(tmp_path, 'output'))
+
+    n = animation.render_animation(bed, path=os.path.join(tmp_path, 'frames'), max_workers=2)
+    assert n == 6
+    frames = sorted(os.listdir(os.path.join(tmp_path, 'frames')))
+    assert frames[0] == 'frame_00000.png' and len(frames) == 6
+    with open(os.path.join(tmp_path, 'frames', frames[-1]), 'rb') as f:
+        assert f.read(8) == b'\x89PNG\r\n\x1a\n'
+
+    n = animation.render_animation(os.path.join(tmp_path, 'output', 'T.npy'), path=os.path.join(tmp_path, 'frames.v2'), max_workers=2)
+    assert n == 6 and len(os.listdir(os.path.join(tmp_path, 'frames.v2'))) == 6
+
+def test_video(tmp_path):
+    if shutil.which('ffmpeg') is None:
+        pytest.skip('ffmpeg not available')
+    bed = run_wall(os.path.join(tmp_path, 'output'))
+    animation.render_animation(bed, path=os.path.join(tmp_path, 'T.mp4'), max_workers=2)
+    assert os.path.getsize(os.path.join(tmp_path, 'T.mp4')) > 0
+
+def test_encoder_stopped_on_error(tmp_path, monkeypatch):
+    encoders = []
+    Popen = subprocess.Popen
+    def popen(args, stdin=None):
+        encoders.append(Popen(['cat'], stdin=stdin, stdout=subprocess.DEVNULL))
+        return encoders[-1]
+    monkeypatch.setattr(animation.shutil, 'which', lambda name: name)
+    monkeypatch.setattr(animation.subprocess, 'Popen', popen)
+
+    # One-dimensional snapshots cannot be rendered
+    with pytest.raises(IndexError):
+        animation.render_animation(np.zeros((3, 10)), path=os.path.join(tmp_path, 'T.mp4'), max_workers=1)
+    assert encoders[0].returncode is not None
@@ -0,0 +1,51 @@
+import openterrace
+import numpy as np
+import os
+
+def packed_bed(t_simulate):
+    ot = openterrace.Setup(t_simulate=t_simulate, dt=0.05)
+
+    fluid = openterrace.Phase(type='fluid')
+    fluid.select_substance(substance='water')
+    fluid.select_domain_type(domain='cylinder_1d')
+    fluid.create_domain(n=(20, 1), D=0.1, H=0.5)
+    fluid.select_porosity(phi=0.4)
+    fluid.select_schemes(diff='central_difference_1d', conv='upwind_1d')
+    fluid.initialise(T=273.15+20)
+    fluid.select_massflow(mdot=np.array([[0, 0.01], [30, 0.01], [40, 0.02], [100, 0.02]]))
+    fluid.select_bc(position=0, bc_type='fixed_value', value=273.15+80)
+    fluid.select_bc(position=-1, bc_type='fixed_gradient', value=0)
+    fluid.select_output(times=range(0, 110, 10))
+
+    bed = openterrace.Phase(type='bed')
+    bed.select_substance(substance='ATS50')
+    bed.select_domain_type(domain='sphere_1d')
+    bed.create_domain(n=(10, 20), radius=0.01)
+    bed.select_schemes(diff='central_difference_1d')
+    bed.initialise(T=273.15+20)
+    bed.select_bc(position=0, bc_type='fixed_gradient', value=0)
+    bed.select_bc(position=-1, bc_type='fixed_gradient', value=0)
+
+    ot.select_coupling(fluid_phase=0, bed_phase=1, h_exp='constant', h_value=200)
+    return ot, fluid, bed
+
+def test_checkpoint_restart(tmp_path):
+    path = os.path.join(tmp_path, 'checkpoint.npz')
+
+    ot, fluid_ref, bed_ref = packed_bed(t_simulate=100)
+    ot.run_simulation(phases=[fluid_ref, bed_ref])
+
+    ot, fluid, bed = packed_bed(t_simulate=45)
+    ot.select_checkpoint(path=path, every_steps=200)
+    ot.run_simulation(phases=[fluid, bed])
+    assert os.path.isfile(path) and not os.path.isfile(path+'.tmp')
+
+    ot, fluid, bed = packed_bed(t_simulate=100)
+    ot.restore(path, phases=[fluid, bed])
+    assert 45 <= ot.t < 45+0.05+1e-9
+    ot.run_simulation(phases=[fluid, bed])
+
+    assert 100 <= ot.t < 100+0.05+1e-9
+    np.testing.assert_array_equal(fluid.h, fluid_ref.h)
+    np.testing.assert_array_equal(bed.h, bed_ref.h)
+    np.testing.assert_array_equal(fluid.data.parameters['T'], fluid_ref.data.parameters['T'])
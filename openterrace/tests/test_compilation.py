@@ -0,0 +1,43 @@
+import openterrace
+import numpy as np
+import subprocess
+import sys
+
+def test_lazy_import():
+    code = "import sys, openterrace; print([m for m in ['matplotlib', 'tqdm', 'openterrace.fluid_substances.water', 'openterrace.domains.sphere_1d'] if m in sys.modules])"
+    out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+    assert out.strip() == '[]'
+    assert 'water' in openterrace.fluid_substances.__all__
+    assert openterrace.fluid_substances.water.cp(np.array([1e5])).shape == (1,)
+
+def test_precompile_phases():
+    ot = openterrace.Setup(t_simulate=1, dt=0.1)
+
+    fluid = openterrace.Phase(type='fluid')
+    fluid.select_substance(substance='water')
+    fluid.select_domain_type(domain='cylinder_1d')
+    fluid.create_domain(n=(10, 1), D=0.1, H=0.5)
+    fluid.select_porosity(phi=0.4)
+    fluid.select_schemes(diff='central_difference_1d', conv='upwind_1d')
+    fluid.initialise(T=273.15+20)
+    fluid.select_massflow(mdot=0.01)
+    fluid.select_bc(position=0, bc_type='fixed_value', value=273.15+80)
+    fluid.select_bc(position=-1, bc_type='fixed_gradient', value=0)
+
+    bed = openterrace.Phase(type='bed')
+    bed.select_substance(substance='magnetite')
+    bed.select_domain_type(domain='sphere_1d')
+    bed.create_domain(n=(5, 10), radius=0.01)
+    bed.select_schemes(diff='central_difference_1d', time_integration='backward_euler')
+    bed.initialise(T=273.15+20)
+    bed.select_bc(position=0, bc_type='fixed_gradient', value=0)
+    bed.select_bc(position=-1, bc_type='fixed_gradient', value=0)
+    bed.add_monitor('T_mean', parameter='T')
+    ot.select_coupling(fluid_phase=0, bed_phase=1, h_exp='constant', h_value=200)
+
+    assert openterrace.precompile([fluid, bed]) > 0
+    kernels = [fluid.diff, fluid.conv, openterrace.implicit_diffusion.implicit_diffusion_1d, openterrace.coupling.coupling_1d, openterrace.monitors.reduce,
+               openterrace.fluid_substances.water.T, openterrace.bed_substances.magnetite.h]
+    signatures = [len(kernel.signatures) for kernel in kernels]
+    ot.run_simulation(phases=[fluid, bed])
+    assert [len(kernel.signatures) for kernel in kernels] == signatures
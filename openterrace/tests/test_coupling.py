@@ -0,0 +1,62 @@
+import openterrace
+from openterrace import coupling
+import numpy as np
+import pytest
+
+def two_phases(grid):
+    n_f, n_r = 12, 8
+    ot = openterrace.Setup(t_simulate=1, dt=0.1)
+
+    fluid = openterrace.Phase(type='fluid')
+    fluid.select_substance(substance='water')
+    fluid.select_domain_type(domain='cylinder_1d')
+    fluid.create_domain(n=(n_f, 1), D=0.1, H=0.5, grid=grid)
+    fluid.select_porosity(phi=0.4)
+    fluid.initialise(T=273.15+20)
+    fluid.h = fluid.fcns.h(np.linspace(273.15+80, 273.15+30, n_f)[:,None])
+
+    bed = openterrace.Phase(type='bed')
+    bed.select_substance(substance='magnetite')
+    bed.select_domain_type(domain='sphere_1d')
+    bed.create_domain(n=(n_r, n_f), radius=0.01, grid=grid)
+    bed.initialise(T=273.15+20)
+    bed.h = bed.fcns.h(np.linspace(273.15+20, 273.15+60, n_r*n_f).reshape(n_r, n_f))
+
+    for phase in [fluid, bed]:
+        phase._refresh_properties()
+    ot.select_coupling(fluid_phase=0, bed_phase=1, h_exp='constant', h_value=200)
+    ot.phases = [fluid, bed]
+    ot._build_coupling_plan()
+    return ot, fluid, bed
+
+def reference_rates(fluid, bed, h_value):
+    """Per-phase Python coupling used before the coupling plan."""
+    n_bed = (fluid.domain.V/fluid.phi*(1-fluid.phi)/bed.domain.V0)[:,0]
+    Qdot = h_value*bed.domain.A[1][-1]*(fluid.T[:,0]-bed.T[-1,:])
+    return n_bed, Qdot
+
+@pytest.mark.parametrize('grid', ['uniform', 'tanh'])
+def test_coupling_plan(grid):
+    dt = 0.1
+    ot, fluid, bed = two_phases(grid)
+    n_bed, Qdot = reference_rates(fluid, bed, 200)
+    h_f = fluid.h.copy()
+    h_b = bed.h.copy()
+    h_b[-1,:] = h_b[-1,:] + Qdot*dt/(bed.rho[-1,:]*bed.domain.V[-1])
+    h_f[:,0] = h_f[:,0] - n_bed*Qdot*dt/(fluid.rho[:,0]*fluid.domain.V[:,0])
+
+    ot._coupling(dt)
+    np.testing.assert_allclose(fluid.h, h_f, rtol=1e-12)
+    np.testing.assert_allclose(bed.h, h_b, rtol=1e-12)
+
+@pytest.mark.parametrize('grid', ['uniform', 'tanh'])
+def test_coupling_rates(grid):
+    ot, fluid, bed = two_phases(grid)
+    n_bed, Qdot = reference_rates(fluid, bed, 200)
+
+    plan = ot._coupling_plan[0]
+    q_f, q_b = np.zeros(fluid.T.shape), np.zeros(bed.T.shape)
+    coupling.coupling_rates_1d(fluid.T, bed.T, plan['n_bed'], plan['hA'], q_f, q_b)
+    np.testing.assert_allclose(q_b[-1], Qdot, rtol=1e-12)
+    np.testing.assert_allclose(q_f[:,0], -n_bed*Qdot, rtol=1e-12)
+    assert not np.any(q_b[:-1])
@@ -0,0 +1,66 @@
+import openterrace
+from openterrace import acceleration
+import numpy as np
+import pytest
+
+def storage(method):
+    t_cycle = 3600
+    ot = openterrace.Setup(t_simulate=t_cycle, dt=5)
+    ot.select_cyclic_steady_state(tol=1e-2, max_cycles=100, acceleration=method)
+
+    # Charge with hot fluid from the bottom and discharge with cold fluid from the top
+    fluid = openterrace.Phase(type='fluid')
+    fluid.select_substance_on_the_fly(cp=4200, rho=1000, k=0.6)
+    fluid.select_domain_type(domain='cylinder_1d')
+    fluid.create_domain(n=(20, 1), D=0.3, H=1)
+    fluid.select_porosity(phi=0.4)
+    fluid.select_schemes(conv='upwind_1d')
+    fluid.initialise(T=273.15+20)
+    fluid.select_massflow(mdot=[[0, 0.02], [t_cycle/2, 0.02], [t_cycle/2+1, -0.02], [t_cycle, -0.02]])
+    fluid.select_bc(position=0, bc_type='fixed_value', value=273.15+80)
+    fluid.select_bc(position=-1, bc_type='fixed_value', value=273.15+20)
+
+    bed = openterrace.Phase(type='bed')
+    bed.select_substance_on_the_fly(cp=1130, rho=5150, k=1.9)
+    bed.select_domain_type(domain='reduced_sphere')
+    bed.create_domain(n=(1, 20), radius=0.01, model='polynomial')
+    bed.initialise(T=273.15+20)
+    bed.select_energy_balance()
+
+    ot.select_coupling(fluid_phase=0, bed_phase=1, h_exp='constant', h_value=200)
+    ot.run_simulation(phases=[fluid, bed])
+    return ot, fluid, bed
+
+def test_cyclic_steady_state():
+    ot_ref, _, bed_ref = storage('none')
+    ot, fluid, bed = storage('anderson')
+
+    assert ot_ref.cyclic_converged and ot.cyclic_converged
+    assert len(ot.cycle_residuals) < len(ot_ref.cycle_residuals)/2
+    np.testing.assert_allclose(bed.T, bed_ref.T, atol=0.05)
+
+    # The last cycle starts and ends in the same state within the tolerance of 0.01 K
+    balance = bed.get_energy_balance()
+    assert abs(balance['stored']) < 1e-2*bed.rho[0,0]*bed.cp[0,0]*np.sum(bed._energy_weight*bed.domain.V0)
+    assert ot.t == 3600
+
+@pytest.mark.parametrize('method, depth, n', [('aitken', 1, 1), ('anderson', 3, 3)])
+def test_extrapolate_linear_map(method, depth, n):
+    rng = np.random.default_rng(0)
+    A = np.diag(rng.uniform(0.8, 0.99, n))
+    b = rng.random(n)
+    fcn = lambda x: A@x+b
+    x_fixed = np.linalg.solve(np.eye(n)-A, b)
+
+    x, f = [np.zeros(n)], []
+    for k in range(n+2):
+        f.append(fcn(x[-1]))
+        x.append(acceleration.extrapolate(x, f, method, depth))
+
+    np.testing.assert_allclose(x[-1], x_fixed, rtol=1e-8)
+    assert np.max(np.abs(f[0]-x_fixed)) > 1
+
+def test_invalid_acceleration():
+    ot = openterrace.Setup(t_simulate=1, dt=1)
+    with pytest.raises(Exception):
+        ot.select_cyclic_steady_state(acceleration='broyden')
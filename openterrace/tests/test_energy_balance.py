@@ -0,0 +1,88 @@
+import openterrace
+import numpy as np
+import pytest
+
+def energy(phase):
+    return np.sum(phase.rho*phase.domain.V*phase.h, axis=0)
+
+@pytest.mark.parametrize('fused, time_integration', [(False, 'explicit'), (True, 'explicit'), (False, 'backward_euler'), (False, 'crank_nicolson')])
+def test_energy_balance_wall(fused, time_integration):
+    ot = openterrace.Setup(t_simulate=500, dt=0.5)
+
+    wall = openterrace.Phase(type='bed')
+    wall.select_substance_on_the_fly(cp=900, rho=2700, k=200)
+    wall.select_domain_type(domain='block_1d')
+    wall.create_domain(n=(30, 1), length=0.3, area=0.01)
+    wall.select_schemes(diff='central_difference_1d', fused=fused, time_integration=time_integration)
+    wall.initialise(T=273.15+20)
+    wall.select_bc(position=0, bc_type='fixed_value', value=273.15+80)
+    wall.select_bc(position=-1, bc_type='fixed_value', value=273.15+10)
+    wall.add_sourceterm_thermal_resistance(R=100, T_inf=273.15+50)
+    wall.select_energy_balance()
+
+    E0 = energy(wall)
+    ot.run_simulation(phases=[wall])
+    balance = wall.get_energy_balance()
+
+    np.testing.assert_allclose(balance['stored'], np.sum(energy(wall)-E0), rtol=1e-10)
+    assert balance['boundary'] != 0 and balance['source'] != 0
+    assert abs(balance['residual']) < 1e-10*abs(balance['boundary'])
+
+def packed_bed(n_members=1, substeps=False, fused=False):
+    ot = openterrace.Setup(t_simulate=200, dt=0.5)
+
+    fluid = openterrace.Phase(type='fluid')
+    fluid.select_substance_on_the_fly(cp=4200, rho=1000, k=0.6)
+    fluid.select_domain_type(domain='cylinder_1d')
+    fluid.create_domain(n=(20, 1), D=0.1, H=0.5)
+    fluid.select_ensemble(n_members=n_members)
+    fluid.select_porosity(phi=0.4)
+    fluid.select_schemes(conv='upwind_1d', fused=fused)
+    fluid.initialise(T=273.15+20)
+    fluid.select_massflow(mdot=0.01 if n_members == 1 else [0.01*(m+1) for m in range(n_members)])
+    fluid.select_bc(position=0, bc_type='fixed_value', value=273.15+80)
+    fluid.select_bc(position=-1, bc_type='fixed_gradient', value=0)
+    fluid.select_energy_balance()
+
+    bed = openterrace.Phase(type='bed')
+    bed.select_substance_on_the_fly(cp=1130, rho=5150, k=1.9)
+    bed.select_domain_type(domain='sphere_1d')
+    bed.create_domain(n=(10, 20), radius=0.01)
+    bed.select_ensemble(n_members=n_members)
+    bed.initialise(T=273.15+20)
+    bed.select_energy_balance()
+    if substeps:
+        bed.select_substeps(n=3)
+
+    ot.select_coupling(fluid_phase=0, bed_phase=1, h_exp='constant', h_value=200)
+    return ot, fluid, bed
+
+@pytest.mark.parametrize('substeps, fused', [(False, False), (True, False), (False, True)])
+def test_energy_balance_packed_bed(substeps, fused):
+    ot, fluid, bed = packed_bed(substeps=substeps, fused=fused)
+    ot.run_simulation(phases=[fluid, bed])
+
+    fluid_balance = fluid.get_energy_balance()
+    bed_balance = bed.get_energy_balance()
+    balance = ot.get_energy_balance()
+
+    assert bed_balance['coupling'] > 0
+    np.testing.assert_allclose(fluid_balance['coupling'], -bed_balance['coupling'], rtol=1e-10)
+    np.testing.assert_allclose(bed_balance['stored'], bed_balance['coupling'], rtol=1e-10)
+    assert abs(balance['coupling']) < 1e-10*bed_balance['coupling']
+    assert abs(balance['residual']) < 1e-10*balance['convection']
+    np.testing.assert_allclose(balance['stored'], balance['convection']+balance['boundary'], rtol=1e-10)
+
+def test_energy_balance_ensemble():
+    ot, fluid, bed = packed_bed(n_members=2)
+    ot.run_simulation(phases=[fluid, bed])
+    balance = ot.get_energy_balance()
+
+    assert balance['stored'].shape == (2,)
+    assert balance['convection'][1] > balance['convection'][0]
+    assert np.all(np.abs(balance['residual']) < 1e-10*balance['convection'])
+
+def test_energy_balance_not_selected():
+    phase = openterrace.Phase(type='fluid')
+    with pytest.raises(Exception):
+        phase.get_energy_balance()
@@ -17,7 +17,9 @@ def test_energy_conservation():
     fluid.select_bc(position=0, bc_type='fixed_gradient', value=0)
     fluid.select_bc(position=-1, bc_type='fixed_gradient', value=0)
     fluid.select_output(times=range(0, 11000, 1000), parameters=['T','h'])
-    
+    fluid.select_energy_balance()
+    E0 = np.sum(fluid.rho*fluid.domain.V*fluid.h)
+
     ot.run_simulation(phases=[fluid])
 
     plt.plot(fluid.domain.node_pos, fluid.data.parameters['h'][:,0,:].T, label=fluid.data.times)
@@ -30,7 +32,9 @@ def test_energy_conservation():
     plt.minorticks_on()
     plt.savefig('ot_test_energy_conservation.svg', bbox_inches='tight')
     
-    np.testing.assert_array_almost_equal(1,1, decimal=2) #Dummy check
+    balance = fluid.get_energy_balance()
+    np.testing.assert_allclose(balance['stored'], np.sum(fluid.rho*fluid.domain.V*fluid.h)-E0, atol=1e-9*E0)
+    assert abs(balance['residual']) <= 1e-9*E0
 
 if __name__ == '__main__':
     test_energy_conservation()
\ No newline at end of file
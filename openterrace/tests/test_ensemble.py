@@ -0,0 +1,75 @@
+import openterrace
+import numpy as np
+import pytest
+
+def packed_bed(mdot, T_in, phi, n_members=1):
+    ot = openterrace.Setup(t_simulate=100, dt=0.05)
+
+    fluid = openterrace.Phase(type='fluid')
+    fluid.select_substance_on_the_fly(cp=4200, rho=1000, k=0.6)
+    fluid.select_domain_type(domain='cylinder_1d')
+    fluid.create_domain(n=(20, 1), D=0.1, H=0.5)
+    fluid.select_ensemble(n_members=n_members)
+    fluid.select_porosity(phi=phi)
+    fluid.select_schemes(diff='central_difference_1d', conv='upwind_1d')
+    fluid.initialise(T=273.15+20)
+    fluid.select_massflow(mdot=mdot)
+    fluid.select_bc(position=0, bc_type='fixed_value', value=T_in)
+    fluid.select_bc(position=-1, bc_type='fixed_gradient', value=0)
+
+    bed = openterrace.Phase(type='bed')
+    bed.select_substance_on_the_fly(cp=1130, rho=5150, k=1.9)
+    bed.select_domain_type(domain='sphere_1d')
+    bed.create_domain(n=(10, 20), radius=0.01)
+    bed.select_ensemble(n_members=n_members)
+    bed.select_schemes(diff='central_difference_1d')
+    bed.initialise(T=273.15+20)
+    bed.select_bc(position=0, bc_type='fixed_gradient', value=0)
+    bed.select_bc(position=-1, bc_type='fixed_gradient', value=0)
+    bed.select_output(times=[0, 50, 100])
+
+    ot.select_coupling(fluid_phase=0, bed_phase=1, h_exp='constant', h_value=200)
+    ot.run_simulation(phases=[fluid, bed])
+    return fluid, bed
+
+def test_ensemble_members_match_single_runs():
+    mdot = [0.01, np.array([[0, 0.02], [50, 0.02], [60, 0.005], [100, 0.005]]), 0.015]
+    T_in = [273.15+80, 273.15+60, 273.15+70]
+    phi = [0.4, 0.4, 0.35]
+
+    fluid, bed = packed_bed(mdot=mdot, T_in=T_in, phi=phi, n_members=3)
+    assert fluid.T.shape == (20, 3) and bed.T.shape == (10, 60)
+
+    for m in range(3):
+        fluid_m, bed_m = packed_bed(mdot=mdot[m], T_in=T_in[m], phi=phi[m])
+        np.testing.assert_allclose(fluid.ensemble_view(fluid.T)[m], fluid_m.T, rtol=1e-12)
+        np.testing.assert_allclose(bed.ensemble_view(bed.T)[m], bed_m.T, rtol=1e-12)
+        np.testing.assert_allclose(bed.ensemble_view(bed.data.parameters['T'])[m], bed_m.data.parameters['T'], rtol=1e-12)
+
+def test_ensemble_massflow_tables():
+    table = lambda mdot: np.array([[0, mdot], [100, mdot]])
+    fluid, bed = packed_bed(mdot=[table(0.01), table(0.02)], T_in=273.15+80, phi=0.4, n_members=2)
+    fluid_ref, bed_ref = packed_bed(mdot=[0.01, 0.02], T_in=273.15+80, phi=0.4, n_members=2)
+    np.testing.assert_allclose(bed.T, bed_ref.T, rtol=1e-12)
+    assert np.shares_memory(bed.ensemble_view(bed.T), bed.T)
+
+def test_ensemble_wrong_number_of_values():
+    fluid = openterrace.Phase(type='fluid')
+    fluid.select_substance_on_the_fly(cp=4200, rho=1000, k=0.6)
+    fluid.select_domain_type(domain='cylinder_1d')
+    fluid.create_domain(n=(20, 1), D=0.1, H=0.5)
+    fluid.select_ensemble(n_members=4)
+    with pytest.raises(ValueError):
+        fluid.select_porosity(phi=[0.4, 0.4, 0.35])
+    fluid.select_porosity(phi=0.4)
+    with pytest.raises(ValueError):
+        fluid.initialise(T=[293.15, 303.15, 313.15])
+    fluid.initialise(T=293.15)
+    with pytest.raises(ValueError):
+        fluid.select_bc(position=0, bc_type='fixed_value', value=[353.15, 343.15, 333.15])
+    with pytest.raises(ValueError):
+        fluid.select_massflow(mdot=[0.01, 0.02, 0.03])
+    with pytest.raises(ValueError):
+        fluid.select_massflow(mdot=[0.01, np.array([[0, 0.02], [50, 0.01]])])
+    with pytest.raises(ValueError):
+        fluid.select_massflow(mdot=[0.01, 0.02, 0.03, np.array([0.02, 0.01, 0.01])])
@@ -0,0 +1,103 @@
+import openterrace
+import numpy as np
+import pytest
+
+T_in = 273.15+80
+T_cut = 273.15+50
+
+def outlet_temperature(t, phases):
+    fluid = phases[0]
+    return fluid.fcns.T(fluid.h[-1,0])
+
+def packed_bed(t_simulate=2000, dt=1):
+    ot = openterrace.Setup(t_simulate=t_simulate, dt=dt)
+
+    fluid = openterrace.Phase(type='fluid')
+    fluid.select_substance_on_the_fly(cp=4200, rho=1000, k=0.6)
+    fluid.select_domain_type(domain='cylinder_1d')
+    fluid.create_domain(n=(20, 1), D=0.1, H=0.5)
+    fluid.select_porosity(phi=0.4)
+    fluid.select_schemes(conv='upwind_1d')
+    fluid.initialise(T=273.15+20)
+    fluid.select_massflow(mdot=0.01)
+    fluid.select_bc(position=0, bc_type='fixed_value', value=T_in)
+    fluid.select_bc(position=-1, bc_type='fixed_gradient', value=0)
+
+    bed = openterrace.Phase(type='bed')
+    bed.select_substance_on_the_fly(cp=1130, rho=5150, k=1.9)
+    bed.select_domain_type(domain='reduced_sphere')
+    bed.create_domain(n=(1, 20), radius=0.01)
+    bed.initialise(T=273.15+20)
+
+    ot.select_coupling(fluid_phase=0, bed_phase=1, h_exp='constant', h_value=200)
+    return ot, fluid, bed
+
+@pytest.mark.parametrize('locate', [False, True])
+def test_terminal_event(locate):
+    ot_ref, fluid_ref, bed_ref = packed_bed(dt=5)
+    fluid_ref.add_monitor(name='h_out', parameter='h', reduction='node', node=(-1, 0))
+    ot_ref.run_simulation(phases=[fluid_ref, bed_ref])
+    t, h_out = fluid_ref.get_monitor('h_out')
+    k = np.argmax(h_out/4200 >= T_cut)
+
+    ot, fluid, bed = packed_bed(dt=5)
+    ot.add_event(condition=lambda t, phases: outlet_temperature(t, phases)-T_cut, terminal=True, direction=1, locate=locate, name='breakthrough')
+    ot.run_simulation(phases=[fluid, bed])
+
+    assert ot.event_log == [('breakthrough', ot.t)]
+    assert 0 < k < len(t)-1
+    if locate:
+        np.testing.assert_allclose(ot.t, np.interp(T_cut, h_out[k-1:k+1]/4200, t[k-1:k+1]), rtol=1e-10)
+        np.testing.assert_allclose(outlet_temperature(ot.t, [fluid]), T_cut, atol=0.05)
+    else:
+        assert ot.t == t[k]
+
+def test_event_state_reused():
+    ot_ref, fluid_ref, bed_ref = packed_bed(t_simulate=200, dt=5)
+    ot_ref.run_simulation(phases=[fluid_ref, bed_ref])
+
+    ot, fluid, bed = packed_bed(t_simulate=200, dt=5)
+    ot.add_event(condition=lambda t, phases: -1.0, locate=True)
+    buffers = []
+    event_state = ot._event_state
+    def record(phases):
+        state = event_state(phases)
+        buffers.append(id(state[0]['h']))
+        return state
+    ot._event_state = record
+    ot.run_simulation(phases=[fluid, bed])
+
+    # The enthalpy at the start of each time step is copied to the same buffer, and steps without crossing are not repeated
+    assert len(buffers) == 40 and len(set(buffers)) == 1
+    np.testing.assert_array_equal(fluid.h, fluid_ref.h)
+    np.testing.assert_array_equal(bed.h, bed_ref.h)
+
+def test_event_actions():
+    ot, fluid, bed = packed_bed(t_simulate=4000, dt=2)
+    fluid.select_energy_balance()
+    bed.select_energy_balance()
+
+    def discharge(t, phases):
+        phases[0].select_massflow(mdot=-0.01)
+        phases[0].select_bc(position=-1, bc_type='fixed_value', value=273.15+20)
+        phases[0].select_bc(position=0, bc_type='fixed_gradient', value=0)
+
+    ot.add_event(condition=lambda t, phases: outlet_temperature(t, phases)-T_cut, action=discharge, direction=1, name='charged')
+    ot.add_event(condition=lambda t, phases: phases[0].fcns.T(phases[0].h[0,0])-T_cut, terminal=True, direction=-1, name='discharged')
+    ot.run_simulation(phases=[fluid, bed])
+
+    assert [event[0] for event in ot.event_log] == ['charged', 'discharged']
+    assert ot.event_log[0][1] < ot.event_log[1][1] == ot.t < 4000
+    assert fluid.mdot < 0
+
+    # Repeated time steps are not counted twice
+    balance = ot.get_energy_balance()
+    assert abs(balance['residual']) < 1e-8*abs(balance['boundary'])
+    np.testing.assert_allclose(fluid.fcns.T(fluid.h[0,0]), T_cut, atol=0.5)
+
+def test_invalid_event():
+    ot = openterrace.Setup(t_simulate=1, dt=1)
+    with pytest.raises(Exception):
+        ot.add_event(condition=None)
+    with pytest.raises(Exception):
+        ot.add_event(condition=lambda t, phases: 0, direction=2)
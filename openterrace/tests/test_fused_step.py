@@ -0,0 +1,63 @@
+import openterrace
+import numpy as np
+import pytest
+
+def run_fluid(fused):
+    ot = openterrace.Setup(t_simulate=60, dt=0.05)
+
+    fluid = openterrace.Phase(type='fluid')
+    fluid.select_substance(substance='water')
+    fluid.select_domain_type(domain='cylinder_1d')
+    fluid.create_domain(n=(50, 1), D=0.1, H=1)
+    fluid.select_porosity(phi=0.4)
+    fluid.select_schemes(diff='central_difference_1d', conv='upwind_1d', fused=fused)
+    fluid.initialise(T=273.15+20)
+    fluid.select_massflow(mdot=0.01)
+    fluid.select_bc(position=0, bc_type='fixed_value', value=273.15+80)
+    fluid.select_bc(position=-1, bc_type='fixed_gradient', value=0)
+
+    ot.run_simulation(phases=[fluid])
+    return fluid
+
+def run_sphere(fused):
+    ot = openterrace.Setup(t_simulate=50, dt=1e-2)
+
+    bed = openterrace.Phase(type='bed')
+    bed.select_substance(substance='ATS50')
+    bed.select_domain_type(domain='sphere_1d')
+    bed.create_domain(n=(20, 3), radius=0.025)
+    bed.select_schemes(diff='central_difference_1d', fused=fused)
+    bed.initialise(T=273.15+20)
+    bed.select_bc(position=0, bc_type='fixed_gradient', value=0)
+    bed.select_bc(position=-1, bc_type='fixed_gradient', value=0)
+
+    R = np.inf*np.ones_like(bed.T)
+    R[-1] = 1/(200*4*np.pi*0.025**2)
+    bed.add_sourceterm_thermal_resistance(R=R, T_inf=273.15+80)
+
+    ot.run_simulation(phases=[bed])
+    return bed
+
+def test_fused_fluid():
+    np.testing.assert_allclose(run_fluid(fused=True).h, run_fluid(fused=False).h, rtol=1e-10)
+
+def test_fused_sphere():
+    np.testing.assert_allclose(run_sphere(fused=True).h, run_sphere(fused=False).h, rtol=1e-10)
+
+def test_fused_unsupported_scheme():
+    fluid = openterrace.Phase(type='fluid')
+    fluid.select_substance(substance='water')
+    fluid.select_domain_type(domain='cylinder_1d')
+    fluid.create_domain(n=(10, 1), D=0.1, H=1)
+    fluid.select_schemes(conv='lax_wendorf_1d', fused=True)
+    fluid.initialise(T=273.15+20)
+    fluid.select_massflow(mdot=0.01)
+    fluid._update_massflow_rate(0)
+    fluid._update_properties()
+
+    with pytest.raises(Exception):
+        fluid._solve_equations(0.01)
+
+if __name__ == "__main__":
+    test_fused_fluid()
+    test_fused_sphere()
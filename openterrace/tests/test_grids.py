@@ -0,0 +1,92 @@
+import openterrace
+from openterrace import grids
+import numpy as np
+import pytest
+
+@pytest.mark.parametrize('grid', ['geometric', 'tanh'])
+@pytest.mark.parametrize('refine', ['start', 'end', 'both'])
+def test_node_positions(grid, refine):
+    x = grids.node_positions(0.1, 0.5, 21, grid=grid, refine=refine)
+    dx = np.diff(x)
+
+    assert x[0] == 0.1 and x[-1] == 0.5
+    assert np.all(dx > 0)
+    if refine == 'start':
+        assert dx[0] < dx[-1]
+    if refine == 'end':
+        assert dx[-1] < dx[0]
+    if refine == 'both':
+        assert dx[0] < dx[10] and dx[-1] < dx[10]
+
+@pytest.mark.parametrize('domain, dimensions, V0', [
+    ('sphere_1d', {'radius': 0.01}, 4/3*np.pi*0.01**3),
+    ('hollow_sphere_1d', {'radius_inner': 0.005, 'radius_outer': 0.01}, 4/3*np.pi*(0.01**3-0.005**3))])
+def test_non_uniform_geometry(domain, dimensions, V0):
+    phase = openterrace.Phase(type='bed')
+    phase.select_domain_type(domain=domain)
+    phase.create_domain(n=(15, 3), grid='tanh', **dimensions)
+
+    np.testing.assert_allclose(np.sum(phase.domain.V), V0, rtol=1e-12)
+    np.testing.assert_allclose(phase.domain.A[1][:-1], phase.domain.A[0][1:])
+    np.testing.assert_allclose(phase.domain.dx_face[1][:-1], phase.domain.dx_face[0][1:])
+    np.testing.assert_allclose(phase.domain.dx_face[1][:-1,0], np.diff(phase.domain.node_pos[:,0]))
+
+def test_uniform_grid_unchanged():
+    phase = openterrace.Phase(type='bed')
+    phase.select_domain_type(domain='sphere_1d')
+    phase.create_domain(n=(11, 1), radius=0.01)
+    dx = 0.01/10
+    faces = np.concatenate(([0], np.linspace(dx/2, 0.01-dx/2, 10), [0.01]))
+
+    assert phase.domain.dx_face[0] is phase.domain.dx and phase.domain.dx_face[1] is phase.domain.dx
+    np.testing.assert_array_equal(phase.domain.V[:,0], np.diff(4/3*np.pi*faces**3))
+    np.testing.assert_array_equal(phase.domain.A[1][:,0], 4*np.pi*faces[1:]**2)
+
+def heat_sphere(n, **grid):
+    ot = openterrace.Setup(t_simulate=0.5, dt=1e-4)
+    ot.select_adaptive_dt(dt_min=1e-6, dt_max=1)
+
+    bed = openterrace.Phase(type='bed')
+    bed.select_substance_on_the_fly(cp=1000, rho=2000, k=2)
+    bed.select_domain_type(domain='sphere_1d')
+    bed.create_domain(n=(n, 1), radius=0.01, **grid)
+    bed.select_schemes(diff='central_difference_1d')
+    bed.initialise(T=300)
+    bed.select_bc(position=0, bc_type='fixed_gradient', value=0)
+    bed.select_bc(position=-1, bc_type='fixed_value', value=400)
+
+    ot.run_simulation(phases=[bed])
+    return np.sum(bed.rho*bed.domain.V*bed.h)/np.sum(bed.rho*bed.domain.V)
+
+def test_surface_refined_sphere():
+    h_ref = heat_sphere(200)
+    error_uniform = abs(heat_sphere(20)-h_ref)
+    error_refined = abs(heat_sphere(10, grid='tanh')-h_ref)
+
+    assert error_refined < error_uniform
+
+def test_non_uniform_energy_balance():
+    ot = openterrace.Setup(t_simulate=100, dt=1e-3)
+    ot.select_adaptive_dt(dt_min=1e-6, dt_max=1)
+
+    wall = openterrace.Phase(type='bed')
+    wall.select_substance_on_the_fly(cp=900, rho=2700, k=200)
+    wall.select_domain_type(domain='block_1d')
+    wall.create_domain(n=(20, 1), length=0.1, area=0.01, grid='geometric', refine='both', stretch=1.3)
+    wall.select_schemes(diff='central_difference_1d', fused=True)
+    wall.initialise(T=300)
+    wall.select_bc(position=0, bc_type='fixed_value', value=400)
+    wall.select_bc(position=-1, bc_type='fixed_value', value=350)
+    wall.select_energy_balance()
+
+    ot.run_simulation(phases=[wall])
+    balance = wall.get_energy_balance()
+
+    assert abs(balance['residual']) < 1e-10*abs(balance['boundary'])
+    np.testing.assert_allclose(wall.T[:,0], 400-50*wall.domain.node_pos[:,0]/0.1, atol=0.5)
+
+def test_invalid_grid():
+    phase = openterrace.Phase(type='bed')
+    phase.select_domain_type(domain='block_1d')
+    with pytest.raises(Exception):
+        phase.create_domain(n=(10, 1), length=1, area=1, grid='chebyshev')
@@ -0,0 +1,60 @@
+import openterrace
+import numpy as np
+import pytest
+
+@pytest.mark.parametrize('time_integration', ['backward_euler', 'crank_nicolson'])
+def test_implicit_diffusion_sphere(time_integration):
+    n = 50
+    dt = 1
+    t_end = 200
+    r = 0.025
+    T_init = 0
+    T_inf = 100
+    h = 200
+    cp = 4179
+    rho = 993
+    k = 0.627
+
+    ot = openterrace.Setup(t_simulate=t_end, dt=dt)
+
+    bed = openterrace.Phase(type='bed')
+    bed.select_substance_on_the_fly(cp=cp, rho=rho, k=k)
+    bed.select_domain_type(domain='sphere_1d')
+    bed.create_domain(n=(n, 1), radius=r)
+    bed.select_schemes(diff='central_difference_1d', time_integration=time_integration)
+    bed.initialise(T=T_init)
+    bed.select_bc(position=0, bc_type='fixed_gradient', value=0)
+    bed.select_bc(position=-1, bc_type='fixed_gradient', value=0)
+
+    R = np.inf*np.ones_like(bed.T)
+    R[-1] = 1/(h*4*np.pi*r**2)
+    bed.add_sourceterm_thermal_resistance(R=R, T_inf=T_inf)
+
+    ot.run_simulation(phases=[bed])
+
+    Bi = h*r/k
+    Fo = k/(rho*cp)*t_end/r**2
+
+    r_r0_ana, theta_ana = openterrace.analytical_diffusion_sphere(Bi, Fo, n)
+    theta_num = (bed.T-T_inf)/(T_init-T_inf)
+
+    np.testing.assert_array_almost_equal(theta_ana, theta_num[:,0], decimal=2)
+
+def test_implicit_advection_diffusion():
+    def run(time_integration):
+        ot = openterrace.Setup(t_simulate=60, dt=0.05)
+
+        fluid = openterrace.Phase(type='fluid')
+        fluid.select_substance(substance='water')
+        fluid.select_domain_type(domain='cylinder_1d')
+        fluid.create_domain(n=(50, 1), D=0.1, H=1)
+        fluid.select_schemes(diff='central_difference_1d', conv='upwind_1d', time_integration=time_integration)
+        fluid.initialise(T=273.15+20)
+        fluid.select_massflow(mdot=0.01)
+        fluid.select_bc(position=0, bc_type='fixed_value', value=273.15+80)
+        fluid.select_bc(position=-1, bc_type='fixed_gradient', value=0)
+
+        ot.run_simulation(phases=[fluid])
+        return fluid.T
+
+    np.testing.assert_allclose(run('backward_euler'), run('explicit'), atol=0.1)
@@ -0,0 +1,56 @@
+import openterrace
+import numpy as np
+
+def run_wall():
+    ot = openterrace.Setup(t_simulate=20, dt=0.05)
+
+    bed = openterrace.Phase(type='bed')
+    bed.select_substance(substance='ATS50')
+    bed.select_domain_type(domain='sphere_1d')
+    bed.create_domain(n=(20, 2), radius=0.01)
+    bed.select_schemes(diff='central_difference_1d')
+    bed.initialise(T=273.15+20)
+    bed.select_bc(position=0, bc_type='fixed_gradient', value=0)
+    bed.select_bc(position=-1, bc_type='fixed_value', value=273.15+80)
+    bed.select_output(times=[0, 20], parameters=['h', 'rho', 'T'])
+    bed.add_monitor(name='h_mean', parameter='h', reduction='mass_weighted_mean', every=20)
+    bed.add_monitor(name='T_center', parameter='T', reduction='node', node=(0, -1), every=20)
+    bed.add_monitor(name='T_max', parameter='T', reduction='max', every=20, size=5)
+
+    ot.run_simulation(phases=[bed])
+    return bed
+
+def test_monitors():
+    bed = run_wall()
+    t, h_mean = bed.get_monitor('h_mean')
+    assert len(t) == 21
+    np.testing.assert_allclose(t, np.arange(21), atol=1e-9)
+
+    mass = bed.data.parameters['rho']*bed.domain.V
+    h_ref = np.sum(mass*bed.data.parameters['h'], axis=(1, 2))/np.sum(mass, axis=(1, 2))
+    np.testing.assert_allclose(h_mean[[0, -1]], h_ref, rtol=1e-12)
+
+    t, T_center = bed.get_monitor('T_center')
+    np.testing.assert_allclose(T_center[[0, -1]], bed.data.parameters['T'][:,0,-1], rtol=1e-12)
+
+    t, T_max = bed.get_monitor('T_max')
+    np.testing.assert_allclose(t, np.arange(16, 21), atol=1e-9)
+    np.testing.assert_allclose(T_max[-1], np.max(bed.data.parameters['T'][-1]), rtol=1e-12)
+
+def test_mass_weighted_monitor_current_density():
+    ot = openterrace.Setup(t_simulate=5, dt=0.05)
+
+    fluid = openterrace.Phase(type='fluid')
+    fluid.select_substance(substance='water')
+    fluid.select_domain_type(domain='cylinder_1d')
+    fluid.create_domain(n=(20, 1), D=0.1, H=1)
+    fluid.select_schemes(diff='central_difference_1d', conv='upwind_1d')
+    fluid.initialise(T=273.15+20)
+    fluid.select_massflow(mdot=0.05)
+    fluid.select_bc(position=0, bc_type='fixed_value', value=273.15+80)
+    fluid.select_bc(position=-1, bc_type='fixed_gradient', value=0)
+    fluid.add_monitor(name='energy', parameter='h', reduction='mass_weighted_sum')
+
+    ot.run_simulation(phases=[fluid])
+    t, energy = fluid.get_monitor('energy')
+    np.testing.assert_allclose(energy[-1], np.sum(fluid.fcns.rho(fluid.h)*fluid.domain.V*fluid.h), rtol=1e-12)
@@ -0,0 +1,56 @@
+import openterrace
+import numpy as np
+
+def packed_bed(t_simulate, dt, mdot=0.01, schemes=True):
+    ot = openterrace.Setup(t_simulate=t_simulate, dt=dt)
+
+    fluid = openterrace.Phase(type='fluid')
+    fluid.select_substance_on_the_fly(cp=4200, rho=1000, k=0.6)
+    fluid.select_domain_type(domain='cylinder_1d')
+    fluid.create_domain(n=(20, 1), D=0.1, H=0.5)
+    fluid.select_porosity(phi=0.4)
+    fluid.initialise(T=273.15+20)
+
+    bed = openterrace.Phase(type='bed')
+    bed.select_substance_on_the_fly(cp=1130, rho=5150, k=1.9)
+    bed.select_domain_type(domain='sphere_1d')
+    bed.create_domain(n=(10, 20), radius=0.01)
+    bed.initialise(T=273.15+20)
+
+    if schemes:
+        fluid.select_schemes(diff='central_difference_1d', conv='upwind_1d')
+        fluid.select_massflow(mdot=mdot)
+        fluid.select_bc(position=0, bc_type='fixed_value', value=273.15+80)
+        fluid.select_bc(position=-1, bc_type='fixed_gradient', value=0)
+        bed.select_schemes(diff='central_difference_1d')
+        bed.select_bc(position=0, bc_type='fixed_gradient', value=0)
+        bed.select_bc(position=-1, bc_type='fixed_gradient', value=0)
+    else:
+        fluid.initialise(T=273.15+80)
+
+    ot.select_coupling(fluid_phase=0, bed_phase=1, h_exp='constant', h_value=200)
+    return ot, fluid, bed
+
+def energy(fluid, bed):
+    n_bed = (fluid.domain.V/fluid.phi*(1-fluid.phi)/bed.domain.V0)[:,0]
+    return np.sum(fluid.rho*fluid.domain.V*fluid.h) + np.sum(n_bed*np.sum(bed.rho*bed.domain.V*bed.h, axis=0))
+
+def test_multirate_energy_conservation():
+    ot, fluid, bed = packed_bed(t_simulate=100, dt=1, schemes=False)
+    bed.select_substeps(n=7)
+    E0 = energy(fluid, bed)
+    ot.run_simulation(phases=[fluid, bed])
+
+    assert np.all(fluid.h < fluid.fcns.h(273.15+80))
+    np.testing.assert_allclose(energy(fluid, bed), E0, rtol=1e-12)
+
+def test_multirate_packed_bed():
+    ot, fluid_ref, bed_ref = packed_bed(t_simulate=600, dt=0.02)
+    ot.run_simulation(phases=[fluid_ref, bed_ref])
+
+    ot, fluid, bed = packed_bed(t_simulate=600, dt=1)
+    bed.select_substeps()
+    ot.run_simulation(phases=[fluid, bed])
+
+    np.testing.assert_allclose(fluid.T, fluid_ref.T, atol=0.5)
+    np.testing.assert_allclose(bed.T, bed_ref.T, atol=0.5)
@@ -0,0 +1,47 @@
+import openterrace
+import numpy as np
+import pytest
+
+def run_wall(**kwargs):
+    ot = openterrace.Setup(t_simulate=20, dt=0.05)
+
+    bed = openterrace.Phase(type='bed')
+    bed.select_substance(substance='magnetite')
+    bed.select_domain_type(domain='block_1d')
+    bed.create_domain(n=(20, 1), length=0.02, area=1)
+    bed.select_schemes(diff='central_difference_1d')
+    bed.initialise(T=273.15+20)
+    bed.select_bc(position=0, bc_type='fixed_value', value=273.15+20)
+    bed.select_bc(position=-1, bc_type='fixed_value', value=273.15+80)
+    bed.select_output(times=[0, 5, 10, 20], parameters=['T', 'h'], **kwargs)
+
+    ot.run_simulation(phases=[bed])
+    return bed
+
+def test_memmap_backend(tmp_path):
+    ref = run_wall()
+    bed = run_wall(backend='memmap', path=tmp_path)
+    for parameter in ['T', 'h']:
+        np.testing.assert_array_equal(bed.data.parameters[parameter][2], ref.data.parameters[parameter][2])
+        np.testing.assert_array_equal(np.load(tmp_path/(parameter+'.npy'), mmap_mode='r'), ref.data.parameters[parameter])
+
+def test_hdf5_backend(tmp_path):
+    h5py = pytest.importorskip('h5py')
+    ref = run_wall()
+    bed = run_wall(backend='hdf5', path=tmp_path/'output.h5')
+    assert bed.data.backend.file is None
+    with h5py.File(tmp_path/'output.h5', 'r') as f:
+        np.testing.assert_array_equal(f['T'][:], ref.data.parameters['T'])
+    np.testing.assert_array_equal(bed.data.parameters['h'][2], ref.data.parameters['h'][2])
+
+def test_zarr_backend(tmp_path):
+    zarr = pytest.importorskip('zarr')
+    ref = run_wall()
+    bed = run_wall(backend='zarr', path=tmp_path/'output')
+    for parameter in ['T', 'h']:
+        np.testing.assert_array_equal(zarr.open_array(store=str(tmp_path/'output'/parameter), mode='r')[:], ref.data.parameters[parameter])
+    np.testing.assert_array_equal(bed.data.parameters['T'][2], ref.data.parameters['T'][2])
+
+def test_invalid_backend():
+    with pytest.raises(Exception):
+        run_wall(backend='csv')
@@ -0,0 +1,47 @@
+import openterrace
+import numpy as np
+
+def run_wall(times):
+    ot = openterrace.Setup(t_simulate=5, dt=0.25)
+
+    bed = openterrace.Phase(type='bed')
+    bed.select_substance(substance='magnetite')
+    bed.select_domain_type(domain='block_1d')
+    bed.create_domain(n=(10, 1), length=0.1, area=1)
+    bed.select_schemes(diff='central_difference_1d')
+    bed.initialise(T=273.15+20)
+    bed.select_bc(position=0, bc_type='fixed_value', value=273.15+20)
+    bed.select_bc(position=-1, bc_type='fixed_value', value=273.15+80)
+    bed.select_output(times=times, parameters=['h'])
+
+    ot.run_simulation(phases=[bed])
+    return bed.data.parameters['h'][:,:,0]
+
+def test_output_interpolated_to_exact_times():
+    times = np.arange(0, 5+1e-9, 0.1)
+    h = run_wall(times)
+
+    times_steps = np.arange(0, 5+1e-9, 0.25)
+    h_steps = run_wall(times_steps)
+
+    h_ref = np.array([np.interp(times, times_steps, h_steps[:,j]) for j in range(h.shape[1])]).T
+    np.testing.assert_allclose(h, h_ref, rtol=1e-12)
+    assert np.all(h > 0)
+
+def test_output_matches_final_enthalpy():
+    ot = openterrace.Setup(t_simulate=5, dt=0.25)
+
+    fluid = openterrace.Phase(type='fluid')
+    fluid.select_substance(substance='water')
+    fluid.select_domain_type(domain='cylinder_1d')
+    fluid.create_domain(n=(20, 1), D=0.1, H=1)
+    fluid.select_schemes(diff='central_difference_1d', conv='upwind_1d', fused=True)
+    fluid.initialise(T=273.15+20)
+    fluid.select_massflow(mdot=0.05)
+    fluid.select_bc(position=0, bc_type='fixed_value', value=273.15+80)
+    fluid.select_bc(position=-1, bc_type='fixed_gradient', value=0)
+    fluid.select_output(times=[0, 5], parameters=['T', 'h'])
+
+    ot.run_simulation(phases=[fluid])
+    np.testing.assert_allclose(fluid.T, fluid.fcns.T(fluid.h), rtol=1e-12)
+    np.testing.assert_allclose(fluid.data.parameters['T'][-1], fluid.fcns.T(fluid.data.parameters['h'][-1]), rtol=1e-12)
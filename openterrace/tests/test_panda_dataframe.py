@@ -0,0 +1,44 @@
+import openterrace
+from openterrace.postprocessing import panda_dataframe
+import numpy as np
+import pytest
+
+def run_wall():
+    ot = openterrace.Setup(t_simulate=10, dt=0.05)
+
+    bed = openterrace.Phase(type='bed')
+    bed.select_substance(substance='magnetite')
+    bed.select_domain_type(domain='block_1d')
+    bed.create_domain(n=(10, 2), length=0.02, area=1)
+    bed.select_schemes(diff='central_difference_1d')
+    bed.initialise(T=273.15+20)
+    bed.select_bc(position=0, bc_type='fixed_value', value=273.15+20)
+    bed.select_bc(position=-1, bc_type='fixed_value', value=273.15+80)
+    bed.select_output(times=[0, 5, 10], parameters=['T', 'h'])
+    bed.add_monitor(name='T_mean', parameter='T', reduction='mass_weighted_mean', every=20)
+
+    ot.run_simulation(phases=[bed])
+    return bed
+
+def test_pandas_export():
+    pytest.importorskip('pandas')
+    bed = run_wall()
+
+    df = panda_dataframe.to_long(bed)
+    assert len(df) == 3*10*2
+    assert df.loc[(5, 3, 1), 'T'] == bed.data.parameters['T'][1,3,1]
+    assert np.shares_memory(df['h'].to_numpy(), bed.data.parameters['h'])
+
+    wide = panda_dataframe.to_wide(bed, parameter='T')
+    assert wide.loc[10, (9, 0)] == bed.data.parameters['T'][2,9,0]
+
+    monitors = panda_dataframe.monitors_to_frame(bed)
+    assert len(monitors['T_mean']) == 11
+
+def test_arrow_export():
+    pytest.importorskip('pyarrow')
+    bed = run_wall()
+
+    table = panda_dataframe.to_arrow(bed, parameters=['T'])
+    assert table.num_rows == 3*10*2
+    np.testing.assert_array_equal(table.column('T').to_numpy(), bed.data.parameters['T'].reshape(-1))
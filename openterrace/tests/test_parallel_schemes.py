@@ -0,0 +1,43 @@
+import openterrace
+import numpy as np
+import numba as nb
+import pytest
+
+def run_bed(parallel, fused=False, time_integration='explicit'):
+    ot = openterrace.Setup(t_simulate=20, dt=1e-2, n_threads=nb.config.NUMBA_NUM_THREADS)
+
+    bed = openterrace.Phase(type='bed')
+    bed.select_substance(substance='magnetite')
+    bed.select_domain_type(domain='sphere_1d')
+    bed.create_domain(n=(10, 64), radius=0.01)
+    bed.select_schemes(diff='central_difference_1d', fused=fused, time_integration=time_integration, parallel=parallel)
+    bed.initialise(T=np.linspace(273.15+20, 273.15+80, 64))
+    bed.select_bc(position=0, bc_type='fixed_gradient', value=0)
+    bed.select_bc(position=-1, bc_type='fixed_value', value=273.15+50)
+
+    ot.run_simulation(phases=[bed])
+    return bed.h
+
+def run_fluid(parallel, conv):
+    ot = openterrace.Setup(t_simulate=20, dt=0.05, n_threads=nb.config.NUMBA_NUM_THREADS)
+
+    fluid = openterrace.Phase(type='fluid')
+    fluid.select_substance(substance='water')
+    fluid.select_domain_type(domain='cylinder_1d')
+    fluid.create_domain(n=(50, 1), D=0.1, H=1)
+    fluid.select_schemes(diff='central_difference_1d', conv=conv, parallel=parallel)
+    fluid.initialise(T=273.15+20)
+    fluid.select_massflow(mdot=0.01)
+    fluid.select_bc(position=0, bc_type='fixed_value', value=273.15+80)
+    fluid.select_bc(position=-1, bc_type='fixed_gradient', value=0)
+
+    ot.run_simulation(phases=[fluid])
+    return fluid.h
+
+@pytest.mark.parametrize('fused, time_integration', [(False, 'explicit'), (True, 'explicit'), (False, 'backward_euler')])
+def test_parallel_bed(fused, time_integration):
+    np.testing.assert_allclose(run_bed(True, fused, time_integration), run_bed(False, fused, time_integration), rtol=1e-12)
+
+@pytest.mark.parametrize('conv', openterrace.convection_schemes.__all__)
+def test_parallel_fluid(conv):
+    np.testing.assert_allclose(run_fluid(True, conv), run_fluid(False, conv), rtol=1e-12)
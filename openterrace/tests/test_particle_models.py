@@ -0,0 +1,77 @@
+import openterrace
+import numpy as np
+import pytest
+from scipy.integrate import trapezoid
+
+def particle_in_fluid(model, Bi, Fo):
+    R, k, rho, cp = 0.01, 2, 2000, 1000
+    t_end = Fo*R**2*rho*cp/k
+    ot = openterrace.Setup(t_simulate=t_end, dt=t_end/400)
+
+    # Fluid with a very large heat capacity keeps its temperature
+    fluid = openterrace.Phase(type='fluid')
+    fluid.select_substance_on_the_fly(cp=4200, rho=1e12, k=0.6)
+    fluid.select_domain_type(domain='cylinder_1d')
+    fluid.create_domain(n=(2, 1), D=0.1, H=0.1)
+    fluid.select_porosity(phi=0.4)
+    fluid.initialise(T=400.0)
+
+    bed = openterrace.Phase(type='bed')
+    bed.select_substance_on_the_fly(cp=cp, rho=rho, k=k)
+    bed.select_domain_type(domain='reduced_sphere')
+    bed.create_domain(n=(1, 2), radius=R, model=model)
+    bed.initialise(T=300.0)
+
+    ot.select_coupling(fluid_phase=0, bed_phase=1, h_exp='constant', h_value=Bi*k/R)
+    ot.run_simulation(phases=[fluid, bed])
+    return (bed.T[0]-300)/100
+
+@pytest.mark.parametrize('model, Bi, tol', [('lumped', 0.1, 1e-3), ('lumped', 1, 1e-2), ('polynomial', 1, 3e-3), ('polynomial', 5, 1e-2), ('polynomial', 20, 3e-2)])
+@pytest.mark.parametrize('Fo', [0.05, 0.2])
+def test_particle_in_fluid(model, Bi, tol, Fo):
+    r, theta = openterrace.analytical_diffusion_sphere(Bi=Bi, Fo=Fo, n=401)
+    theta_mean = 1-3*trapezoid(np.array(theta)*r**2, r)
+
+    np.testing.assert_allclose(particle_in_fluid(model, Bi, Fo), theta_mean, atol=tol)
+
+@pytest.mark.parametrize('model', ['lumped', 'polynomial'])
+@pytest.mark.parametrize('substeps', [False, True])
+def test_reduced_packed_bed_energy_balance(model, substeps):
+    ot = openterrace.Setup(t_simulate=200, dt=0.5)
+
+    fluid = openterrace.Phase(type='fluid')
+    fluid.select_substance_on_the_fly(cp=4200, rho=1000, k=0.6)
+    fluid.select_domain_type(domain='cylinder_1d')
+    fluid.create_domain(n=(20, 1), D=0.1, H=0.5)
+    fluid.select_porosity(phi=0.4)
+    fluid.select_schemes(conv='upwind_1d')
+    fluid.initialise(T=273.15+20)
+    fluid.select_massflow(mdot=0.01)
+    fluid.select_bc(position=0, bc_type='fixed_value', value=273.15+80)
+    fluid.select_bc(position=-1, bc_type='fixed_gradient', value=0)
+    fluid.select_energy_balance()
+
+    bed = openterrace.Phase(type='bed')
+    bed.select_substance(substance='magnetite')
+    bed.select_domain_type(domain='reduced_sphere')
+    bed.create_domain(n=(1, 20), radius=0.01, model=model)
+    bed.initialise(T=273.15+20)
+    bed.select_energy_balance()
+    if substeps:
+        bed.select_substeps(n=3)
+
+    ot.select_coupling(fluid_phase=0, bed_phase=1, h_exp='constant', h_value=500)
+    ot.run_simulation(phases=[fluid, bed])
+    balance = ot.get_energy_balance()
+
+    assert bed.get_energy_balance()['coupling'] > 0
+    assert np.all(np.diff(bed.T[0]) <= 0)
+    assert abs(balance['residual']) < 1e-10*balance['convection']
+
+def test_reduced_sphere_input():
+    bed = openterrace.Phase(type='bed')
+    bed.select_domain_type(domain='reduced_sphere')
+    with pytest.raises(Exception):
+        bed.create_domain(n=(5, 10), radius=0.01)
+    with pytest.raises(Exception):
+        bed.create_domain(n=(1, 10), radius=0.01, model='cubic')
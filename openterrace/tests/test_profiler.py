@@ -0,0 +1,70 @@
+import openterrace
+import numpy as np
+import json
+import os
+import pytest
+
+def test_profiler(tmp_path):
+    path = os.path.join(tmp_path, 'profile.json')
+    ot = openterrace.Setup(t_simulate=10, dt=0.05)
+    ot.select_profiling(progress_bar=False, path=path)
+
+    fluid = openterrace.Phase(type='fluid')
+    fluid.select_substance(substance='water')
+    fluid.select_domain_type(domain='cylinder_1d')
+    fluid.create_domain(n=(20, 1), D=0.1, H=0.5)
+    fluid.select_porosity(phi=0.4)
+    fluid.select_schemes(diff='central_difference_1d', conv='upwind_1d')
+    fluid.initialise(T=273.15+20)
+    fluid.select_massflow(mdot=0.01)
+    fluid.select_bc(position=0, bc_type='fixed_value', value=273.15+80)
+    fluid.select_bc(position=-1, bc_type='fixed_gradient', value=0)
+    fluid.select_output(times=[0, 10])
+
+    bed = openterrace.Phase(type='bed')
+    bed.select_substance(substance='magnetite')
+    bed.select_domain_type(domain='sphere_1d')
+    bed.create_domain(n=(10, 20), radius=0.01)
+    bed.select_schemes(diff='central_difference_1d')
+    bed.initialise(T=273.15+20)
+    bed.select_bc(position=0, bc_type='fixed_gradient', value=0)
+    bed.select_bc(position=-1, bc_type='fixed_gradient', value=0)
+
+    ot.select_coupling(fluid_phase=0, bed_phase=1, h_exp='constant', h_value=200)
+    ot.run_simulation(phases=[fluid, bed])
+
+    with open(path) as f:
+        summary = json.load(f)
+    assert summary['steps'] == 200 and summary['nodes'] == 220
+    assert summary['node_updates_per_second'] > 0
+    assert summary['stages']['_update_properties']['calls'] == 2*200
+    assert summary['stages']['conv']['calls'] == 200
+    assert summary['stages']['_coupling']['calls'] == 200
+    assert sum(stage['fraction'] for stage in summary['stages'].values()) < 1
+
+    assert not '_update_properties' in bed.__dict__ and not '_coupling' in ot.__dict__
+    assert bed.diff is openterrace.diffusion_schemes.central_difference_1d.central_difference_1d
+
+def test_profiler_interrupted():
+    ot = openterrace.Setup(t_simulate=1, dt=0.01)
+    ot.select_profiling(progress_bar=False)
+
+    bed = openterrace.Phase(type='bed')
+    bed.select_substance_on_the_fly(cp=1000, rho=2000, k=2)
+    bed.select_domain_type(domain='sphere_1d')
+    bed.create_domain(n=(10, 1), radius=0.01)
+    bed.select_schemes(diff='central_difference_1d')
+    bed.initialise(T=300)
+    bed.select_bc(position=0, bc_type='fixed_gradient', value=0)
+    bed.select_bc(position=-1, bc_type='fixed_value', value=400)
+
+    def fail(t, phases):
+        raise RuntimeError("interrupted")
+    ot.add_event(condition=lambda t, phases: t-0.5, action=fail)
+    with pytest.raises(RuntimeError):
+        ot.run_simulation(phases=[bed])
+    assert not '_update_properties' in bed.__dict__
+
+    ot.events = []
+    ot.run_simulation(phases=[bed])
+    assert ot.profile['stages']['_update_properties']['calls'] == ot.profile['steps']
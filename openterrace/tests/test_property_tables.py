@@ -0,0 +1,36 @@
+import openterrace
+import numpy as np
+
+def run_sphere(tables):
+    ot = openterrace.Setup(t_simulate=600, dt=0.05)
+
+    bed = openterrace.Phase(type='bed')
+    bed.select_substance(substance='ATS50')
+    if tables:
+        bed.select_property_tables(T_min=273.15, T_max=273.15+100, order=tables)
+    bed.select_domain_type(domain='sphere_1d')
+    bed.create_domain(n=(20, 1), radius=0.025)
+    bed.select_schemes(diff='central_difference_1d')
+    bed.initialise(T=273.15+20)
+    bed.select_bc(position=0, bc_type='fixed_gradient', value=0)
+    bed.select_bc(position=-1, bc_type='fixed_value', value=273.15+80)
+
+    ot.run_simulation(phases=[bed])
+    return bed
+
+def test_property_tables_error_bound():
+    for substance in ['ATS50', 'ATS58', 'magnetite']:
+        bed = openterrace.Phase(type='bed')
+        bed.select_substance(substance=substance)
+        bed.select_property_tables(T_min=273.15, T_max=273.15+100, rtol=1e-5)
+        exact = bed.fcns.fcns
+
+        h = np.random.default_rng(0).uniform(bed.fcns.h_min, bed.fcns.h_max, (50, 10))
+        for prop in ['T', 'rho', 'cp', 'k']:
+            scale = np.max(np.abs(getattr(exact, prop)(h)))
+            np.testing.assert_allclose(getattr(bed.fcns, prop)(h), getattr(exact, prop)(h), atol=1e-5*scale)
+
+def test_property_tables_simulation():
+    T_ref = run_sphere(tables=None).T
+    np.testing.assert_allclose(run_sphere(tables='linear').T, T_ref, atol=1e-2)
+    np.testing.assert_allclose(run_sphere(tables='cubic').T, T_ref, atol=1e-2)
@@ -0,0 +1,36 @@
+import openterrace
+import numpy as np
+import numba as nb
+import pytest
+
+class granite:
+    h = nb.njit(lambda T: 790*T)
+    T = nb.njit(lambda h, p=None: h/790)
+    rho = nb.njit(lambda h, p=None: 2700*h**0)
+    cp = nb.njit(lambda h, p=None: 790*h**0)
+    k = nb.njit(lambda h, p=None: 2.5+1e-6*h)
+
+def run_wall(fused):
+    ot = openterrace.Setup(t_simulate=100, dt=0.1)
+
+    bed = openterrace.Phase(type='bed')
+    bed.select_substance(substance='granite')
+    bed.select_domain_type(domain='block_1d')
+    bed.create_domain(n=(30, 2), length=0.05, area=1)
+    bed.select_schemes(diff='central_difference_1d', fused=fused)
+    bed.initialise(T=273.15+20)
+    bed.select_bc(position=0, bc_type='fixed_value', value=273.15+90)
+    bed.select_bc(position=-1, bc_type='fixed_gradient', value=0)
+
+    ot.run_simulation(phases=[bed])
+    return bed
+
+def test_registered_substance():
+    openterrace.register_substance(type='bed', name='granite', substance=granite)
+    bed = run_wall(fused=True)
+    assert bed._compiled_properties()
+    np.testing.assert_allclose(bed.h, run_wall(fused=False).h, rtol=1e-10)
+
+def test_register_incomplete_substance():
+    with pytest.raises(Exception):
+        openterrace.register_substance(type='bed', name='incomplete', substance=object())
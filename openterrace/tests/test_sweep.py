@@ -0,0 +1,34 @@
+import openterrace
+import openterrace.sweep
+import numpy as np
+import pytest
+
+def wall(T_right, k, n=20):
+    ot = openterrace.Setup(t_simulate=20, dt=0.05)
+
+    bed = openterrace.Phase(type='bed')
+    bed.select_substance_on_the_fly(cp=1000, rho=2000, k=k)
+    bed.select_domain_type(domain='block_1d')
+    bed.create_domain(n=(n, 1), length=0.02, area=1)
+    bed.select_schemes(diff='central_difference_1d')
+    bed.initialise(T=273.15+20)
+    bed.select_bc(position=0, bc_type='fixed_value', value=273.15+20)
+    bed.select_bc(position=-1, bc_type='fixed_value', value=T_right)
+    bed.select_output(times=[0, 10, 20], parameters=['T', 'h'])
+    return ot, [bed]
+
+def test_sweep(tmp_path):
+    grid = {'T_right': [273.15+50, 273.15+80], 'k': [1, 2, 4]}
+    results = openterrace.sweep.run_sweep(wall, grid, path=tmp_path, max_workers=2)
+
+    assert results[0]['T'].shape == (6, 3, 20, 1)
+    for run, scenario in enumerate(openterrace.sweep.expand_grid(grid)):
+        ot, phases = wall(**scenario)
+        ot.run_simulation(phases=phases)
+        np.testing.assert_array_equal(results[0]['T'][run], phases[0].data.parameters['T'])
+        np.testing.assert_array_equal(results[0]['h'][run], phases[0].data.parameters['h'])
+
+def test_sweep_shape_mismatch(tmp_path):
+    grid = [{'T_right': 273.15+50, 'k': 1}, {'T_right': 273.15+50, 'k': 1, 'n': 10}]
+    with pytest.raises(ValueError, match="'T' of phase 0 .* in scenario 1"):
+        openterrace.sweep.run_sweep(wall, grid, path=tmp_path, max_workers=1)
@@ -0,0 +1,70 @@
+import openterrace
+import numpy as np
+import pytest
+
+tvd_schemes = ['minmod_1d', 'van_leer_1d', 'superbee_1d', 'muscl_1d', 'quick_1d']
+
+def advect_step(scheme, n=100, t_end=180, dt=1):
+    ot = openterrace.Setup(t_simulate=t_end, dt=dt)
+
+    fluid = openterrace.Phase(type='fluid')
+    fluid.select_substance_on_the_fly(cp=4180, rho=993, k=0)
+    fluid.select_domain_type(domain='cylinder_1d')
+    fluid.create_domain(n=(n, 1), D=0.5, H=2)
+    fluid.select_schemes(conv=scheme)
+    fluid.initialise(T=0)
+    fluid.select_massflow(mdot=1)
+    fluid.select_bc(position=0, bc_type='fixed_value', value=100)
+    fluid.select_bc(position=-1, bc_type='fixed_gradient', value=0)
+    fluid.select_energy_balance()
+
+    ot.run_simulation(phases=[fluid])
+    return fluid
+
+def front_width(fluid):
+    theta = fluid.T[:,0]/100
+    return np.count_nonzero((theta > 0.05) & (theta < 0.95))
+
+@pytest.mark.parametrize('scheme', tvd_schemes)
+def test_tvd_sharper_than_upwind(scheme):
+    fluid = advect_step(scheme)
+    upwind = advect_step('upwind_1d')
+
+    assert np.all(fluid.T >= -1e-9) and np.all(fluid.T <= 100+1e-9)
+    assert front_width(fluid) < 0.75*front_width(upwind)
+    np.testing.assert_allclose(np.mean(fluid.T), np.mean(upwind.T), rtol=1e-2)
+    balance = fluid.get_energy_balance()
+    assert abs(balance['residual']) < 1e-10*abs(balance['convection'])
+
+def test_tvd_limiter_recovers_upwind():
+    x = np.zeros((6, 2))
+    x[3:] = 1
+    F = np.ones((2, 6, 2))
+    np.testing.assert_allclose(openterrace.convection_schemes.minmod_1d.minmod_1d(x, F), openterrace.convection_schemes.upwind_1d.upwind_1d(x, F))
+    np.testing.assert_allclose(openterrace.convection_schemes.superbee_1d.superbee_1d(x, -F)[1:-1], openterrace.convection_schemes.upwind_1d.upwind_1d(x, -F)[1:-1])
+
+@pytest.mark.parametrize('scheme', tvd_schemes)
+@pytest.mark.parametrize('n1', [1, 3])
+def test_tvd_parallel_kernel(scheme, n1):
+    rng = np.random.default_rng(0)
+    x = rng.random((12, n1))
+    F = rng.random((2, 12, n1))-0.5
+    module = getattr(openterrace.convection_schemes, scheme)
+    np.testing.assert_allclose(getattr(module, scheme+'_parallel')(x, F), getattr(module, scheme)(x, F), rtol=1e-12, atol=1e-15)
+
+def test_tvd_adaptive_dt():
+    ot = openterrace.Setup(t_simulate=60, dt=1)
+    ot.select_adaptive_dt(dt_min=1e-3, dt_max=100)
+    fluid = openterrace.Phase(type='fluid')
+    fluid.select_substance_on_the_fly(cp=4180, rho=993, k=0)
+    fluid.select_domain_type(domain='cylinder_1d')
+    fluid.create_domain(n=(100, 1), D=0.5, H=2)
+    fluid.select_schemes(conv='superbee_1d')
+    fluid.initialise(T=0)
+    fluid.select_massflow(mdot=1)
+    fluid.select_bc(position=0, bc_type='fixed_value', value=100)
+    fluid.select_bc(position=-1, bc_type='fixed_gradient', value=0)
+
+    assert fluid._stable_dt(0, 1) == pytest.approx(0.5*993*np.pi*0.25**2*2/99/1, rel=1e-9)
+    ot.run_simulation(phases=[fluid])
+    assert np.all(fluid.T >= -1e-9) and np.all(fluid.T <= 100+1e-9)
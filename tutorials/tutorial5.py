@@ -16,43 +16,35 @@ import matplotlib.pyplot as plt
 def main():
     t_end = 3600*10
 
-    ot = openterrace.Simulate(t_end=t_end, dt=0.02)
+    ot = openterrace.Setup(t_simulate=t_end, dt=0.02)
 
-    fluid = ot.create_phase(n=50, type='fluid')
+    fluid = openterrace.Phase(type='fluid')
     fluid.select_substance(substance='air')
-    fluid.select_domain_shape(domain='cylinder_1d', D=0.3, H=1)
+    fluid.select_domain_type(domain='cylinder_1d')
+    fluid.create_domain(n=(50,1), D=0.3, H=1)
     fluid.select_porosity(phi=0.4)
     fluid.select_schemes(diff='central_difference_1d', conv='upwind_1d')
-    fluid.select_initial_conditions(T=273.15+25)
+    fluid.initialise(T=273.15+25)
     fluid.select_massflow(mdot=0.01)
-    fluid.select_bc(bc_type='fixed_value',
-                    parameter='T',
-                    position=(slice(None, None, None), 0),
-                    value=273.15+500
-                    )
-    fluid.select_bc(bc_type='zero_gradient',
-                    parameter='T',
-                    position=(slice(None, None, None), -1)
-                    )
+    fluid.select_bc(position=0, bc_type='fixed_value', value=273.15+500)
+    fluid.select_bc(position=-1, bc_type='fixed_gradient', value=0)
     fluid.select_output(times=range(0, t_end+3600, 3600))
 
-    bed = ot.create_phase(n=20, n_other=50, type='bed')
+    bed = openterrace.Phase(type='bed')
     bed.select_substance(substance='magnetite')
-    bed.select_domain_shape(domain='sphere_1d', R=0.05)
+    bed.select_domain_type(domain='sphere_1d')
+    bed.create_domain(n=(20,50), radius=0.05)
     bed.select_schemes(diff='central_difference_1d')
-    bed.select_initial_conditions(T=273.15+25)
-    bed.select_bc(bc_type='zero_gradient',
-                parameter='T',
-                position=(slice(None, None, None), 0))
-    bed.select_bc(bc_type='zero_gradient',
-                parameter='T',
-                position=(slice(None, None, None), -1))
+    bed.initialise(T=273.15+25)
+    bed.select_bc(position=0, bc_type='fixed_gradient', value=0)
+    bed.select_bc(position=-1, bc_type='fixed_gradient', value=0)
     bed.select_output(times=range(0, t_end+3600, 3600))
 
+    # fluid_phase and bed_phase are positions in the list of phases passed to run_simulation
     ot.select_coupling(fluid_phase=0, bed_phase=1, h_exp='constant', h_value=100)
-    ot.run_simulation()
+    ot.run_simulation(phases=[fluid, bed])
 
-    plt.plot(fluid.node_pos,fluid.data.T[:,0,:].T-273.15, label=fluid.data.time/3600)
+    plt.plot(fluid.domain.node_pos,fluid.data.parameters['T'][:,:,0].T-273.15, label=[t/3600 for t in fluid.data.times])
     plt.legend(title='Simulation time (h)')
     plt.show()
     plt.xlabel(u'Cylinder position (m)')